@@ -1,17 +1,35 @@
 import os
-from flask import Flask, jsonify, request, send_from_directory, render_template
+import json
+from flask import Flask, Response, g, jsonify, request, send_from_directory, render_template, stream_with_context
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 from apscheduler.schedulers.background import BackgroundScheduler
 from course_fetcher import CourseFetcher
 from room_fetcher import RoomFetcher  # Import the new RoomFetcher class
-from salary_api import SalaryData  # Import SalaryData class for salaries
+from room_analytics import DEFAULT_UNDERUSED_THRESHOLD
+from salary_api import SalaryData, format_salary_entry  # Import SalaryData class for salaries
+from salary_columns import GROUP_FIELDS, METRIC_FIELDS
+from instructor_salaries import InstructorSalaryJoin
+from requirements_data import RequirementsData
+from change_feed import ChangeFeed
+from section_stream import SectionStatusBroadcaster, default_max_subscribers, format_event
+from schedule_planner import (
+    SchedulePlanner, find_conflicts, parse_schedule_constraints, MAX_SCHEDULE_COURSES, DEFAULT_SCHEDULE_LIMIT, MAX_SCHEDULE_LIMIT
+)
+from datetime import date
 from utils.flask_utils import get_request_params
+from utils import metrics
+from utils.profiling import RequestProfiler
+from utils.logging_config import configure_logging
+from utils.compression import CompressedBody, PrecompressedCache, negotiate_encoding
 import logging
+import time
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging: records are queued and written by a background thread; levels come from
+# LOG_LEVEL (default INFO) and LOG_LEVELS (e.g. "course_fetcher=WARNING,werkzeug=INFO"), and
+# LOG_SAMPLE_RATE sets the share of per-request info lines emitted
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -22,10 +40,99 @@ app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key")
 def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
-    response.headers.add('Access-Control-Allow-Methods', 'GET')
+    response.headers.add('Access-Control-Allow-Methods', 'GET, POST')
+    return response
+
+# On-demand profiling (off unless PROFILE_SECRET is set) and the slow request log
+profiler = RequestProfiler.from_environment()
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_QUERY_PARAM = 'profile_token'
+
+def _profile_token():
+    return request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_PARAM)
+
+def _request_info():
+    """Method, path, query parameters and JSON body of the current request, enough to replay it"""
+    return {
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "args": {key: value for key, value in request.args.items() if key != PROFILE_QUERY_PARAM},
+        "json": request.get_json(silent=True) if request.method == 'POST' else None
+    }
+
+# Per-request latency instrumentation: stage timings go out as a Server-Timing header
+# and, with the whole request duration, into the histograms served by /api/metrics
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    metrics.start_request()
+    if profiler.enabled and profiler.is_authorized(_profile_token()):
+        g.profile = profiler.start()
+
+@app.after_request
+def record_request_timing(response):
+    stages = metrics.finish_request()
+    start_time = g.get('request_start')
+    if start_time is None:
+        return response
+    elapsed = time.perf_counter() - start_time
+    endpoint = request.endpoint or 'unmatched'
+    metrics.REQUEST_DURATION.observe(endpoint, elapsed)
+    metrics.REQUESTS_TOTAL.inc(endpoint, str(response.status_code))
+    response.headers['Server-Timing'] = metrics.server_timing_header(stages, elapsed)
+
+    profile = g.pop('profile', None)
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profiler.finish(profile, _request_info(), elapsed)
+    if profiler.is_slow(elapsed):
+        profiler.record_request(_request_info(), elapsed, stages)
+    return response
+
+# Serialized and precompressed (gzip, and brotli when installed) bodies of cacheable responses,
+# keyed by the course snapshot or salary data version they were built from
+PRECOMPRESSED_CACHE_MB = float(os.environ.get('PRECOMPRESSED_CACHE_MB', '64'))
+precompressed = PrecompressedCache(int(PRECOMPRESSED_CACHE_MB * 1024 * 1024))
+
+def _response_cache_key(versions):
+    """Cache key of the current request's response: path, data versions and query parameters"""
+    args = sorted((key, value) for key, values in request.args.lists() if key != PROFILE_QUERY_PARAM
+                  for value in values)
+    return (request.path, tuple(versions), tuple(args))
+
+def _send_body(body):
+    """Send a JSON body in the best encoding the client accepts (compressing it only once)"""
+    data, encoding = body.get(negotiate_encoding(request.headers.get('Accept-Encoding')))
+    response = Response(data, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
     return response
 
-# Configure rate limiting
+def _cached_response(versions):
+    """The stored response for the current request and data versions, or None (also for unloaded data)"""
+    if not all(versions):
+        return None
+    body = precompressed.get(_response_cache_key(versions))
+    return _send_body(body) if body is not None else None
+
+def _cache_response(payload, versions):
+    """Serialize a successful response, store it under the data versions it was built from and send it"""
+    with metrics.stage("serialize"):
+        raw = jsonify(payload).get_data()
+    if all(versions):
+        return _send_body(precompressed.put(_response_cache_key(versions), raw))
+    return _send_body(CompressedBody(raw))
+
+def _snapshot_versions(params, includes=()):
+    """Data versions a course-derived response depends on (the salary version too with include=salary)"""
+    versions = [course_fetcher.get_snapshot_version(params['year'], params['term'], params['campus'])]
+    if 'salary' in includes:
+        versions.append(salary_data.version)
+    return versions
+
+# Configure rate limiting (RATELIMIT_ENABLED=false turns it off, e.g. for load tests)
+app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', 'true').lower() != 'false'
 limiter = Limiter(
     get_remote_address,
     app=app,
@@ -42,14 +149,86 @@ course_fetcher = CourseFetcher()
 # Initialize room fetcher with course fetcher
 room_fetcher = RoomFetcher(course_fetcher)
 
+# Minutes between course data refreshes
+COURSE_REFRESH_MINUTES = float(os.environ.get('COURSE_REFRESH_MINUTES', '15'))
+
 # Initialize scheduler
 scheduler = BackgroundScheduler()
-scheduler.add_job(func=lambda: course_fetcher.update_courses("2025", "1", "NB"), trigger="interval", minutes=15)
+scheduler.add_job(func=lambda: course_fetcher.update_courses("2025", "1", "NB"), trigger="interval",
+                  minutes=COURSE_REFRESH_MINUTES)
 scheduler.start()
 
-# Initialize SalaryData for salaries
+# Initialize SalaryData for salaries (the data itself is loaded on first use)
 salary_data = SalaryData()
 
+# Join course instructors to salaries on the first include=salary request per snapshot (refreshes drop old joins)
+instructor_salaries = InstructorSalaryJoin(course_fetcher, salary_data)
+course_fetcher.add_update_listener(instructor_salaries.on_courses_updated)
+
+# Per-version deltas of every refreshed course snapshot, served by /api/courses/changes
+change_feed = ChangeFeed(course_fetcher)
+course_fetcher.add_update_listener(change_feed.on_courses_updated)
+
+# Live section status streams (/api/stream), all fed by one broadcaster listening to the change feed
+# (a low default cap unless served by gevent workers, where a stream costs a greenlet instead of a thread)
+section_stream = SectionStatusBroadcaster(int(os.environ.get('MAX_STREAM_SUBSCRIBERS', default_max_subscribers())))
+change_feed.add_listener(section_stream.on_changes)
+metrics.REGISTRY.append(metrics.CallbackMetric(
+    f"{metrics.METRIC_PREFIX}_stream_subscribers", "Open /api/stream connections.", "term",
+    section_stream.subscriber_counts
+))
+
+# Seconds between keepalive comments on idle event streams, and the reconnect delay sent to clients
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_RETRY_MS = 5000
+
+# Majors/minors declaration requirements from the scraper's CSV (loaded at startup, reloaded when the file changes)
+requirements_data = RequirementsData(course_fetcher)
+requirements_data.preload()
+
+# Per-term refresh telemetry on /api/metrics: (metric name, stats field, help, type)
+REFRESH_METRICS = [
+    ("course_refresh_age_seconds", "age_seconds", "Seconds since the term's last successful refresh.", "gauge"),
+    ("course_refresh_total", "refreshes", "Successful course refreshes.", "counter"),
+    ("course_refresh_failures_total", "failures", "Failed course refreshes.", "counter"),
+    ("course_refresh_consecutive_failures", "consecutive_failures", "Failed refreshes since the last success.", "gauge"),
+    ("course_refresh_retries_total", "retries_total", "Upstream retries made while refreshing.", "counter"),
+    ("course_refresh_fetch_seconds", "fetch_seconds", "Upstream fetch time of the last refresh.", "gauge"),
+    ("course_refresh_parse_seconds", "parse_seconds", "JSON parse time of the last refresh.", "gauge"),
+    ("course_refresh_sort_seconds", "sort_seconds", "Sort time of the last refresh.", "gauge"),
+    ("course_refresh_index_seconds", "index_seconds", "Course index build time of the last refresh.", "gauge"),
+    ("course_refresh_response_bytes", "response_bytes", "Payload size of the last refresh.", "gauge"),
+    ("course_snapshot_courses", "courses", "Courses in the cached snapshot.", "gauge"),
+    ("course_snapshot_sections", "sections", "Sections in the cached snapshot.", "gauge"),
+    ("course_snapshot_meetings", "meetings", "Meeting times in the cached snapshot.", "gauge"),
+    ("course_snapshot_raw_memory_bytes", "raw_snapshot_memory_bytes_estimate",
+     "Estimated memory held by the cached raw course list (excluding its indexes and derived data).", "gauge"),
+]
+for metric_name, field, help_text, metric_type in REFRESH_METRICS:
+    metrics.REGISTRY.append(metrics.CallbackMetric(
+        f"{metrics.METRIC_PREFIX}_{metric_name}", help_text, "term",
+        lambda field=field: {term: stats.get(field) for term, stats in course_fetcher.get_refresh_stats().items()},
+        metric_type
+    ))
+
+# Maximum number of time windows accepted by the batch availability endpoint
+MAX_AVAILABILITY_WINDOWS = 100
+
+# Maximum number of courseStrings plus section indexes accepted by the batch course endpoint
+MAX_COURSE_BATCH_ITEMS = 100
+
+# Maximum number of section indexes accepted by the conflict check endpoint
+MAX_CONFLICT_SECTIONS = 100
+
+# Maximum number of instructor names accepted by the batch salary endpoint
+MAX_SALARY_BATCH_NAMES = 200
+
+# Maximum number of groups returned by the salary aggregates endpoint (total_groups has the full count)
+MAX_SALARY_GROUPS = 500
+
+# Maximum number of programs returned by the majors/minors search endpoint
+MAX_MAJOR_RESULTS = 200
+
 @app.route('/')
 def select_parameters():
     return render_template('select.html')
@@ -64,7 +243,49 @@ def search():
 def health_check():
     return jsonify({
         "status": "healthy",
-        "last_update": course_fetcher.last_update
+        "last_update": course_fetcher.last_update,
+        "terms": course_fetcher.get_refresh_stats(),
+        "precompressed_cache": precompressed.stats()
+    })
+
+@app.route('/api/metrics')
+@limiter.exempt
+def get_metrics():
+    """Stage and request latency histograms in the Prometheus text format"""
+    return Response(metrics.render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/debug/profiles')
+@limiter.exempt
+def list_profiles():
+    """List the stored request profiles (requires the profiling token)"""
+    if not profiler.is_authorized(_profile_token()):
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    return jsonify({"status": "success", "data": profiler.list_reports()})
+
+@app.route('/api/debug/profiles/<profile_id>')
+@limiter.exempt
+def get_profile(profile_id):
+    """Get a stored request profile as a plain text report (requires the profiling token)"""
+    report = profiler.get_report(profile_id) if profiler.is_authorized(_profile_token()) else None
+    if report is None:
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    header = f"{report['request']['method']} {report['request']['path']} {report['request']['args']} " \
+             f"({report['duration_ms']} ms, {report['created']})\n\n"
+    return Response(header + report['report'], mimetype='text/plain')
+
+@app.route('/api/debug/slow-requests')
+@limiter.exempt
+def get_slow_requests():
+    """
+    List the slowest recent requests with their parameters and stage timings (requires the
+    profiling token). The output can be replayed with benchmarks/load_test.py --replay.
+    """
+    if not profiler.is_authorized(_profile_token()):
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    return jsonify({
+        "status": "success",
+        "threshold_ms": profiler.slow_request_seconds * 1000,
+        "data": profiler.get_slow_requests()
     })
 
 @app.route('/api/courses')
@@ -155,6 +376,14 @@ def get_courses():
         if subject:
             filter_params['subject'] = subject
 
+        # Optional extra data inlined into each section (e.g. include=salary)
+        includes = {item.strip().lower() for item in request.args.get('include', '').split(',') if item.strip()}
+
+        versions = _snapshot_versions(params, includes)
+        cached = _cached_response(versions)
+        if cached is not None:
+            return cached
+
         courses = course_fetcher.get_courses(
             search=search, 
             year=params['year'], 
@@ -162,18 +391,342 @@ def get_courses():
             campus=params['campus'],
             filters=filter_params if filter_params else None
         )
-        return jsonify({
+
+        if 'salary' in includes:
+            instructor_salaries.attach(courses, params['year'], params['term'], params['campus'])
+
+        versions = versions if all(versions) else _snapshot_versions(params, includes)
+        return _cache_response({
             "status": "success",
             "data": courses,
+            "last_update": course_fetcher.last_update,
+            "version": change_feed.cursor(versions[0])
+        }, versions)
+    except Exception as e:
+        logger.error(f"Error fetching courses: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to fetch course data"
+        }), 500
+
+@app.route('/api/courses/changes')
+@limiter.limit("60 per minute")
+def get_course_changes():
+    """
+    API endpoint for the course changes (section status flips, meeting and instructor edits,
+    added or removed courses and sections) since a snapshot version returned by /api/courses.
+    Optional subject and index parameters (comma-separated) narrow the changes down.
+    """
+    params = get_request_params()
+    since = request.args.get('since', '')
+    try:
+        change_feed.parse_cursor(since)
+    except ValueError:
+        return jsonify({"status": "error", "message": "since must be a version returned by /api/courses"}), 400
+
+    subjects = {item.strip() for item in request.args.get('subject', '').split(',') if item.strip()}
+    indexes = {item.strip() for item in request.args.get('index', '').split(',') if item.strip()}
+    try:
+        changes = change_feed.get_changes(since, params['year'], params['term'], params['campus'],
+                                          subjects or None, indexes or None)
+        return jsonify({
+            "status": "success",
+            "data": changes,
             "last_update": course_fetcher.last_update
         })
     except Exception as e:
-        logger.error(f"Error fetching courses: {str(e)}")
+        logger.error(f"Error fetching course changes: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to fetch course changes"
+        }), 500
+
+@app.route('/api/stream')
+@limiter.limit("30 per minute")
+def stream_section_status():
+    """
+    Server-Sent Events stream of section open/closed transitions and snapshot version bumps,
+    optionally for some subjects and/or section indexes (comma-separated). A reconnecting
+    client (Last-Event-ID header, or since=<version>) first gets the transitions it missed.
+    """
+    params = get_request_params()
+    subjects = {item.strip() for item in request.args.get('subject', '').split(',') if item.strip()}
+    indexes = {item.strip() for item in request.args.get('index', '').split(',') if item.strip()}
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        if since:
+            change_feed.parse_cursor(since)
+    except ValueError:
+        return jsonify({"status": "error", "message": "since must be a version returned by /api/courses"}), 400
+
+    subscription = section_stream.subscribe(f"{params['year']}_{params['term']}_{params['campus']}",
+                                            subjects, indexes)
+    if subscription is None:
+        return jsonify({"status": "error", "message": "Too many open streams, please try again later"}), 503
+
+    # Subscribed before the backlog is read, so a refresh in between is not missed (at worst repeated)
+    try:
+        backlog = []
+        if not since:
+            version = change_feed.cursor(
+                course_fetcher.get_snapshot_version(params['year'], params['term'], params['campus']))
+        else:
+            changes = change_feed.get_changes(since, params['year'], params['term'], params['campus'],
+                                              subjects or None, indexes or None)
+            version = changes['version']
+            if changes['resync']:
+                backlog.append(("resync", None, {"version": version, "reason": "missed changes are not available"}))
+            backlog.extend(("section_status", None, change)
+                           for change in changes['changes'] if change['type'] == 'section_status')
+        backlog.append(("version", version, {"version": version, "time": course_fetcher.last_update}))
+    except Exception as e:
+        section_stream.unsubscribe(subscription)
+        logger.error(f"Error opening section stream: {str(e)}")
+        return jsonify({"status": "error", "message": "Failed to open the stream"}), 500
+
+    def generate():
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            for event in backlog:
+                yield format_event(*event)
+            while True:
+                events = subscription.wait(STREAM_KEEPALIVE_SECONDS)
+                if not events:
+                    yield ": keepalive\n\n"
+                for event in events:
+                    yield format_event(*event)
+        finally:
+            section_stream.unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/courses/batch', methods=['POST'])
+@limiter.limit("30 per minute")
+def get_courses_batch():
+    """
+    API endpoint to fetch specific courses and sections in one request.
+    Expects a JSON body {"courseStrings": [...], "indexes": [...]}.
+    """
+    params = get_request_params()
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"status": "error", "message": "Request body must be a JSON object"}), 400
+    course_strings = body.get('courseStrings') or []
+    indexes = body.get('indexes') or []
+
+    if not isinstance(course_strings, list) or not isinstance(indexes, list):
+        return jsonify({"status": "error", "message": "courseStrings and indexes must be lists"}), 400
+    if not course_strings and not indexes:
+        return jsonify({"status": "error", "message": "Missing courseStrings or indexes"}), 400
+    if len(course_strings) + len(indexes) > MAX_COURSE_BATCH_ITEMS:
+        return jsonify({
+            "status": "error",
+            "message": f"At most {MAX_COURSE_BATCH_ITEMS} courses and sections can be fetched per request"
+        }), 400
+
+    try:
+        data = course_fetcher.get_courses_batch(
+            [str(course_string).strip() for course_string in course_strings],
+            [str(index).strip() for index in indexes],
+            params['year'], params['term'], params['campus']
+        )
+        return jsonify({
+            "status": "success",
+            "data": data,
+            "last_update": course_fetcher.last_update
+        })
+    except Exception as e:
+        logger.error(f"Error fetching course batch: {str(e)}")
         return jsonify({
             "status": "error",
             "message": "Failed to fetch course data"
         }), 500
 
+@app.route('/api/schedules', methods=['POST'])
+@limiter.limit("20 per minute")
+def generate_schedules():
+    """
+    API endpoint to generate ranked conflict-free schedules for a set of courses.
+    Expects a JSON body {"courseStrings": [...], "constraints": {...}, "limit": 20} and streams
+    newline-delimited JSON: one record per schedule, best first, then a summary record.
+    """
+    params = get_request_params()
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"status": "error", "message": "Request body must be a JSON object"}), 400
+    course_strings = body.get('courseStrings')
+
+    if not isinstance(course_strings, list) or not course_strings:
+        return jsonify({"status": "error", "message": "Missing courseStrings"}), 400
+    if len(course_strings) > MAX_SCHEDULE_COURSES:
+        return jsonify({
+            "status": "error",
+            "message": f"At most {MAX_SCHEDULE_COURSES} courses can be scheduled per request"
+        }), 400
+
+    try:
+        limit = max(1, min(int(body.get('limit', DEFAULT_SCHEDULE_LIMIT)), MAX_SCHEDULE_LIMIT))
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "limit must be a number"}), 400
+
+    try:
+        constraints = parse_schedule_constraints(body.get('constraints'))
+        course_index = course_fetcher.get_course_index(params['year'], params['term'], params['campus'])
+        if course_index is None:
+            raise ValueError("No course data available for these parameters")
+        planner = SchedulePlanner(course_index, [str(course_string).strip() for course_string in course_strings], constraints)
+    except (TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    def generate():
+        for record in planner.iter_results(limit):
+            yield json.dumps(record) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/conflicts', methods=['POST'])
+@limiter.limit("60 per minute")
+def check_conflicts():
+    """
+    API endpoint to find every pair of overlapping sections.
+    Expects a JSON body {"indexes": [...]} of section index numbers.
+    """
+    params = get_request_params()
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"status": "error", "message": "Request body must be a JSON object"}), 400
+    indexes = body.get('indexes')
+
+    if not isinstance(indexes, list) or not indexes:
+        return jsonify({"status": "error", "message": "Missing section indexes"}), 400
+    if len(indexes) > MAX_CONFLICT_SECTIONS:
+        return jsonify({
+            "status": "error",
+            "message": f"At most {MAX_CONFLICT_SECTIONS} sections can be checked per request"
+        }), 400
+
+    try:
+        course_index = course_fetcher.get_course_index(params['year'], params['term'], params['campus'])
+        if course_index is None:
+            return jsonify({"status": "error", "message": "No course data available"}), 503
+        return jsonify({
+            "status": "success",
+            "data": find_conflicts(course_index, indexes),
+            "last_update": course_fetcher.last_update
+        })
+    except Exception as e:
+        logger.error(f"Error checking conflicts: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to check conflicts"
+        }), 500
+
+@app.route('/api/sections/<index>')
+@limiter.limit("100 per minute")
+def get_section(index):
+    """API endpoint to look up a section (and its course) by index number"""
+    params = get_request_params()
+    try:
+        course = course_fetcher.get_section(index, params['year'], params['term'], params['campus'])
+        if course is None:
+            return jsonify({
+                "status": "error",
+                "message": f"No section with index {index}"
+            }), 404
+        return jsonify({
+            "status": "success",
+            "data": course,
+            "last_update": course_fetcher.last_update
+        })
+    except Exception as e:
+        logger.error(f"Error fetching section {index}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to fetch section data"
+        }), 500
+
+@app.route('/api/suggest')
+@limiter.limit("300 per minute")
+def get_suggestions():
+    """API endpoint to autocomplete course codes, titles, subjects and instructors"""
+    params = get_request_params()
+    query = request.args.get('q', '').strip()
+
+    try:
+        limit = min(int(request.args.get('limit', '10')), 25)
+    except ValueError:
+        return jsonify({"status": "error", "message": "limit must be a number"}), 400
+    if limit < 1:
+        return jsonify({"status": "error", "message": "limit must be at least 1"}), 400
+
+    try:
+        course_index = course_fetcher.get_course_index(params['year'], params['term'], params['campus'])
+        suggestions = course_index.suggest(query, limit) if course_index and query else []
+        return jsonify({
+            "status": "success",
+            "data": suggestions,
+            "last_update": course_fetcher.last_update
+        })
+    except Exception as e:
+        logger.error(f"Error fetching suggestions: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to fetch suggestions"
+        }), 500
+
+@app.route('/api/majors')
+@limiter.limit("100 per minute")
+def search_majors():
+    """API endpoint to search majors and minors by name, school or requirement text"""
+    query = request.args.get('q', '').strip()
+    school = request.args.get('school', '').strip() or None
+
+    try:
+        limit = min(int(request.args.get('limit', '50')), MAX_MAJOR_RESULTS)
+    except ValueError:
+        return jsonify({"status": "error", "message": "limit must be a number"}), 400
+    if limit < 1:
+        return jsonify({"status": "error", "message": "limit must be at least 1"}), 400
+
+    try:
+        programs = requirements_data.search(query, school, limit)
+        return jsonify({
+            "status": "success",
+            "data": programs,
+            "last_update": requirements_data.last_loaded
+        })
+    except Exception as e:
+        logger.error(f"Error searching majors: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to search majors and minors"
+        }), 500
+
+@app.route('/api/majors/<path:slug>')
+@limiter.limit("100 per minute")
+def get_major(slug):
+    """API endpoint to look up a major or minor, with the courses its requirement mentions"""
+    params = get_request_params()
+    try:
+        program = requirements_data.get_program(slug)
+        if program is None:
+            return jsonify({
+                "status": "error",
+                "message": f"No major or minor named {slug}"
+            }), 404
+        return jsonify({
+            "status": "success",
+            "data": requirements_data.link_courses(program, params['year'], params['term'], params['campus']),
+            "last_update": course_fetcher.last_update
+        })
+    except Exception as e:
+        logger.error(f"Error fetching major {slug}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to fetch major data"
+        }), 500
+
 @app.route('/static/<path:path>')
 def serve_static(path):
     return send_from_directory('static', path)
@@ -194,28 +747,156 @@ def get_salary():
     instructor_name = request.args.get('name', '').strip()
 
     if not instructor_name:
-        print("❌ No instructor name received!")
         return jsonify({"error": "Missing instructor name"}), 400
 
-    print(f"🔍 Salary API received request for: '{instructor_name}'")  # Debugging
+    logger.debug("Salary API received request for: '%s'", instructor_name)
 
     salary_info = salary_data.get_salary_by_instructor(instructor_name)
 
     if salary_info:
         salary_entry = salary_info[0]  # Get first match
-        return jsonify({
-            "name": salary_entry.get("Name", "Unknown"),
-            "title": salary_entry.get("Title", "Unknown"),
-            "department": salary_entry.get("Department", "Unknown"),
-            "campus": salary_entry.get("Campus", "Unknown"),
-            "base_pay": salary_entry.get("Base Pay", "Unknown"),
-            "gross_pay": salary_entry.get("Gross Pay", "Unknown"),
-            "hire_date": salary_entry.get("Hire Date", "Unknown")
-        })
+        return jsonify(format_salary_entry(salary_entry))
 
-    print("⚠️ No salary data found!")
+    logger.debug("No salary data found for '%s'", instructor_name)
     return jsonify({"error": "No salary data found"}), 404
 
+@app.route('/api/salary/suggest')
+@limiter.limit("120 per minute")
+def get_salary_suggestions():
+    """API endpoint to autocomplete instructor names from the salary data"""
+    query = request.args.get('q', '').strip()
+
+    try:
+        limit = min(int(request.args.get('limit', '8')), 25)
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+
+    if not query:
+        return jsonify({"data": []})
+
+    return jsonify({
+        "data": [format_salary_entry(entry) for entry in salary_data.suggest_names(query, limit)]
+    })
+
+@app.route('/api/salary/aggregates')
+@limiter.limit("30 per minute")
+def get_salary_aggregates():
+    """
+    API endpoint for salary statistics per department, campus or title:
+    count, mean, median, percentiles, min and max of base or gross pay
+    (the first `limit` groups in sort order, at most MAX_SALARY_GROUPS).
+    """
+    group_by = request.args.get('group_by', 'department')
+    metric = request.args.get('metric', 'base_pay')
+    sort = request.args.get('sort', 'median')
+
+    if group_by not in GROUP_FIELDS:
+        return jsonify({"error": f"group_by must be one of: {', '.join(GROUP_FIELDS)}"}), 400
+    if metric not in METRIC_FIELDS:
+        return jsonify({"error": f"metric must be one of: {', '.join(METRIC_FIELDS)}"}), 400
+    if sort not in ('median', 'mean', 'count', 'max', 'name'):
+        return jsonify({"error": "sort must be one of: median, mean, count, max, name"}), 400
+
+    try:
+        limit = min(int(request.args.get('limit', '50')), MAX_SALARY_GROUPS)
+        min_count = int(request.args.get('min_count', '1'))
+    except ValueError:
+        return jsonify({"error": "limit and min_count must be numbers"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+
+    versions = [salary_data.version]
+    cached = _cached_response(versions)
+    if cached is not None:
+        return cached
+
+    groups = [group for group in salary_data.columns.aggregate(group_by, metric) if group['count'] >= min_count]
+    if sort == 'name':
+        groups = sorted(groups, key=lambda group: group['name'])
+    else:
+        groups = sorted(groups, key=lambda group: group[sort], reverse=True)
+
+    return _cache_response({
+        "group_by": group_by,
+        "metric": metric,
+        "total_groups": len(groups),
+        "data": groups[:limit]
+    }, versions)
+
+@app.route('/api/salary/top')
+@limiter.limit("30 per minute")
+def get_salary_top():
+    """
+    API endpoint for the highest-paid people, overall or within one department, campus or title.
+    """
+    group_by = request.args.get('group_by', '')
+    group = request.args.get('group', '')
+    metric = request.args.get('metric', 'base_pay')
+    hired_after = request.args.get('hired_after', '')
+
+    if group_by and group_by not in GROUP_FIELDS:
+        return jsonify({"error": f"group_by must be one of: {', '.join(GROUP_FIELDS)}"}), 400
+    if metric not in METRIC_FIELDS:
+        return jsonify({"error": f"metric must be one of: {', '.join(METRIC_FIELDS)}"}), 400
+
+    try:
+        limit = min(int(request.args.get('limit', '10')), 100)
+        hired_after_date = date.fromisoformat(hired_after) if hired_after else None
+    except ValueError:
+        return jsonify({"error": "limit must be a number and hired_after a YYYY-MM-DD date"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+
+    code = None
+    if group_by:
+        code = salary_data.columns.find_category(group_by, group)
+        if code is None:
+            return jsonify({"error": f"Unknown {group_by}: {group}"}), 404
+
+    positions = salary_data.columns.top_rows(
+        metric, limit, group_by=group_by or None, code=code, hired_after=hired_after_date
+    )
+
+    return jsonify({
+        "metric": metric,
+        "group_by": group_by or None,
+        "group": salary_data.columns.categories[group_by][code] if group_by else None,
+        "data": [format_salary_entry(salary_data.salaries[position]) for position in positions]
+    })
+
+@app.route('/api/salary/batch', methods=['POST'])
+@limiter.limit("20 per minute")
+def get_salary_batch():
+    """
+    API endpoint to resolve the salaries of many instructors in one request.
+    Expects a JSON body {"names": [...]}; returns, per name, the match type and the first match.
+    """
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    names = body.get('names')
+
+    if not isinstance(names, list) or not names:
+        return jsonify({"error": "Missing instructor names"}), 400
+    if len(names) > MAX_SALARY_BATCH_NAMES:
+        return jsonify({"error": f"At most {MAX_SALARY_BATCH_NAMES} names can be looked up per request"}), 400
+
+    names = [str(name).strip() for name in names if str(name).strip()]
+    matches = salary_data.match_instructors(names)
+
+    return jsonify({
+        "data": {
+            name: {
+                "match_type": match_type,
+                "salary": format_salary_entry(entry) if entry else None
+            }
+            for name, (match_type, entry) in matches.items()
+        },
+        "matched": sum(1 for _, entry in matches.values() if entry)
+    })
+
 @app.route('/room-search')
 def room_search_page():
     """Render the room search page"""
@@ -272,7 +953,7 @@ def get_rooms():
         
         if filter_available and day and start_time and end_time:
             # Filter rooms by availability in time range
-            logger.debug(f"Filtering for available rooms on {day} from {start_time} to {end_time}")
+            logger.debug("Filtering for available rooms on %s from %s to %s", day, start_time, end_time)
             rooms = room_fetcher.find_available_rooms(
                 day=day, 
                 start_time=start_time,
@@ -293,15 +974,16 @@ def get_rooms():
                 campus_filters=campus_filters if campus_filters else None
             )
         
-        return jsonify({
-            "status": "success",
-            "data": rooms,
-            "count": len(rooms),
-            "filter_applied": filter_available and day and start_time and end_time,
-            "building_types_filtered": bool(building_types),
-            "campus_filtered": bool(campus_filters),
-            "last_update": course_fetcher.last_update
-        })
+        with metrics.stage("serialize"):
+            return jsonify({
+                "status": "success",
+                "data": rooms,
+                "count": len(rooms),
+                "filter_applied": filter_available and day and start_time and end_time,
+                "building_types_filtered": bool(building_types),
+                "campus_filtered": bool(campus_filters),
+                "last_update": course_fetcher.last_update
+            })
     except Exception as e:
         logger.error(f"Error searching rooms: {str(e)}")
         return jsonify({
@@ -324,18 +1006,251 @@ def get_room_schedule():
                 "message": "Building and room must be specified"
             }), 400
         
+        versions = _snapshot_versions(params)
+        cached = _cached_response(versions)
+        if cached is not None:
+            return cached
+
         room_schedule = room_fetcher.get_room_schedule(
             building, room, year=params['year'], term=params['term'], campus=params['campus']
         )
         
-        return jsonify({
+        return _cache_response({
             "status": "success",
             "data": room_schedule,
             "last_update": course_fetcher.last_update
-        })
+        }, versions if all(versions) else _snapshot_versions(params))
     except Exception as e:
         logger.error(f"Error getting room schedule: {str(e)}")
         return jsonify({
             "status": "error",
             "message": "Failed to get room schedule"
         }), 500
+
+
+@app.route('/api/rooms/availability', methods=['POST'])
+@limiter.limit("30 per minute")
+def get_rooms_availability():
+    """
+    API endpoint to answer many room availability questions in one request.
+
+    Expects a JSON body with a list of "windows" ({"day", "start_time", "end_time"}) and
+    either a list of "rooms" to check or an optional "search" query narrowing the rooms.
+    """
+    try:
+        params = get_request_params()
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            return jsonify({
+                "status": "error",
+                "message": "Request body must be a JSON object"
+            }), 400
+        windows = body.get('windows') or []
+        rooms = body.get('rooms') or None
+
+        if not isinstance(windows, list) or not windows:
+            return jsonify({
+                "status": "error",
+                "message": "At least one time window must be specified"
+            }), 400
+        if len(windows) > MAX_AVAILABILITY_WINDOWS:
+            return jsonify({
+                "status": "error",
+                "message": f"At most {MAX_AVAILABILITY_WINDOWS} time windows can be checked per request"
+            }), 400
+        if rooms is not None and not isinstance(rooms, list):
+            return jsonify({
+                "status": "error",
+                "message": "rooms must be a list"
+            }), 400
+
+        availability = room_fetcher.check_availability(
+            windows,
+            rooms=rooms,
+            search=body.get('search', ''),
+            year=params['year'],
+            term=params['term'],
+            campus=params['campus']
+        )
+
+        return jsonify({
+            "status": "success",
+            "data": availability,
+            "last_update": course_fetcher.last_update
+        })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error checking room availability: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to check room availability"
+        }), 500
+
+@app.route('/api/rooms/next-free')
+@limiter.limit("50 per minute")
+def get_room_next_free():
+    """API endpoint to find the next free slot of a minimum length in a room"""
+    try:
+        params = get_request_params()
+        building = request.args.get('building', '')
+        room = request.args.get('room', '')
+        day = request.args.get('day', '')
+        after = request.args.get('after', '')
+        until = request.args.get('until', '')
+
+        if not building or not room or not day:
+            return jsonify({
+                "status": "error",
+                "message": "Building, room and day must be specified"
+            }), 400
+
+        try:
+            duration = int(request.args.get('duration', '60'))
+        except ValueError:
+            return jsonify({
+                "status": "error",
+                "message": "duration must be a number of minutes"
+            }), 400
+
+        slot = room_fetcher.find_next_free_slot(
+            building, room, day, after, duration,
+            year=params['year'], term=params['term'], campus=params['campus'], until=until
+        )
+
+        return jsonify({
+            "status": "success",
+            "data": slot,
+            "found": slot is not None,
+            "last_update": course_fetcher.last_update
+        })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error finding next free slot: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to find next free slot"
+        }), 500
+
+@app.route('/api/rooms/nearest')
+@limiter.limit("50 per minute")
+def get_nearest_rooms():
+    """API endpoint to find the closest rooms that are free for a time range (defaults to now)"""
+    try:
+        params = get_request_params()
+        building = request.args.get('building', '')
+
+        try:
+            lat = float(request.args['lat']) if request.args.get('lat') else None
+            lng = float(request.args['lng']) if request.args.get('lng') else None
+            limit = min(int(request.args.get('limit', '5')), 50)
+            max_distance = float(request.args['max_distance']) if request.args.get('max_distance') else None
+        except ValueError:
+            return jsonify({
+                "status": "error",
+                "message": "lat, lng, limit and max_distance must be numbers"
+            }), 400
+        # Also rejects nan and inf, which compare False to everything
+        if (lat is not None and not -90 <= lat <= 90) or (lng is not None and not -180 <= lng <= 180):
+            return jsonify({
+                "status": "error",
+                "message": "lat must be between -90 and 90 and lng between -180 and 180"
+            }), 400
+
+        rooms = room_fetcher.find_nearest_available_rooms(
+            lat=lat,
+            lng=lng,
+            building=building,
+            day=request.args.get('day', ''),
+            start_time=request.args.get('start_time', ''),
+            end_time=request.args.get('end_time', ''),
+            limit=limit,
+            max_distance=max_distance,
+            year=params['year'],
+            term=params['term'],
+            campus=params['campus']
+        )
+
+        return jsonify({
+            "status": "success",
+            "data": rooms,
+            "count": len(rooms),
+            "last_update": course_fetcher.last_update
+        })
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error finding nearest rooms: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to find nearest rooms"
+        }), 500
+
+@app.route('/api/rooms/utilization')
+@limiter.limit("30 per minute")
+def get_rooms_utilization():
+    """
+    API endpoint for room utilization analytics: scheduled hours and utilization
+    per building, campus and building type, day x hour heatmaps and underused rooms.
+    Pass building=<code> for per-room detail within one building.
+    """
+    try:
+        params = get_request_params()
+        building = request.args.get('building', '')
+
+        try:
+            threshold = float(request.args.get('threshold', DEFAULT_UNDERUSED_THRESHOLD))
+        except ValueError:
+            return jsonify({
+                "status": "error",
+                "message": "threshold must be a number"
+            }), 400
+
+        versions = _snapshot_versions(params)
+        cached = _cached_response(versions)
+        if cached is not None:
+            return cached
+
+        utilization = room_fetcher.get_room_utilization(
+            year=params['year'], term=params['term'], campus=params['campus']
+        )
+
+        if building:
+            building_rooms = utilization.building_rooms(building)
+            if building_rooms is None:
+                return jsonify({
+                    "status": "error",
+                    "message": f"No rooms found for building {building}"
+                }), 404
+            data = {
+                **utilization.summary()['buildings'].get(building.upper(), {}),
+                "building": building.upper(),
+                "rooms_detail": building_rooms
+            }
+        else:
+            data = {
+                **utilization.summary(),
+                "underused_rooms": utilization.underused_rooms(threshold)
+            }
+
+        return _cache_response({
+            "status": "success",
+            "data": data,
+            "last_update": course_fetcher.last_update
+        }, versions if all(versions) else _snapshot_versions(params))
+    except Exception as e:
+        logger.error(f"Error computing room utilization: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to compute room utilization"
+        }), 500
@@ -0,0 +1 @@
+"""Offline benchmarks and synthetic SOC data for the Rutgers course search application."""
@@ -0,0 +1,206 @@
+"""
+Local stand-in for the SAS majors and minors pages scraped by degree_scraper.py.
+
+Serves a list page and one page per program in the same HTML structure as the live site,
+with ETag/Last-Modified validators (answering conditional requests with 304), optional
+latency, injected errors and program pages that change between runs.
+
+Usage (from the repository root):
+    python -m benchmarks.degree_site_standin --port 8766 --programs 190 --error-rate 0.05
+    python degree_scraper.py --base-url http://127.0.0.1:8766 --min-interval 0.05 \\
+        --output /tmp/majors.csv --cache /tmp/majors_cache.json
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from degree_scraper import LIST_PATH
+
+DETAIL_PREFIX = "/majors-and-core-curriculum/major/major-minor-details/"
+STATS_PATH = "/__stats"
+
+SUBJECTS = [
+    "Africana Studies", "Anthropology", "Art History", "Biological Sciences", "Chemistry", "Cognitive Science",
+    "Computer Science", "Economics", "English", "Genetics", "Geography", "History", "Linguistics",
+    "Mathematics", "Philosophy", "Physics", "Political Science", "Psychology", "Sociology", "Statistics",
+]
+
+
+class DegreeSiteStandin:
+    """Generated pages, their validators and fault injection settings shared by the handlers."""
+
+    def __init__(self, programs: int = 190, latency_ms: float = 0.0, error_rate: float = 0.0,
+                 validators: bool = True, seed: int = 2025):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.validators = validators
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0,
+                      "in_flight": 0, "max_in_flight": 0, "changes": 0}
+        self.programs = []
+        for number in range(programs):
+            name = f"{SUBJECTS[number % len(SUBJECTS)]} {number // len(SUBJECTS) + 1}"
+            kind = "Major" if number % 3 else "Minor"
+            self.programs.append({
+                "name": f"{name} ({kind})",
+                "slug": name.lower().replace(" ", "-") + f"-{kind.lower()}",
+                "requirement": f"Complete two courses in {name} with a grade of C or better." if number % 4 else "",
+                "revision": 1,
+            })
+        self.pages = {}  # path -> (body, etag, last modified)
+        self._render_all()
+
+    def _render_all(self) -> None:
+        self.pages[LIST_PATH] = self._page(self._list_html())
+        for program in self.programs:
+            self.pages[DETAIL_PREFIX + program["slug"]] = self._page(self._detail_html(program))
+
+    @staticmethod
+    def _page(html: str):
+        body = html.encode("utf-8")
+        return body, '"' + hashlib.md5(body).hexdigest() + '"', formatdate(time.time(), usegmt=True)
+
+    def _list_html(self) -> str:
+        rows = "".join(
+            f'<tr class="latestnews-item">'
+            f'<td data-title="Major / Minor"><a href="{DETAIL_PREFIX}{program["slug"]}">{program["name"]}</a></td>'
+            f'<td data-title="School"><span class="detail_data">SAS</span></td>'
+            f'<td data-title="Advising Page"><a href="https://example.edu/{program["slug"]}/advising">'
+            f'Advising - {program["name"]}</a></td></tr>'
+            for program in self.programs
+        )
+        return f"<html><body><table><tbody>{rows}</tbody></table></body></html>"
+
+    @staticmethod
+    def _detail_html(program: Dict) -> str:
+        sections = '<a class="collapsible" href="#overview">Overview</a><div id="overview">About the program</div>'
+        if program["requirement"]:
+            sections += (f'<a class="collapsible" href="#declare">Requirement for Major Declaration</a>'
+                         f'<div id="declare"><span class="field-value">{program["requirement"]} '
+                         f'(revision {program["revision"]})</span></div>')
+        return f"<html><body><h1>{program['name']}</h1>{sections}</body></html>"
+
+    def change(self, count: int) -> None:
+        """Revise the requirement text of `count` random programs (new content, validators and hash)."""
+        with self.lock:
+            for program in self.rng.sample(self.programs, min(count, len(self.programs))):
+                program["revision"] += 1
+                self.pages[DETAIL_PREFIX + program["slug"]] = self._page(self._detail_html(program))
+                self.stats["changes"] += 1
+
+    def injected_error(self) -> bool:
+        with self.lock:
+            return bool(self.error_rate) and self.rng.random() < self.error_rate
+
+
+def make_handler(standin: DegreeSiteStandin):
+    """Build a request handler class bound to a stand-in instance."""
+
+    class DegreeSiteHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == STATS_PATH:
+                return self._send(200, json.dumps(standin.stats).encode("utf-8"), "application/json")
+
+            with standin.lock:
+                standin.stats["requests"] += 1
+                standin.stats["in_flight"] += 1
+                standin.stats["max_in_flight"] = max(standin.stats["max_in_flight"], standin.stats["in_flight"])
+            try:
+                if standin.latency_ms:
+                    time.sleep(standin.latency_ms / 1000)
+                self._serve(path)
+            finally:
+                with standin.lock:
+                    standin.stats["in_flight"] -= 1
+
+        def _serve(self, path: str):
+            if standin.injected_error():
+                with standin.lock:
+                    standin.stats["errors"] += 1
+                return self._send(503, b"Service Unavailable", "text/plain")
+
+            with standin.lock:
+                page = standin.pages.get(path)
+            if page is None:
+                return self._send(404, b"Not Found", "text/plain")
+
+            body, etag, last_modified = page
+            if standin.validators and (self.headers.get("If-None-Match") == etag or
+                                       self.headers.get("If-Modified-Since") == last_modified):
+                with standin.lock:
+                    standin.stats["not_modified"] += 1
+                return self._send(304, b"", None, etag, last_modified)
+            with standin.lock:
+                standin.stats["ok"] += 1
+            self._send(200, body, "text/html; charset=utf-8", etag, last_modified)
+
+        def _send(self, status: int, body: bytes, content_type: Optional[str],
+                  etag: Optional[str] = None, last_modified: Optional[str] = None):
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            if standin.validators and etag:
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return DegreeSiteHandler
+
+
+def serve(standin: DegreeSiteStandin, host: str = "127.0.0.1", port: int = 8766) -> ThreadingHTTPServer:
+    """Start the stand-in in a background thread and return the server (call shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), make_handler(standin))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the SAS majors and minors pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--programs", type=int, default=190)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--no-validators", action="store_true", help="omit ETag/Last-Modified (forces hash checks)")
+    parser.add_argument("--change-every", type=float, default=0.0,
+                        help="revise a few program pages every N seconds (0 = never)")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    standin = DegreeSiteStandin(args.programs, args.latency_ms, args.error_rate, not args.no_validators, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(standin))
+    print(f"Degree site stand-in listening on http://{args.host}:{args.port}{LIST_PATH}")
+    if args.change_every:
+        def revise():
+            while True:
+                time.sleep(args.change_every)
+                standin.change(max(1, len(standin.programs) // 20))
+        threading.Thread(target=revise, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
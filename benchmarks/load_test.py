@@ -0,0 +1,308 @@
+"""
+Concurrent load driver for the Flask app.
+
+Replays a mix of /api/courses, /api/rooms, /api/room-schedule and /api/salary traffic
+and reports throughput plus p50/p95/p99 latency per endpoint. Course refreshes that
+happen during the run (seen through /api/health) are counted, so runs can be made
+against a short refresh interval to measure serving while data is being swapped.
+
+Typical setup (from the repository root):
+    python -m benchmarks.soc_standin --port 8765 --mutate-every 1 &
+    SOC_API_URL=http://127.0.0.1:8765/soc/api/courses.json RATELIMIT_ENABLED=false \\
+        COURSE_REFRESH_MINUTES=0.5 python main.py &
+    python -m benchmarks.load_test --base-url http://127.0.0.1:5000 --duration 60 --concurrency 16
+
+Requests from the app's slow request log (GET /api/debug/slow-requests, saved to a file)
+can be replayed one by one to reproduce them:
+    python -m benchmarks.load_test --base-url http://127.0.0.1:5000 --replay slow.json --repeat 5
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.run_benchmarks import FILTER_SETS, SEARCH_QUERIES
+
+SALARY_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rutgers_salaries.csv")
+
+# Share of requests sent to each endpoint
+DEFAULT_MIX = "courses=45,rooms=20,room_schedule=15,salary=20"
+
+# Query parameters the app's /api/courses filters are sent as
+FILTER_PARAMS = {
+    "status": {"status_open": "true"},
+    "days": {"day_m": "true", "day_w": "true"},
+    "time": {"time_morning": "true", "time_evening": "true"},
+    "campus": {"campus_busch": "true"},
+    "online": {"type_online": "true"},
+    "combined": {"status_open": "true", "day_t": "true", "day_h": "true",
+                 "time_afternoon": "true", "campus_livingston": "true"},
+}
+ROOM_QUERIES = ["ARC", "busch", "hill", "lecture hall", "SEC 1", "livingston", "TIL"]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # The smallest value with at least `fraction` of the values at or below it (rounded first so
+    # float error such as 0.07 * 100 = 7.000000000000001 doesn't push the rank up by one)
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(round(fraction * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+
+def load_salary_names(limit: int = 500, seed: int = 1) -> List[str]:
+    """Sample instructor names from the salary CSV, in both "First Last" and "LAST, FIRST" forms."""
+    try:
+        with open(SALARY_CSV, newline="", encoding="utf-8") as csvfile:
+            names = [row.get("Name", "").strip() for row in csv.DictReader(csvfile)]
+    except OSError:
+        names = []
+    names = [name for name in names if name]
+    rng = random.Random(seed)
+    sample = rng.sample(names, min(limit, len(names))) if names else ["John Smith"]
+    converted = []
+    for name in sample:
+        parts = name.split()
+        if len(parts) >= 2 and rng.random() < 0.5:
+            name = f"{parts[-1].upper()}, {' '.join(parts[:-1]).upper()}"
+        converted.append(name)
+    return converted
+
+
+class LoadTest:
+    """Request factories, worker threads and latency bookkeeping for one run."""
+
+    def __init__(self, base_url: str, params: Dict[str, str], mix: Dict[str, int], seed: int = 7):
+        self.base_url = base_url.rstrip("/")
+        self.params = params
+        self.mix = mix
+        self.seed = seed
+        self.salary_names = load_salary_names()
+        self.rooms = self._discover_rooms()
+        self.lock = threading.Lock()
+        self.samples = {endpoint: [] for endpoint in mix}   # endpoint -> latencies (ms)
+        self.statuses = {endpoint: {} for endpoint in mix}  # endpoint -> status code -> count
+        self.factories = {
+            "courses": self._courses_request,
+            "rooms": self._rooms_request,
+            "room_schedule": self._room_schedule_request,
+            "salary": self._salary_request,
+        }
+        unknown = set(mix) - set(self.factories)
+        if unknown:
+            raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+
+    def _discover_rooms(self) -> List[Tuple[str, str]]:
+        """Get (building, room) pairs to request schedules for from the app itself."""
+        try:
+            response = requests.get(f"{self.base_url}/api/rooms", params=self.params, timeout=60)
+            rooms = response.json().get("data", [])
+            return [(room["building"], room["room"]) for room in rooms if room.get("building")] or [("ARC", "103")]
+        except (requests.RequestException, ValueError, KeyError):
+            return [("ARC", "103")]
+
+    def _courses_request(self, rng: random.Random) -> Tuple[str, Dict]:
+        params = dict(self.params)
+        roll = rng.random()
+        if roll < 0.7:
+            params["search"] = rng.choice(rng.choice(list(SEARCH_QUERIES.values())))
+        if roll > 0.5:
+            params.update(FILTER_PARAMS[rng.choice(list(FILTER_SETS))])
+        return "/api/courses", params
+
+    def _rooms_request(self, rng: random.Random) -> Tuple[str, Dict]:
+        params = dict(self.params, search=rng.choice(ROOM_QUERIES))
+        if rng.random() < 0.3:
+            params.update(filter_available="true", day=rng.choice(["Monday", "Tuesday", "Wednesday"]),
+                          start_time="10:20 AM", end_time="11:40 AM")
+        return "/api/rooms", params
+
+    def _room_schedule_request(self, rng: random.Random) -> Tuple[str, Dict]:
+        building, room = rng.choice(self.rooms)
+        return "/api/room-schedule", dict(self.params, building=building, room=room)
+
+    def _salary_request(self, rng: random.Random) -> Tuple[str, Dict]:
+        return "/api/salary", {"name": rng.choice(self.salary_names)}
+
+    def _worker(self, worker_id: int, deadline: float) -> None:
+        rng = random.Random(self.seed + worker_id)
+        session = requests.Session()
+        endpoints = list(self.mix)
+        weights = [self.mix[endpoint] for endpoint in endpoints]
+        samples = {endpoint: [] for endpoint in endpoints}
+        statuses = {endpoint: {} for endpoint in endpoints}
+
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, weights=weights)[0]
+            path, params = self.factories[endpoint](rng)
+            start = time.perf_counter()
+            try:
+                status = session.get(f"{self.base_url}{path}", params=params, timeout=60).status_code
+            except requests.RequestException:
+                status = "error"
+            samples[endpoint].append((time.perf_counter() - start) * 1000)
+            statuses[endpoint][status] = statuses[endpoint].get(status, 0) + 1
+
+        with self.lock:
+            for endpoint in endpoints:
+                self.samples[endpoint].extend(samples[endpoint])
+                for status, count in statuses[endpoint].items():
+                    self.statuses[endpoint][status] = self.statuses[endpoint].get(status, 0) + count
+
+    def _watch_refreshes(self, deadline: float, refreshes: List[str]) -> None:
+        """Record every distinct last_update reported by /api/health during the run."""
+        seen = None
+        while time.perf_counter() < deadline:
+            try:
+                last_update = requests.get(f"{self.base_url}/api/health", timeout=10).json().get("last_update")
+                if seen is not None and last_update != seen:
+                    refreshes.append(last_update)
+                seen = last_update
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(1)
+
+    def run(self, duration: float, concurrency: int) -> Dict:
+        """Run the load for `duration` seconds with `concurrency` workers and summarize it."""
+        deadline = time.perf_counter() + duration
+        refreshes = []
+        threads = [threading.Thread(target=self._worker, args=(worker_id, deadline))
+                   for worker_id in range(concurrency)]
+        threads.append(threading.Thread(target=self._watch_refreshes, args=(deadline, refreshes)))
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        endpoints = {}
+        for endpoint, latencies in self.samples.items():
+            latencies.sort()
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+                "statuses": {str(status): count for status, count in self.statuses[endpoint].items()},
+            }
+        total = sum(len(latencies) for latencies in self.samples.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "concurrency": concurrency,
+            "total_requests": total,
+            "throughput_rps": round(total / elapsed, 2),
+            "refreshes_observed": len(refreshes),
+            "endpoints": endpoints,
+        }
+
+
+def replay(base_url: str, entries: List[Dict], repeat: int = 3) -> List[Dict]:
+    """
+    Re-send logged requests and time them.
+
+    Args:
+        base_url: Root URL of the app
+        entries: Slow request log entries ({"method", "path", "args", "json", "duration_ms"})
+        repeat: Times each request is sent
+
+    Returns:
+        Per request: method, path, the logged duration and the replayed median and max
+    """
+    session = requests.Session()
+    results = []
+    for entry in entries:
+        timings = []
+        status = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                status = session.request(entry.get("method", "GET"), f"{base_url.rstrip('/')}{entry['path']}",
+                                         params=entry.get("args") or None, json=entry.get("json"),
+                                         timeout=120).status_code
+            except requests.RequestException:
+                status = "error"
+            timings.append((time.perf_counter() - start) * 1000)
+        results.append({
+            "method": entry.get("method", "GET"),
+            "path": entry["path"],
+            "args": entry.get("args") or {},
+            "status": status,
+            "logged_ms": entry.get("duration_ms"),
+            "median_ms": round(statistics.median(timings), 2),
+            "max_ms": round(max(timings), 2),
+        })
+    return results
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse "courses=45,rooms=20" into {"courses": 45, "rooms": 20}."""
+    weights = {}
+    for item in mix.split(","):
+        if item.strip():
+            endpoint, _, weight = item.partition("=")
+            weights[endpoint.strip()] = int(weight or 1)
+    return weights
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{report['total_requests']} requests in {report['duration_s']}s "
+          f"({report['throughput_rps']} req/s, {report['concurrency']} workers, "
+          f"{report['refreshes_observed']} refreshes observed)\n")
+    print(f"{'endpoint':<15} {'requests':>9} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}  statuses")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<15} {stats['requests']:>9} {stats['throughput_rps']:>8} "
+              f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms  {stats['statuses']}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a mixed API load against the Flask app")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights, e.g. courses=45,salary=20")
+    parser.add_argument("--year", default="2025")
+    parser.add_argument("--term", default="1")
+    parser.add_argument("--campus", default="NB")
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    parser.add_argument("--replay", help="replay the requests in a saved /api/debug/slow-requests response instead")
+    parser.add_argument("--repeat", type=int, default=3, help="times each replayed request is sent")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as replay_file:
+            logged = json.load(replay_file)
+        results = replay(args.base_url, logged.get("data", logged) if isinstance(logged, dict) else logged,
+                         args.repeat)
+        for result in results:
+            print(f"{result['method']:<5} {result['path']:<25} logged {result['logged_ms'] or 0:>9.1f}ms  "
+                  f"replayed median {result['median_ms']:>9.1f}ms  max {result['max_ms']:>9.1f}ms  "
+                  f"[{result['status']}] {result['args']}")
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2)
+        return
+
+    load_test = LoadTest(args.base_url, {"year": args.year, "term": args.term, "campus": args.campus},
+                         parse_mix(args.mix))
+    report = load_test.run(args.duration, args.concurrency)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
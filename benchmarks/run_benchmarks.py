@@ -0,0 +1,201 @@
+"""
+Offline benchmark suite for the course, room and salary code paths.
+
+Runs against a synthetic SOC payload (see benchmarks/soc_generator.py), so no network
+access is needed. Results are written as JSON and can be compared with an earlier run.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --courses 1000 --only search
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.soc_generator import generate_courses
+from course_fetcher import CourseFetcher
+from room_fetcher import RoomFetcher
+from room_index import RoomIndex
+from salary_api import SalaryData
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Parameters the synthetic snapshot is installed under
+YEAR, TERM, CAMPUS = "2025", "1", "NB"
+
+# Median slowdown (percent) reported as a regression by --compare
+DEFAULT_REGRESSION_THRESHOLD = 10.0
+
+SEARCH_QUERIES = {
+    "code": ["cs 111", "198:205", "math 151", "111", "econ 102"],
+    "words": ["calculus", "intro computer", "organic chemistry", "data", "linear algebra"],
+    "instructor": ["smith", "patel, priya", "john chen", "menendez"],
+}
+
+FILTER_SETS = {
+    "status": {"status": ["open"]},
+    "days": {"days": ["M", "W"]},
+    "time": {"time_range": ["morning", "evening"]},
+    "campus": {"campus": ["Busch"]},
+    "online": {"course_type": ["online"]},
+    "combined": {"status": ["open"], "days": ["T", "H"], "time_range": ["afternoon"], "campus": ["Livingston"]},
+}
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Time `fn` `repeat` times (after `warmup` untimed calls) and summarize in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def build_suite(courses: List[Dict]) -> List[Tuple[str, Callable[[], object]]]:
+    """Set up the fetchers on the synthetic snapshot and list the (name, callable) benchmarks."""
+    payload = json.dumps(courses).encode("utf-8")
+    course_fetcher = CourseFetcher(autoload=False)
+    course_fetcher.install_courses(courses, YEAR, TERM, CAMPUS)
+    snapshot = course_fetcher.courses_by_params[f"{YEAR}_{TERM}_{CAMPUS}"]
+    room_fetcher = RoomFetcher(course_fetcher)
+    salary_data = SalaryData()
+
+    params = {"year": YEAR, "term": TERM, "campus": CAMPUS}
+    suite = [
+        ("ingest.update_courses", lambda: course_fetcher.install_courses(json.loads(payload), **params)),
+        ("courses.get_courses[all]", lambda: course_fetcher.get_courses(**params)),
+        ("courses.get_courses[search]", lambda: course_fetcher.get_courses(search="calculus", **params)),
+        ("courses.get_courses[code]", lambda: course_fetcher.get_courses(search="cs 111", **params)),
+        ("courses.get_courses[filters]",
+         lambda: course_fetcher.get_courses(filters=FILTER_SETS["combined"], **params)),
+        ("courses.get_courses[search+filters]",
+         lambda: course_fetcher.get_courses(search="data", filters=FILTER_SETS["status"], **params)),
+    ]
+
+    for name, filters in FILTER_SETS.items():
+        suite.append((f"filters.apply_filters[{name}]",
+                      lambda filters=filters: course_fetcher.apply_filters(snapshot, filters)))
+
+    for kind, queries in SEARCH_QUERIES.items():
+        suite.append((f"search.fuzzy_search_courses[{kind}]",
+                      lambda queries=queries: [course_fetcher.fuzzy_search_courses(snapshot, query)
+                                               for query in queries]))
+
+    enriched = course_fetcher.get_courses(**params)
+    rooms = room_fetcher.get_all_rooms(**params)
+    sample_room = rooms[len(rooms) // 2] if rooms else {"building": "ARC", "room": "103"}
+    suite += [
+        ("rooms.build_index", lambda: RoomIndex(room_fetcher._extract_rooms_from_courses(enriched), enriched)),
+        ("rooms.search_rooms[building]", lambda: room_fetcher.search_rooms("ARC", **params)),
+        ("rooms.search_rooms[campus]", lambda: room_fetcher.search_rooms("busch", **params)),
+        ("rooms.find_available_rooms",
+         lambda: room_fetcher.find_available_rooms("Monday", "10:00 AM", "11:20 AM", **params)),
+        ("rooms.get_room_schedule",
+         lambda: room_fetcher.get_room_schedule(sample_room["building"], sample_room["room"], **params)),
+    ]
+
+    salary_names = [entry.get("Name", "") for entry in salary_data.salaries[::max(1, len(salary_data.salaries) // 150)]]
+    instructor_names = sorted({instructor.get("name", "")
+                               for course in courses for section in course["sections"]
+                               for instructor in section["instructors"]})[:100]
+    suite += [
+        ("salary.get_salary_by_instructor[known]",
+         lambda: [salary_data.get_salary_by_instructor(name) for name in salary_names]),
+        ("salary.get_salary_by_instructor[soc names]",
+         lambda: [salary_data.get_salary_by_instructor(name) for name in instructor_names]),
+    ]
+    return suite
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, if this is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print median changes against a baseline run; returns the names that regressed past `threshold`."""
+    regressions = []
+    print(f"\n{'benchmark':<45} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, current in results["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            print(f"{name:<45} {'-':>12} {current['median_ms']:>10.2f}ms {'new':>9}")
+            continue
+        change = (current["median_ms"] - previous["median_ms"]) / previous["median_ms"] * 100 \
+            if previous["median_ms"] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<45} {previous['median_ms']:>10.2f}ms {current['median_ms']:>10.2f}ms {change:>8.1f}%{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--courses", type=int, default=4500, help="number of synthetic courses")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--only", default="", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare medians against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="median slowdown in percent reported as a regression")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    courses = generate_courses(args.courses, seed=args.seed)
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {"courses": args.courses, "seed": args.seed, "repeat": args.repeat},
+        "results": {},
+    }
+    for name, fn in build_suite(courses):
+        if args.only and args.only not in name:
+            continue
+        results["results"][name] = measure(fn, args.repeat)
+        print(f"{name:<45} median {results['results'][name]['median_ms']:>10.2f}ms")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0f}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Synthetic Rutgers SOC course data for offline benchmarks.
+
+Produces payloads shaped like https://classes.rutgers.edu/soc/api/courses.json
+(courseString, sections, meetingTimes, instructors, ...), so every code path that
+normally needs the live API can run against realistic data at any scale.
+
+Usage:
+    python -m benchmarks.soc_generator --courses 4500 --output courses.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+BUILDINGS_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "buildings.csv")
+
+# (subject code, subject description) pairs, weighted toward large departments
+SUBJECTS = [
+    ("198", "Computer Science"), ("640", "Mathematics"), ("119", "Biology"), ("160", "Chemistry"),
+    ("750", "Physics"), ("960", "Statistics"), ("220", "Economics"), ("355", "English: Writing"),
+    ("830", "Psychology"), ("920", "Sociology"), ("790", "Political Science"), ("510", "History"),
+    ("730", "Philosophy"), ("014", "Africana Studies"), ("082", "Art History"), ("700", "Music"),
+    ("420", "French"), ("940", "Spanish"), ("447", "Genetics"), ("694", "Molecular Biology and Biochemistry"),
+    ("332", "Electrical and Computer Engineering"), ("440", "Engineering"), ("650", "Mechanical Engineering"),
+    ("180", "Civil and Environmental Engineering"), ("010", "Accounting"), ("390", "Finance"),
+    ("620", "Management"), ("630", "Marketing"), ("377", "Exercise Science"), ("709", "Food Science"),
+]
+SUBJECT_WEIGHTS = [10, 10, 8, 7, 5, 5, 6, 8, 7, 4, 4, 4, 3, 2, 2, 3, 2, 3, 2, 3, 5, 4, 3, 3, 3, 3, 3, 3, 2, 2]
+
+TITLE_WORDS = [
+    "INTRODUCTION", "PRINCIPLES", "ADVANCED", "TOPICS", "FOUNDATIONS", "SEMINAR", "METHODS", "THEORY",
+    "ANALYSIS", "DESIGN", "SYSTEMS", "APPLIED", "GENERAL", "MODERN", "STRUCTURES", "RESEARCH",
+]
+TITLE_SUBJECTS = [
+    "COMPUTER SCIENCE", "CALCULUS", "ALGORITHMS", "DATA", "ECONOMICS", "GENETICS", "MECHANICS",
+    "WRITING", "STATISTICS", "ORGANIC CHEMISTRY", "LINEAR ALGEBRA", "PROBABILITY", "ETHICS",
+    "MARKETING", "FINANCE", "CIRCUITS", "LITERATURE", "PSYCHOLOGY", "NUTRITION", "PHYSICS",
+]
+
+LAST_NAMES = [
+    "SMITH", "JOHNSON", "WILLIAMS", "BROWN", "JONES", "GARCIA", "MILLER", "DAVIS", "RODRIGUEZ", "MARTINEZ",
+    "HERNANDEZ", "LOPEZ", "GONZALEZ", "WILSON", "ANDERSON", "THOMAS", "TAYLOR", "MOORE", "JACKSON", "MARTIN",
+    "LEE", "PEREZ", "THOMPSON", "WHITE", "HARRIS", "SANCHEZ", "CLARK", "RAMIREZ", "LEWIS", "ROBINSON",
+    "PATEL", "CHEN", "WANG", "KIM", "NGUYEN", "SHAH", "COHEN", "MENENDEZ", "PIKIELL", "OCONNOR",
+]
+FIRST_NAMES = [
+    "JAMES", "MARY", "ROBERT", "PATRICIA", "JOHN", "JENNIFER", "MICHAEL", "LINDA", "DAVID", "ELIZABETH",
+    "WILLIAM", "BARBARA", "RICHARD", "SUSAN", "JOSEPH", "JESSICA", "THOMAS", "SARAH", "WEI", "PRIYA",
+]
+
+# Standard Rutgers class periods as (start, end) military times
+PERIODS = [
+    ("0830", "0950"), ("1020", "1140"), ("1200", "1320"), ("1350", "1510"),
+    ("1540", "1700"), ("1730", "1850"), ("1900", "2020"), ("2030", "2150"),
+]
+DAY_PATTERNS = [["M", "W"], ["T", "H"], ["M", "W", "F"], ["M"], ["T"], ["W"], ["H"], ["F"]]
+DAY_PATTERN_WEIGHTS = [30, 30, 8, 5, 5, 5, 5, 4]
+
+CAMPUS_CODES = {"College Ave": "1", "Busch": "2", "Livingston": "3", "Cook/Doug": "4"}
+
+CORE_CODES = [
+    ("QQ", "Quantitative and Formal Reasoning"), ("WCR", "Writing and Communication"),
+    ("NS", "Natural Sciences"), ("SCL", "Social Analysis"), ("AHo", "Arts and Humanities"),
+]
+
+
+def load_buildings() -> Dict[str, List[str]]:
+    """Get building codes grouped by campus from data/buildings.csv (falls back to a small set)."""
+    buildings = {}
+    try:
+        with open(BUILDINGS_CSV, newline="", encoding="utf-8") as csvfile:
+            for row in csv.DictReader(csvfile):
+                if row.get("campus") in CAMPUS_CODES:
+                    buildings.setdefault(row["campus"], []).append(row["code"])
+    except OSError:
+        pass
+    return buildings or {"College Ave": ["SC", "MU"], "Busch": ["ARC", "SEC"],
+                         "Livingston": ["TIL", "BE"], "Cook/Doug": ["HCK", "LOR"]}
+
+
+def _meeting(day: str, period, campus: str, building: str, room: str, mode: str) -> Dict:
+    return {
+        "meetingDay": day,
+        "startTimeMilitary": period[0],
+        "endTimeMilitary": period[1],
+        "startTime": period[0], "endTime": period[1],
+        "pmCode": "P" if int(period[0]) >= 1200 else "A",
+        "buildingCode": building,
+        "roomNumber": room,
+        "campusLocation": CAMPUS_CODES[campus],
+        "campusName": campus,
+        "meetingModeDesc": mode,
+        "meetingModeCode": "02" if mode == "LEC" else "03",
+    }
+
+
+def _online_meeting() -> Dict:
+    return {
+        "meetingDay": "", "startTimeMilitary": "", "endTimeMilitary": "", "startTime": "", "endTime": "",
+        "pmCode": "", "buildingCode": "", "roomNumber": "", "campusLocation": "O",
+        "campusName": "** INVALID **", "meetingModeDesc": "ONLINE INSTRUCTION(INTERNET)", "meetingModeCode": "90",
+    }
+
+
+def generate_courses(courses: int = 4500, sections_per_course: float = 3.0,
+                     instructors: int = 2500, seed: int = 2025,
+                     online_fraction: float = 0.08) -> List[Dict]:
+    """
+    Generate a synthetic SOC course list.
+
+    Args:
+        courses: Number of courses
+        sections_per_course: Average number of sections per course
+        instructors: Size of the instructor pool ("LAST, FIRST" names)
+        seed: Random seed, so the same arguments always give the same payload
+        online_fraction: Share of sections taught fully online (no meeting times)
+
+    Returns:
+        A list of course dictionaries with the SOC API field names
+    """
+    if courses > len(SUBJECTS) * 900:
+        raise ValueError(f"At most {len(SUBJECTS) * 900} distinct courses can be generated")
+
+    rng = random.Random(seed)
+    buildings = load_buildings()
+    campuses = list(buildings)
+    instructor_pool = [f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)}" for _ in range(instructors)]
+
+    output = []
+    used_codes = set()
+    next_index = 10000
+    for _ in range(courses):
+        subject, description = rng.choices(SUBJECTS, weights=SUBJECT_WEIGHTS)[0]
+        number = f"{rng.randint(100, 499):03d}"
+        while (subject, number) in used_codes:
+            number = f"{rng.randint(100, 999):03d}"
+        used_codes.add((subject, number))
+
+        campus = rng.choice(campuses)
+        title = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_SUBJECTS)}"
+        credits = rng.choice([1, 3, 3, 3, 4])
+        section_count = max(1, int(rng.expovariate(1 / sections_per_course)) + 1)
+
+        sections = []
+        for section_number in range(1, section_count + 1):
+            next_index += rng.randint(1, 7)
+            is_open = rng.random() < 0.6
+            if rng.random() < online_fraction:
+                meetings = [_online_meeting()]
+            else:
+                section_campus = campus if rng.random() < 0.8 else rng.choice(campuses)
+                building = rng.choice(buildings[section_campus])
+                room = str(rng.randint(100, 350))
+                period = rng.choice(PERIODS)
+                days = rng.choices(DAY_PATTERNS, weights=DAY_PATTERN_WEIGHTS)[0]
+                meetings = [_meeting(day, period, section_campus, building, room, "LEC") for day in days]
+                if rng.random() < 0.3:
+                    recitation_campus = rng.choice(campuses)
+                    meetings.append(_meeting(rng.choice(["M", "T", "W", "H", "F"]), rng.choice(PERIODS),
+                                             recitation_campus, rng.choice(buildings[recitation_campus]),
+                                             str(rng.randint(100, 350)), "RECIT"))
+
+            sections.append({
+                "number": f"{section_number:02d}",
+                "index": f"{next_index:05d}",
+                "openStatus": is_open,
+                "openStatusText": "OPEN" if is_open else "CLOSED",
+                "instructors": [{"name": rng.choice(instructor_pool)} for _ in range(rng.choice([1, 1, 1, 2]))],
+                "commentsText": rng.choice(["", "", "Hybrid section", "Honors students only"]),
+                "meetingTimes": meetings,
+            })
+
+        output.append({
+            "courseString": f"01:{subject}:{number}",
+            "subject": subject,
+            "courseNumber": number,
+            "title": title,
+            "expandedTitle": title.title(),
+            "subjectDescription": description,
+            "courseDescription": f"{title.title()} for students of {description.lower()}.",
+            "credits": credits,
+            "creditsObject": {"code": f"{credits}_0", "description": f"{credits}.0 credits"},
+            "school": {"code": "01", "description": "School of Arts and Sciences"},
+            "campusLocations": [{"code": CAMPUS_CODES[campus], "description": campus}],
+            "preReqNotes": "" if rng.random() < 0.6 else f"(01:{subject}:{int(number) - 1:03d} )",
+            "coreCodes": [
+                {"coreCode": code, "coreCodeDescription": core_description}
+                for code, core_description in rng.sample(CORE_CODES, rng.choice([0, 0, 1, 2]))
+            ],
+            "sections": sections,
+        })
+    return output
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic SOC courses.json payload")
+    parser.add_argument("--courses", type=int, default=4500)
+    parser.add_argument("--sections", type=float, default=3.0, help="average sections per course")
+    parser.add_argument("--instructors", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--output", default="-", help="file to write, or - for stdout")
+    args = parser.parse_args(argv)
+
+    payload = json.dumps(generate_courses(args.courses, args.sections, args.instructors, args.seed))
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Local stand-in for the Rutgers SOC courses.json API.
+
+Serves recorded or synthetic course payloads per (year, term, campus), with optional
+latency, injected 429/5xx errors (to exercise the CourseFetcher retry policy) and
+payload mutations between polls (to exercise refreshes).
+
+Usage (from the repository root):
+    python -m benchmarks.soc_standin --port 8765 --latency-ms 200 --error-rate 0.05 --mutate-every 1
+    SOC_API_URL=http://127.0.0.1:8765/soc/api/courses.json python main.py
+
+Recorded payloads are read from --recorded-dir as courses_<year>_<term>_<campus>.json;
+any other combination gets a synthetic payload seeded from its parameters.
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.soc_generator import generate_courses
+
+COURSES_PATH = "/soc/api/courses.json"
+STATS_PATH = "/__stats"
+
+
+class SocStandin:
+    """Payload store and fault injection settings shared by the request handlers."""
+
+    def __init__(self, courses: int = 4500, recorded_dir: Optional[str] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_codes: Optional[List[int]] = None, mutate_every: int = 0, seed: int = 2025):
+        self.courses = courses
+        self.recorded_dir = recorded_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_codes = error_codes or [429, 500, 502, 503, 504]
+        self.mutate_every = mutate_every
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.payloads = {}  # (year, term, campus) -> [course list, encoded bytes, polls served]
+        self.stats = {"requests": 0, "served": 0, "errors": 0, "mutations": 0}
+
+    def _load(self, key) -> List[Dict]:
+        """Load a recorded payload for the key, or generate one."""
+        if self.recorded_dir:
+            path = os.path.join(self.recorded_dir, "courses_{}_{}_{}.json".format(*key))
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as recorded:
+                    return json.load(recorded)
+        key_seed = self.seed + zlib.crc32("_".join(key).encode("utf-8"))
+        return generate_courses(self.courses, seed=key_seed)
+
+    def _mutate(self, courses: List[Dict]) -> None:
+        """Change a few sections the way registration does between polls: status flips and closures."""
+        for _ in range(max(1, len(courses) // 50)):
+            course = self.rng.choice(courses)
+            if not course["sections"]:
+                continue
+            section = self.rng.choice(course["sections"])
+            is_open = section.get("openStatusText") != "OPEN"
+            section["openStatus"] = is_open
+            section["openStatusText"] = "OPEN" if is_open else "CLOSED"
+        if len(courses) > 1 and self.rng.random() < 0.5:
+            course = self.rng.choice(courses)
+            if len(course["sections"]) > 1:
+                course["sections"].pop()
+        self.stats["mutations"] += 1
+
+    def payload(self, key) -> bytes:
+        """Get the encoded payload for a key, applying a mutation every `mutate_every` polls."""
+        with self.lock:
+            entry = self.payloads.get(key)
+            if entry is None:
+                courses = self._load(key)
+                entry = self.payloads[key] = [courses, json.dumps(courses).encode("utf-8"), 0]
+            elif self.mutate_every and entry[2] % self.mutate_every == 0:
+                self._mutate(entry[0])
+                entry[1] = json.dumps(entry[0]).encode("utf-8")
+            entry[2] += 1
+            return entry[1]
+
+    def injected_error(self) -> Optional[int]:
+        """Status code to fail this request with, or None to serve it."""
+        with self.lock:
+            if self.error_rate and self.rng.random() < self.error_rate:
+                return self.rng.choice(self.error_codes)
+        return None
+
+    def delay(self) -> None:
+        """Sleep for the configured latency plus jitter."""
+        latency = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+
+def make_handler(standin: SocStandin):
+    """Build a request handler class bound to a stand-in instance."""
+
+    class SocRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == STATS_PATH:
+                return self._send(200, json.dumps(standin.stats).encode("utf-8"))
+            if url.path != COURSES_PATH:
+                return self._send(404, b'{"error": "not found"}')
+
+            with standin.lock:
+                standin.stats["requests"] += 1
+            standin.delay()
+
+            status = standin.injected_error()
+            if status:
+                with standin.lock:
+                    standin.stats["errors"] += 1
+                return self._send(status, json.dumps({"error": f"injected {status}"}).encode("utf-8"))
+
+            query = parse_qs(url.query)
+            key = tuple(query.get(name, [default])[0]
+                        for name, default in (("year", "2025"), ("term", "1"), ("campus", "NB")))
+            body = standin.payload(key)
+            with standin.lock:
+                standin.stats["served"] += 1
+            self._send(200, body)
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep load tests quiet
+
+    return SocRequestHandler
+
+
+def serve(standin: SocStandin, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Start the stand-in in a background thread and return the server (call shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), make_handler(standin))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the SOC courses.json API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--courses", type=int, default=4500, help="courses per synthetic payload")
+    parser.add_argument("--recorded-dir", help="directory of recorded courses_<year>_<term>_<campus>.json files")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failed with 429/5xx")
+    parser.add_argument("--error-codes", default="429,500,502,503,504")
+    parser.add_argument("--mutate-every", type=int, default=0, help="mutate a payload every N polls (0 = never)")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    standin = SocStandin(
+        courses=args.courses, recorded_dir=args.recorded_dir, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_codes=[int(code) for code in args.error_codes.split(",") if code.strip()],
+        mutate_every=args.mutate_every, seed=args.seed
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(standin))
+    print(f"SOC stand-in listening on http://{args.host}:{args.port}{COURSES_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
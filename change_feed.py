@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snapshot versions whose deltas are kept per parameter combination; older clients must resync
+MAX_LOGGED_VERSIONS = 200
+
+# A refresh changing more than this many sections is logged as a resync point instead of a
+# delta (e.g. the first refresh after registration opens), since the full data is smaller then
+MAX_CHANGES_PER_VERSION = 5000
+
+# Meeting fields compared (and reported) for meeting time edits
+MEETING_FIELDS = ("meetingDay", "startTimeMilitary", "endTimeMilitary", "campusLocation", "buildingCode",
+                  "roomNumber", "meetingModeDesc")
+
+
+def change_sections(change: Dict) -> Tuple[str, ...]:
+    """The section indexes a change concerns (a course's sections for course_added/course_removed)."""
+    if change["type"] in ("course_added", "course_removed"):
+        return tuple(change["sections"])
+    return (change["index"],)
+
+
+def _section_state(section: Dict) -> Tuple[str, Tuple, Tuple]:
+    """Compact (status, meetings, instructors) fingerprint of a raw section."""
+    meetings = tuple(
+        tuple(meeting.get(field) or "" for field in MEETING_FIELDS)
+        for meeting in section.get("meetingTimes", []) or []
+    )
+    instructors = tuple(instructor.get("name", "") for instructor in section.get("instructors", []) or [])
+    return (section.get("openStatusText", "") or "").upper(), meetings, instructors
+
+
+def snapshot_state(courses: List[Dict]) -> Dict[str, Dict]:
+    """
+    Reduce raw course data to what the change feed compares.
+
+    Returns:
+        courseString -> {"title", "subject", "sections": {index: (status, meetings, instructors)}}
+    """
+    state = {}
+    for course in courses:
+        course_string = course.get("courseString", "")
+        if not course_string:
+            continue
+        # Entries sharing a courseString are one course (as in the search groups)
+        sections = state.setdefault(course_string, {
+            "title": course.get("title", ""),
+            "subject": course.get("subject", ""),
+            "sections": {},
+        })["sections"]
+        for section in course.get("sections", []) or []:
+            index = str(section.get("index", "") or "").strip()
+            if index:
+                sections[index] = _section_state(section)
+    return state
+
+
+def diff_states(old: Dict[str, Dict], new: Dict[str, Dict]) -> List[Dict]:
+    """
+    List the changes between two snapshot states.
+
+    Change types: course_added, course_removed, section_added, section_removed,
+    section_status (openStatusText flips), section_meetings and section_instructors.
+    """
+    changes = []
+    for course_string in sorted(old.keys() - new.keys()):
+        changes.append({"type": "course_removed", "courseString": course_string,
+                        "subject": old[course_string]["subject"], "sections": sorted(old[course_string]["sections"])})
+
+    for course_string, course in new.items():
+        previous = old.get(course_string)
+        if previous is None:
+            changes.append({"type": "course_added", "courseString": course_string, "subject": course["subject"],
+                            "title": course["title"], "sections": sorted(course["sections"])})
+            continue
+
+        base = {"courseString": course_string, "subject": course["subject"]}
+        for index in sorted(previous["sections"].keys() - course["sections"].keys()):
+            changes.append(dict(base, type="section_removed", index=index))
+        for index, (status, meetings, instructors) in course["sections"].items():
+            before = previous["sections"].get(index)
+            if before is None:
+                changes.append(dict(base, type="section_added", index=index, status=status))
+                continue
+            if before == (status, meetings, instructors):
+                continue
+            if status != before[0]:
+                changes.append(dict(base, type="section_status", index=index, status=status, previous=before[0]))
+            if meetings != before[1]:
+                changes.append(dict(base, type="section_meetings", index=index,
+                                    meetings=[dict(zip(MEETING_FIELDS, meeting)) for meeting in meetings]))
+            if instructors != before[2]:
+                changes.append(dict(base, type="section_instructors", index=index, instructors=list(instructors)))
+    return changes
+
+
+class ChangeFeed:
+    """
+    Per-snapshot deltas of the course data, for clients polling for changes.
+
+    Registered as a CourseFetcher update listener: every installed snapshot is diffed
+    against the previous one of its parameter combination and the delta is logged under
+    the new snapshot version. Only the compact state of the latest snapshot is kept.
+
+    Snapshot versions restart at 1 in every process, so clients get them as cursors
+    ("<epoch>-<version>") carrying a per-process epoch; a cursor from another process (e.g.
+    from before a restart) always gets a resync.
+    """
+
+    def __init__(self, course_fetcher, max_versions: int = MAX_LOGGED_VERSIONS,
+                 max_changes: int = MAX_CHANGES_PER_VERSION):
+        self.course_fetcher = course_fetcher
+        self.max_versions = max_versions
+        self.max_changes = max_changes
+        self.epoch = uuid.uuid4().hex[:8]
+        self._states = {}  # param_key -> state of the latest snapshot (see snapshot_state)
+        self._logs = {}    # param_key -> deque of {"version", "cursor", "time", "changes" (None = resync point)}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener) -> None:
+        """
+        Register a callback run after every logged snapshot delta.
+
+        Args:
+            listener: Callable taking (param_key, entry), entry being the logged
+                {"version", "cursor", "time", "changes"} dictionary (changes is None for a resync point)
+        """
+        self._listeners.append(listener)
+
+    def cursor(self, version: int) -> str:
+        """The client-facing cursor of a snapshot version in this process."""
+        return f"{self.epoch}-{version}"
+
+    def parse_cursor(self, cursor: str) -> Optional[int]:
+        """
+        Get the snapshot version of a cursor.
+
+        Returns:
+            The version, or None if the cursor comes from another process (or is a bare
+            version number, as handed out before versions carried an epoch)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        epoch, _, version = str(cursor).strip().rpartition("-")
+        if not version.isdigit():
+            raise ValueError(f"Invalid change feed cursor: {cursor!r}")
+        return int(version) if epoch == self.epoch else None
+
+    def on_courses_updated(self, param_key: str, courses: List[Dict]) -> None:
+        """Course update listener: log the delta from the previous snapshot."""
+        version = self.course_fetcher.snapshot_versions.get(param_key, 0)
+        start = time.perf_counter()
+        state = snapshot_state(courses)
+        previous = self._states.get(param_key)
+
+        if previous is None:
+            changes = None  # nothing to compare the first snapshot with
+        else:
+            changes = diff_states(previous, state)
+            if len(changes) > self.max_changes:
+                logger.info("%d changes in %s version %d, logging a resync point", len(changes), param_key, version)
+                changes = None
+
+        entry = {"version": version, "cursor": self.cursor(version), "time": datetime.now().isoformat(),
+                 "changes": changes}
+        with self._lock:
+            self._states[param_key] = state
+            log = self._logs.get(param_key)
+            if log is None:
+                log = self._logs[param_key] = deque(maxlen=self.max_versions)
+            log.append(entry)
+        logger.info("Change feed %s version %d: %s changes in %.3fs", param_key, version,
+                    "no" if changes is None else len(changes), time.perf_counter() - start)
+
+        for listener in self._listeners:
+            try:
+                listener(param_key, entry)
+            except Exception as e:
+                logger.error(f"Error in change feed listener: {str(e)}")
+
+    def get_changes(self, since: str, year="2025", term="1", campus="NB",
+                    subjects: Optional[set] = None, indexes: Optional[set] = None) -> Dict:
+        """
+        Get the changes installed after a snapshot version.
+
+        Args:
+            since: Cursor of the last snapshot version the client has
+            subjects: Optional subject codes to restrict the changes to
+            indexes: Optional section indexes to restrict the changes to
+
+        Returns:
+            {"version": current cursor, "since": since, "resync": bool, "changes": [...]} where
+            each change carries the cursor ("version") it appeared in. resync is True (and
+            changes is empty) when the deltas since that version are no longer in the log or
+            the cursor comes from another process; the client should then refetch /api/courses
+            and continue from the returned cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        param_key = f"{year}_{term}_{campus}"
+        since_version = self.parse_cursor(since)
+        with self._lock:
+            entries = list(self._logs.get(param_key, ()))
+        current = entries[-1]["version"] if entries else self.course_fetcher.snapshot_versions.get(param_key, 0)
+        result = {"version": self.cursor(current), "since": since, "resync": False, "changes": []}
+        if since_version is None:
+            result["resync"] = True
+            return result
+        if since_version == current:
+            return result
+
+        # Versions are consecutive, so the log covers the client only if it still holds the delta
+        # to since + 1 and has no resync point after it
+        newer = [entry for entry in entries if entry["version"] > since_version]
+        if (not newer or newer[0]["version"] != since_version + 1
+                or any(entry["changes"] is None for entry in newer)):
+            result["resync"] = True
+            return result
+
+        for entry in newer:
+            for change in entry["changes"]:
+                if subjects and change["subject"] not in subjects:
+                    continue
+                if indexes and not indexes.intersection(change_sections(change)):
+                    continue
+                result["changes"].append(dict(change, version=entry["cursor"]))
+        return result
@@ -1,48 +1,72 @@
+import os
+import time
 import requests
 import logging
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import json
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
 from urllib3.util.retry import Retry
 from rapidfuzz import fuzz
-from utils.constants import CAMPUS_ID_TO_NAME
+from utils.constants import CAMPUS_ID_TO_NAME, WEEKDAY_CODE_TO_NAME
 from utils.name_utils import normalize_instructor_name_variants
 from utils.fuzzy_utils import get_best_fuzzy_score
+from utils.metrics import stage
+from utils.memory_utils import estimate_list_memory
+from utils.logging_config import log_sampled
+from course_index import CourseIndex
 
 logger = logging.getLogger(__name__)
 
 
 class CourseFetcher:
     # Mapping weekday codes to full names
-    WEEKDAY_MAP = {
-        "M": "Monday",
-        "T": "Tuesday",
-        "W": "Wednesday",
-        "H": "Thursday",
-        "F": "Friday",
-        "S": "Saturday",
-        "Su": "Sunday"
+    WEEKDAY_MAP = WEEKDAY_CODE_TO_NAME
+
+    # Common department abbreviations accepted in course code searches (e.g., "cs 111")
+    DEPT_ABBREVIATIONS = {
+        "cs": "198",  # Computer Science
+        "math": "640",  # Mathematics
+        "bio": "119",  # Biology
+        "chem": "160",  # Chemistry
+        "phys": "750",  # Physics
+        "stat": "960",  # Statistics
+        "econ": "220"   # Economics
     }
 
+    # Minimum fuzzy score for instructor name matches in course searches
+    INSTRUCTOR_FUZZY_THRESHOLD = 75
 
-    def __init__(self):
+
+    def __init__(self, autoload: bool = True):
+        """
+        Args:
+            autoload: Fetch the default parameter combination right away (disable for offline use)
+        """
         self.courses_by_params = {
         }  # Store courses for different parameter combinations
+        self.snapshot_versions = {}  # Bumped every time a parameter combination is refreshed
+        self.course_indexes = {}  # Lookup structures (CourseIndex) for each installed snapshot
+        self._update_listeners = []  # Called with (param_key, courses) after each refresh
+        self.refresh_stats = {}  # Refresh telemetry per parameter combination (see get_refresh_stats)
         self.last_update = None
-        self.base_url = "https://classes.rutgers.edu/soc/api/courses.json"
+        # Overridable so a local stand-in (benchmarks/soc_standin.py) can replace the live API
+        self.base_url = os.environ.get("SOC_API_URL", "https://classes.rutgers.edu/soc/api/courses.json")
 
         # Configure requests session with retries
         self.session = requests.Session()
-        retry_strategy = Retry(
+        self.retry_strategy = Retry(
             total=3,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=self.retry_strategy)
         self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-        self.update_courses()  # Initial fetch with default params
+        if autoload:
+            self.update_courses()  # Initial fetch with default params
 
     def _check_and_raise_if_no_cache(self, param_key: str) -> None:
         """
@@ -54,6 +78,83 @@ class CourseFetcher:
         if param_key not in self.courses_by_params:
             raise
 
+    def add_update_listener(self, listener) -> None:
+        """
+        Register a callback run after fresh course data is installed.
+
+        Args:
+            listener: Callable taking (param_key, courses) for the refreshed snapshot
+        """
+        self._update_listeners.append(listener)
+
+    def _notify_update_listeners(self, param_key: str) -> None:
+        """Run the update listeners for a refreshed parameter combination."""
+        courses = self.courses_by_params.get(param_key, [])
+        for listener in self._update_listeners:
+            try:
+                listener(param_key, courses)
+            except Exception as e:
+                logger.error(f"Error in course update listener: {str(e)}")
+
+    def get_snapshot_version(self, year="2025", term="1", campus="NB") -> int:
+        """
+        Get the version of the cached course snapshot for a parameter combination.
+
+        Derived data (room indexes, analytics, ...) can key on this to know when to rebuild.
+        Returns 0 if no snapshot has been installed yet.
+        """
+        return self.snapshot_versions.get(f"{year}_{term}_{campus}", 0)
+
+    def _refresh_stats_for(self, param_key: str) -> Dict:
+        """Get (creating it if needed) the refresh telemetry entry for a parameter combination."""
+        stats = self.refresh_stats.get(param_key)
+        if stats is None:
+            stats = self.refresh_stats[param_key] = {
+                "refreshes": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "retries_total": 0,
+                "last_attempt": None,
+                "last_success": None,
+                "last_error": None,
+            }
+        return stats
+
+    def _record_refresh_failure(self, param_key: str, error: str) -> None:
+        """Count a failed refresh for a parameter combination."""
+        stats = self._refresh_stats_for(param_key)
+        stats["failures"] += 1
+        stats["consecutive_failures"] += 1
+        stats["last_error"] = error
+
+    def get_refresh_stats(self) -> Dict[str, Dict]:
+        """
+        Get the refresh telemetry of every parameter combination.
+
+        Per key: refresh/failure/retry counts, consecutive failures, the last attempt, success and
+        error, and for the latest successful refresh the fetch, parse, sort and index times,
+        payload bytes, course/section/meeting counts, estimated memory of the raw course list and its age.
+        """
+        now = time.time()
+        telemetry = {}
+        for param_key, stats in list(self.refresh_stats.items()):
+            entry = dict(stats)
+            entry.pop("last_success_time", None)
+            entry["age_seconds"] = round(now - stats["last_success_time"], 1) if stats.get("last_success_time") else None
+            entry["snapshot_version"] = self.snapshot_versions.get(param_key, 0)
+            telemetry[param_key] = entry
+        return telemetry
+
+    def get_course_index(self, year="2025", term="1", campus="NB") -> Optional[CourseIndex]:
+        """
+        Get the lookup index for a parameter combination, fetching the courses first if needed.
+        Returns None if no course data is available.
+        """
+        param_key = f"{year}_{term}_{campus}"
+        if param_key not in self.course_indexes:
+            self.update_courses(year, term, campus)
+        return self.course_indexes.get(param_key)
+
     def convert_to_am_pm(self, military_time: str) -> str:
         """Convert military time to AM/PM format"""
         if not military_time or military_time == "N/A":
@@ -62,7 +163,7 @@ class CourseFetcher:
             return datetime.strptime(military_time,
                                      "%H%M").strftime("%I:%M %p").lstrip("0")
         except ValueError:
-            logger.warning(f"Invalid military time format: {military_time}")
+            logger.warning("Invalid military time format: %s", military_time)
             return "N/A"
 
     def format_weekday(self, day: str) -> str:
@@ -150,95 +251,182 @@ class CourseFetcher:
         """Fetch fresh course data from Rutgers API"""
         # Define param_key before the try block to make it available in exception handlers
         param_key = f"{year}_{term}_{campus}"
+        stats = self._refresh_stats_for(param_key)
+        stats["last_attempt"] = datetime.now().isoformat()
         
         try:
             params = {"year": year, "term": term, "campus": campus}
-            logger.info(f"Fetching courses with parameters: {params}")
+            logger.info("Fetching courses with parameters: %s", params)
 
+            fetch_start = time.perf_counter()
             response = self.session.get(self.base_url,
                                         params=params,
                                         timeout=30)
             response.raise_for_status()
+            fetch_seconds = time.perf_counter() - fetch_start
+            # Retries the urllib3 policy made before this response (429/5xx, connection errors)
+            retries = len(getattr(getattr(response.raw, "retries", None), "history", None) or ())
+            stats["retries_total"] += retries
 
+            parse_start = time.perf_counter()
             courses = response.json()
+            parse_seconds = time.perf_counter() - parse_start
             response_size = len(response.content) / 1024  # Size in KB
-            logger.info(
-                f"Retrieved {len(courses)} courses from API (Response size: {response_size:.2f} KB)"
-            )
+            logger.info("Retrieved %d courses from API (Response size: %.2f KB)", len(courses), response_size)
 
             if not courses:
                 logger.warning("Received empty course list from API")
+                self._record_refresh_failure(param_key, "Empty course list")
                 return
 
-            # Log a sample course to verify structure
-            if courses:
-                logger.debug(
-                    f"Sample course structure: {json.dumps(courses[0], indent=2)}"
-                )
+            # Log a sample course to verify structure (serialized only when debug logging is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sample course structure: %s", json.dumps(courses[0], indent=2))
 
-            self.courses_by_params[param_key] = sorted(
-                courses, key=lambda c: c.get("courseString", ""))
-            self.last_update = datetime.now().isoformat()
-            logger.info(f"Successfully updated courses at {self.last_update}")
+            self.install_courses(courses, year, term, campus)
+            stats.update(
+                fetch_seconds=round(fetch_seconds, 4),
+                parse_seconds=round(parse_seconds, 4),
+                response_bytes=len(response.content),
+                retries=retries
+            )
 
         except requests.exceptions.Timeout:
             logger.error("Timeout while fetching courses from API")
+            self._record_refresh_failure(param_key, "Timeout")
             self._check_and_raise_if_no_cache(param_key)
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch courses from API: {str(e)}")
+            if e.args and isinstance(e.args[0], MaxRetryError):
+                stats["retries_total"] += self.retry_strategy.total
+            self._record_refresh_failure(param_key, f"Request failed: {str(e)}")
             self._check_and_raise_if_no_cache(param_key)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse API response: {str(e)}")
+            self._record_refresh_failure(param_key, f"Invalid JSON: {str(e)}")
             self._check_and_raise_if_no_cache(param_key)
         except Exception as e:
             logger.error(f"Unexpected error updating courses: {str(e)}")
+            self._record_refresh_failure(param_key, f"Unexpected error: {str(e)}")
             self._check_and_raise_if_no_cache(param_key)
 
-    def fuzzy_search_courses(self,
-                             courses: List[Dict],
-                             query: str,
-                             threshold: int = 70) -> List[Dict]:
-        """Filter and rank courses using fuzzy matching on key fields."""
-        results = []
-        query = query.lower().strip()
-        
-        # Check if query matches common patterns for course codes
-        is_specific_course_query = False
-        subject_part = None
-        number_part = None
-        
-        # Pattern matching for queries like "cs 111", "198:111", "computer science 111"
-        # Common department abbreviations
-        dept_abbrevs = {
-            "cs": "198",  # Computer Science
-            "math": "640",  # Mathematics
-            "bio": "119",  # Biology
-            "chem": "160",  # Chemistry
-            "phys": "750",  # Physics
-            "stat": "960",  # Statistics
-            "econ": "220"   # Economics
-        }
-        
+    def _parse_course_query(self, query: str):
+        """
+        Recognize course code queries like "cs 111", "198:111" or "111".
+
+        Args:
+            query: The lowercased, stripped search query
+
+        Returns:
+            A (is specific course query, subject part, number part) tuple
+        """
         # Try to parse common query formats
         query_parts = query.split()
         if len(query_parts) == 2:
             # Format like "cs 111" or "math 152"
             potential_dept, potential_number = query_parts
             if potential_number.isdigit():
-                is_specific_course_query = True
-                subject_part = dept_abbrevs.get(potential_dept, potential_dept)
-                number_part = potential_number
+                return True, self.DEPT_ABBREVIATIONS.get(potential_dept, potential_dept), potential_number
         elif ":" in query:
             # Format like "198:111"
             parts = query.split(":")
             if len(parts) == 2 and parts[1].isdigit():
-                is_specific_course_query = True
-                subject_part = parts[0]
-                number_part = parts[1]
+                return True, parts[0], parts[1]
         elif query.isdigit():
             # Just a course number like "111"
-            is_specific_course_query = True
-            number_part = query
+            return True, None, query
+        return False, None, None
+
+    def _search_specific_course_query(self, course_index: CourseIndex, query: str,
+                                      number_part: str, filters: Optional[Dict]) -> List[Dict]:
+        """
+        Search for a course code query ("cs 111", "198:111", "111") using the snapshot's hash indexes.
+
+        Every course that can score as an exact or high-relevance match is found by dictionary
+        lookup; fuzzy_search_courses then scores just those courses (and the rest of their
+        courseString groups), which gives the same results as scoring the whole term.
+
+        A full scan only falls back to instructor fuzzy matches when no course is an exact or
+        high-relevance match, and then takes them from the whole term; so in that case the
+        courses with a fuzzily matching instructor (computed once per distinct instructor name)
+        are added to the candidates and everything is scored again.
+        """
+        positions = course_index.lookup_specific(query, number_part)
+        results, matched = [], False
+        if positions:
+            results, matched = self._rank_courses(
+                self._narrow_courses(course_index, positions, filters), query)
+        if not matched:
+            fuzzy_positions = course_index.lookup_instructor_fuzzy(
+                query, self.INSTRUCTOR_FUZZY_THRESHOLD)
+            if fuzzy_positions - positions:
+                results = self.fuzzy_search_courses(
+                    self._narrow_courses(course_index, positions | fuzzy_positions, filters), query)
+        return results
+
+    def _narrow_courses(self, course_index: CourseIndex, positions, filters: Optional[Dict]) -> List[Dict]:
+        """Get the courses at the given positions plus the rest of their courseString groups, filtered."""
+        courses = [course_index.courses[position]
+                   for position in course_index.expand_groups(positions)]
+        return self.apply_filters(courses, filters) if filters else courses
+
+    def install_courses(self, courses: List[Dict], year="2025", term="1", campus="NB") -> None:
+        """
+        Install raw SOC course data as the snapshot for a parameter combination:
+        sort it, build its CourseIndex, bump its version and notify the update listeners.
+
+        Args:
+            courses: Course list in the format returned by the SOC courses.json API
+        """
+        param_key = f"{year}_{term}_{campus}"
+        sort_start = time.perf_counter()
+        sorted_courses = sorted(courses, key=lambda c: c.get("courseString", ""))
+        index_start = time.perf_counter()
+        course_index = CourseIndex(sorted_courses)
+        index_end = time.perf_counter()
+        self.courses_by_params[param_key] = sorted_courses
+        self.course_indexes[param_key] = course_index
+        self.snapshot_versions[param_key] = self.snapshot_versions.get(param_key, 0) + 1
+        self.last_update = datetime.now().isoformat()
+
+        sections = [section for course in sorted_courses for section in course.get("sections", []) or []]
+        stats = self._refresh_stats_for(param_key)
+        stats.update(
+            refreshes=stats["refreshes"] + 1,
+            consecutive_failures=0,
+            last_success=self.last_update,
+            last_success_time=time.time(),
+            sort_seconds=round(index_start - sort_start, 4),
+            index_seconds=round(index_end - index_start, 4),
+            courses=len(sorted_courses),
+            sections=len(sections),
+            meetings=sum(len(section.get("meetingTimes", []) or []) for section in sections),
+            # The raw course list only: the CourseIndex and listener-built data (room index,
+            # utilization, change feed state) are not included
+            raw_snapshot_memory_bytes_estimate=estimate_list_memory(sorted_courses)
+        )
+        logger.info("Successfully updated courses at %s", self.last_update)
+        self._notify_update_listeners(param_key)
+
+    def fuzzy_search_courses(self,
+                             courses: List[Dict],
+                             query: str,
+                             threshold: int = 70) -> List[Dict]:
+        """Filter and rank courses using fuzzy matching on key fields."""
+        return self._rank_courses(courses, query, threshold)[0]
+
+    def _rank_courses(self, courses: List[Dict], query: str, threshold: int = 70) -> Tuple[List[Dict], bool]:
+        """
+        Rank courses for a query (see fuzzy_search_courses).
+
+        Returns:
+            (matched courses, whether any course was an exact or high-relevance match)
+        """
+        results = []
+        query = query.lower().strip()
+        
+        # Check if query matches common patterns for course codes
+        is_specific_course_query, subject_part, number_part = self._parse_course_query(query)
         
         # Group courses by their course_string for consistent matching
         course_groups = {}
@@ -298,7 +486,7 @@ class CourseFetcher:
                 
                 # If any instructor name has a high fuzzy match, include this course
                 max_instructor_score = max(instructor_fuzzy_scores) if instructor_fuzzy_scores else 0
-                if max_instructor_score >= 75:  # Lower threshold for instructor fuzzy matching
+                if max_instructor_score >= self.INSTRUCTOR_FUZZY_THRESHOLD:  # Lower threshold for instructor fuzzy matching
                     # Add to results with score based on fuzzy match quality
                     results.append((max_instructor_score, course_string))
 
@@ -317,7 +505,7 @@ class CourseFetcher:
                     continue
                     
                 # For dept abbreviation matches like "cs" -> "Computer Science"
-                elif (subject_part in dept_abbrevs.keys() and 
+                elif (subject_part in self.DEPT_ABBREVIATIONS and 
                       number_part and 
                       subject == "198" and  # CS department code
                       course_number == number_part):
@@ -391,8 +579,9 @@ class CourseFetcher:
         for _, course_string in sorted_results:
             matched_courses.extend(course_groups.get(course_string, []))
             
-        logger.info(f"Search for '{query}' found {len(matched_courses)} courses from {len(unique_results)} unique course strings")
-        return matched_courses
+        log_sampled(logger, logging.INFO, "Search for '%s' found %d courses from %d unique course strings",
+                    query, len(matched_courses), len(unique_results))
+        return matched_courses, bool(exact_matches or high_relevance_matches)
 
     def _is_time_in_range(self, military_time: str, time_range: str) -> bool:
         """Check if military time falls within a time range."""
@@ -636,11 +825,93 @@ class CourseFetcher:
             filtered_courses.append(course_copy)
         
         if subject_filter_applied and 'subject' in filters:
-            logger.info(f"Subject filter '{filters['subject']}' applied: {len(courses)} courses -> {len(filtered_courses)} courses")
+            log_sampled(logger, logging.INFO, "Subject filter '%s' applied: %d courses -> %d courses",
+                        filters['subject'], len(courses), len(filtered_courses))
         else:
-            logger.info(f"Applied filters to {len(courses)} courses, {len(filtered_courses)} courses remain")
+            log_sampled(logger, logging.INFO, "Applied filters to %d courses, %d courses remain",
+                        len(courses), len(filtered_courses))
         return filtered_courses
 
+    def _enrich_course(self, course: Dict) -> Dict:
+        """Convert a raw SOC course into the enriched format returned by the API."""
+        return {
+            "courseString": course.get("courseString", ""),
+            "title": course.get("title", ""),
+            "subject": course.get("subject", ""),
+            "subjectDescription": course.get("subjectDescription", ""),
+            "course_number": course.get("courseNumber", ""),
+            "description": course.get("courseDescription", ""),
+            "credits": course.get("credits", ""),
+            "creditsDescription": course.get("creditsObject", {}).get("description", ""),
+            "school": course.get("school", {}).get("description", ""),
+            "campusLocations": [
+                loc.get("description", "") for loc in course.get("campusLocations", [])
+            ],
+            "prerequisites": course.get("preReqNotes", ""),
+            "coreRequirements": [
+                {
+                    "code": core.get("coreCode", ""),
+                    "description": core.get("coreCodeDescription", "")
+                }
+                for core in course.get("coreCodes", [])
+            ],
+            "sections": [
+                self.format_section(section) for section in course.get("sections", [])
+            ]
+        }
+
+    def _enrich_courses(self, courses: List[Dict], search: Optional[str] = None) -> List[Dict]:
+        """Enrich a list of raw SOC courses, skipping any that fail to convert."""
+        enriched_courses = []
+        for course in courses:
+            try:
+                enriched_courses.append(self._enrich_course(course))
+            except Exception as e:
+                logger.error(f"Error enriching course data: {str(e)}")
+                continue
+
+        log_sampled(logger, logging.INFO, "Returning %d enriched courses for search: '%s'", len(enriched_courses), search)
+        return enriched_courses
+
+    def get_section(self, index: str, year="2025", term="1", campus="NB") -> Optional[Dict]:
+        """
+        Look up a section by its index number.
+
+        Returns the enriched course with only that section in "sections", or None if
+        no section with that index is offered.
+        """
+        course_index = self.get_course_index(year, term, campus)
+        match = course_index.find_section(index) if course_index else None
+        if match is None:
+            return None
+        course, section = match
+        return self._enrich_course(dict(course, sections=[section]))
+
+    def get_courses_batch(self, course_strings: List[str], indexes: List[str],
+                          year="2025", term="1", campus="NB") -> Dict[str, Dict]:
+        """
+        Look up several courses by courseString and sections by index number in one pass.
+
+        Returns {"courses": {courseString: enriched course or None},
+                 "sections": {index: enriched course with only that section, or None}}.
+        """
+        course_index = self.get_course_index(year, term, campus)
+        courses = {}
+        for course_string in course_strings:
+            matches = course_index.find_courses(course_string) if course_index else []
+            courses[course_string] = self._enrich_course(matches[0]) if matches else None
+
+        sections = {}
+        for index in indexes:
+            match = course_index.find_section(index) if course_index else None
+            if match is None:
+                sections[index] = None
+            else:
+                course, section = match
+                sections[index] = self._enrich_course(dict(course, sections=[section]))
+
+        return {"courses": courses, "sections": sections}
+
     def get_courses(self,
                     search: Optional[str] = None,
                     year="2025",
@@ -653,71 +924,44 @@ class CourseFetcher:
 
             # Update courses for these parameters if not already cached
             if param_key not in self.courses_by_params:
-                self.update_courses(year, term, campus)
+                with stage("course_fetch"):
+                    self.update_courses(year, term, campus)
 
             if not self.courses_by_params.get(param_key):
-                logger.warning(
-                    f"No courses available for parameters: year={year}, term={term}, campus={campus}"
-                )
+                logger.warning("No courses available for parameters: year=%s, term=%s, campus=%s", year, term, campus)
                 return []
 
+            # Course code queries ("cs 111", "198:111", "111") resolve through the snapshot's hash indexes
+            course_index = self.course_indexes.get(param_key)
+            if search and course_index:
+                query = search.lower().strip()
+                is_specific_course_query, _, number_part = self._parse_course_query(query)
+                if is_specific_course_query:
+                    with stage("course_search"):
+                        matched_courses = self._search_specific_course_query(course_index, query, number_part, filters)
+                    with stage("course_enrich"):
+                        return self._enrich_courses(matched_courses, search)
+
             # Get a copy of the cached courses to avoid modifying the original
             filtered_courses = self.courses_by_params[param_key].copy()
 
             # Apply filters FIRST to narrow down the dataset before searching
             # This ensures that if a subject filter is set, we only search within that subject
             if filters:
-                logger.info(f"Applying filters: {filters}")
-                filtered_courses = self.apply_filters(filtered_courses, filters)
-                logger.info(f"After filters: {len(filtered_courses)} courses remain")
+                log_sampled(logger, logging.INFO, "Applying filters: %s", filters)
+                with stage("course_filter"):
+                    filtered_courses = self.apply_filters(filtered_courses, filters)
+                log_sampled(logger, logging.INFO, "After filters: %d courses remain", len(filtered_courses))
 
             # Then apply search on the filtered results
             if search:
                 # Use fuzzy search to filter courses
-                filtered_courses = self.fuzzy_search_courses(
-                    filtered_courses, search)
-
-            # Enrich course data with detailed information
-            enriched_courses = []
-            for course in filtered_courses:
-                try:
-                    enriched_course = {
-                        "courseString": course.get("courseString", ""),
-                        "title": course.get("title", ""),
-                        "subject": course.get("subject", ""),
-                        "subjectDescription": course.get("subjectDescription", ""),
-                        "course_number": course.get("courseNumber", ""),
-                        "description": course.get("courseDescription", ""),
-                        "credits": course.get("credits", ""),
-                        "creditsDescription": course.get("creditsObject", {}).get("description", ""),
-                        "school": course.get("school", {}).get("description", ""),
-                        "campusLocations": [
-                            loc.get("description", "") for loc in course.get("campusLocations", [])
-                        ],
-                        "prerequisites": course.get("preReqNotes", ""),
-                        "coreRequirements": [
-                            {
-                                "code": core.get("coreCode", ""),
-                                "description": core.get("coreCodeDescription", "")
-                            }
-                            for core in course.get("coreCodes", [])
-                        ],
-                        "sections": [
-                            self.format_section(section) for section in course.get("sections", [])
-                        ]
-                    }
-                    
-                    enriched_courses.append(enriched_course)
-
-                except Exception as e:
-                    logger.error(f"Error enriching course data: {str(e)}")
-                    continue
+                with stage("course_search"):
+                    filtered_courses = self.fuzzy_search_courses(
+                        filtered_courses, search)
 
-
-            logger.info(
-                f"Returning {len(enriched_courses)} enriched courses for search: '{search}'"
-            )
-            return enriched_courses
+            with stage("course_enrich"):
+                return self._enrich_courses(filtered_courses, search)
         except Exception as e:
             logger.error(f"Error getting courses: {str(e)}")
             return []
@@ -0,0 +1,223 @@
+import bisect
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.constants import CAMPUS_ID_TO_NAME, DAYS_OF_WEEK
+from utils.fuzzy_utils import get_best_fuzzy_score
+from utils.name_utils import normalize_instructor_name_variants
+from utils.time_utils import parse_time_to_minutes, normalize_day
+
+# Upper bound on sorted keys scanned per suggestion request, so short prefixes stay cheap
+SUGGEST_SCAN_LIMIT = 200
+
+# Order suggestion kinds are listed in when their keys match equally well
+SUGGESTION_KIND_ORDER = {"course": 0, "subject": 1, "title": 2, "instructor": 3}
+
+# Resolution of the weekly section time bitmasks, in minutes
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def time_mask(day_position: int, start: int, end: int) -> int:
+    """
+    Bitmask of the weekly time slots covered by [start, end) minutes on a day (0 = Monday).
+    Partial slots are included, so overlapping meetings always share a bit.
+    """
+    first = day_position * SLOTS_PER_DAY + start // SLOT_MINUTES
+    last = day_position * SLOTS_PER_DAY + -(-end // SLOT_MINUTES)
+    return ((1 << (last - first)) - 1) << first
+
+
+class CourseIndex:
+    """
+    Lookup structures for one course snapshot, built once when the snapshot is installed.
+
+    Suggestions are served from a sorted list of lowercase keys (course strings,
+    subject:number codes, every word suffix of titles and subject descriptions and
+    the normalized instructor name variants), so a keystroke is a binary search
+    plus a short scan instead of a fuzzy pass over every course.
+
+    Hash indexes map the lowercase fields course code searches compare against
+    (courseString, subject:number, number, subject, title, instructor name variants)
+    and section index numbers to positions in the course list.
+    """
+
+    def __init__(self, courses: List[Dict]):
+        """Build the index from the raw SOC course data."""
+        self.courses = courses
+        self.by_course_string = {}  # courseString -> course positions (the search groups)
+        self.by_code = {}           # "subject:number" -> course positions
+        self.by_number = {}         # course number -> course positions
+        self.by_subject = {}        # subject code -> course positions
+        self.by_title = {}          # title -> course positions
+        self.by_instructor = {}     # normalized instructor name variant -> course positions
+        self.sections_by_index = {}  # section index -> (course position, section position)
+        self.section_meetings = {}  # section index -> [(day position, start, end, campus name)]
+        self.section_masks = {}     # section index -> weekly time bitmask of its meetings
+        self._build_hash_indexes()
+
+        self.suggestions = []  # {"text", "type", "value"} entries referenced by the keys below
+        entry_ids = {}         # (type, value) -> position in self.suggestions
+        keyed = set()          # (key, entry id) pairs
+
+        def add(key: str, kind: str, text: str, value: str):
+            key = " ".join(key.lower().split())
+            if not key:
+                return
+            entry_id = entry_ids.get((kind, value))
+            if entry_id is None:
+                entry_id = entry_ids[(kind, value)] = len(self.suggestions)
+                self.suggestions.append({"text": text, "type": kind, "value": value})
+            keyed.add((key, entry_id))
+
+        def add_word_suffixes(phrase: str, kind: str, text: str, value: str):
+            words = phrase.lower().split()
+            for start in range(len(words)):
+                add(" ".join(words[start:]), kind, text, value)
+
+        for course in courses:
+            course_string = course.get("courseString", "")
+            subject = course.get("subject", "")
+            course_number = course.get("courseNumber", "")
+            title = (course.get("title", "") or "").strip()
+            subject_description = (course.get("subjectDescription", "") or "").strip()
+
+            if course_string:
+                course_text = f"{course_string} {title}".strip()
+                add(course_string, "course", course_text, course_string)
+                if subject and course_number:
+                    add(f"{subject}:{course_number}", "course", course_text, course_string)
+                if title:
+                    add_word_suffixes(title, "title", title, title)
+
+            if subject and subject_description:
+                add_word_suffixes(subject_description, "subject", f"{subject_description} ({subject})", subject)
+
+            for section in course.get("sections", []) or []:
+                for instructor in section.get("instructors", []) or []:
+                    raw_name = (instructor.get("name", "") or "").strip()
+                    for variant in normalize_instructor_name_variants(raw_name):
+                        add(variant, "instructor", raw_name, raw_name)
+
+        keys = sorted(keyed)
+        self.suggest_keys = [key for key, _ in keys]
+        self.suggest_entries = [entry_id for _, entry_id in keys]
+
+    def _build_hash_indexes(self):
+        """Build the exact-lookup indexes, keyed the way fuzzy_search_courses compares fields."""
+        for position, course in enumerate(self.courses):
+            subject = course.get("subject", "").lower()
+            course_number = course.get("courseNumber", "").lower()
+            self.by_course_string.setdefault(course.get("courseString", "").lower(), []).append(position)
+            self.by_code.setdefault(f"{subject}:{course_number}", []).append(position)
+            self.by_number.setdefault(course_number, []).append(position)
+            self.by_subject.setdefault(subject, []).append(position)
+            self.by_title.setdefault(course.get("title", "").lower(), []).append(position)
+
+            variants = set()
+            for section_position, section in enumerate(course.get("sections", []) or []):
+                index = str(section.get("index", "") or "").strip()
+                if index and index not in self.sections_by_index:
+                    self.sections_by_index[index] = (position, section_position)
+                    meetings = self._section_meetings(section)
+                    self.section_meetings[index] = meetings
+                    self.section_masks[index] = self.meetings_mask(meetings)
+                for instructor in section.get("instructors", []) or []:
+                    variants.update(normalize_instructor_name_variants((instructor.get("name", "") or "").strip()))
+            for variant in variants:
+                self.by_instructor.setdefault(variant, []).append(position)
+
+    @staticmethod
+    def _section_meetings(section: Dict) -> List[Tuple[int, int, int, str]]:
+        """Get a raw section's scheduled meetings as (day position, start, end, campus name), sorted."""
+        meetings = []
+        for meeting in section.get("meetingTimes", []) or []:
+            day = normalize_day(meeting.get("meetingDay", "") or "")
+            start = parse_time_to_minutes(meeting.get("startTimeMilitary", "") or "")
+            end = parse_time_to_minutes(meeting.get("endTimeMilitary", "") or "")
+            if day is None or start is None or end is None or end <= start:
+                continue
+            campus = meeting.get("campusLocation", "") or ""
+            meetings.append((DAYS_OF_WEEK.index(day), start, end, CAMPUS_ID_TO_NAME.get(campus, campus)))
+        return sorted(meetings)
+
+    @staticmethod
+    def meetings_mask(meetings: List[Tuple[int, int, int, str]]) -> int:
+        """Combine the time bitmasks of (day position, start, end, ...) meetings."""
+        mask = 0
+        for day_position, start, end, *_ in meetings:
+            mask |= time_mask(day_position, start, end)
+        return mask
+
+    def lookup_specific(self, query: str, number_part: str) -> Set[int]:
+        """
+        Get the positions of every course that can be an exact or high-relevance match
+        for a course code query: the query equals its title, an instructor name variant,
+        its courseString, subject:number, number or subject, or its number equals the
+        query's number part (which covers every subject/department form of the query).
+        """
+        positions = set()
+        for index in (self.by_title, self.by_instructor, self.by_course_string,
+                      self.by_code, self.by_number, self.by_subject):
+            positions.update(index.get(query, []))
+        if number_part:
+            positions.update(self.by_number.get(number_part, []))
+        return positions
+
+    def lookup_instructor_fuzzy(self, query: str, threshold: int) -> Set[int]:
+        """Get the positions of courses with an instructor name variant scoring at least `threshold`."""
+        positions = set()
+        for variant, variant_positions in self.by_instructor.items():
+            if get_best_fuzzy_score(query, variant) >= threshold:
+                positions.update(variant_positions)
+        return positions
+
+    def expand_groups(self, positions: Iterable[int]) -> List[int]:
+        """Add every course sharing a courseString with the given courses; returns sorted positions."""
+        expanded = set()
+        for position in positions:
+            course_string = self.courses[position].get("courseString", "").lower()
+            expanded.update(self.by_course_string.get(course_string, [position]))
+        return sorted(expanded)
+
+    def find_courses(self, course_string: str) -> List[Dict]:
+        """Get the courses with a courseString (case-insensitive), in snapshot order."""
+        return [self.courses[position]
+                for position in self.by_course_string.get(str(course_string).strip().lower(), [])]
+
+    def find_code(self, code: str) -> List[Dict]:
+        """Get the courses with a subject:number code (any school prefix), in snapshot order."""
+        return [self.courses[position] for position in self.by_code.get(str(code).strip().lower(), [])]
+
+    def find_section(self, index: str) -> Optional[Tuple[Dict, Dict]]:
+        """Get the (course, section) for a section index number, or None if it is not offered."""
+        location = self.sections_by_index.get(str(index).strip())
+        if location is None:
+            return None
+        course = self.courses[location[0]]
+        return course, course["sections"][location[1]]
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Get up to `limit` suggestions whose key starts with the query.
+
+        Exact key matches come first, then suggestions are ordered by kind
+        (course, subject, title, instructor) and by how short the matched key is.
+        """
+        query = " ".join((query or "").lower().split())
+        if not query or limit <= 0:
+            return []
+
+        best = {}  # entry id -> best (exact, kind order, key length, key) rank
+        start = bisect.bisect_left(self.suggest_keys, query)
+        end = min(start + SUGGEST_SCAN_LIMIT, len(self.suggest_keys))
+        for position in range(start, end):
+            key = self.suggest_keys[position]
+            if not key.startswith(query):
+                break
+            entry_id = self.suggest_entries[position]
+            kind = self.suggestions[entry_id]["type"]
+            rank = (key != query, SUGGESTION_KIND_ORDER.get(kind, len(SUGGESTION_KIND_ORDER)), len(key), key)
+            if entry_id not in best or rank < best[entry_id]:
+                best[entry_id] = rank
+
+        ranked = sorted(best, key=best.get)[:limit]
+        return [self.suggestions[entry_id] for entry_id in ranked]
@@ -0,0 +1,358 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Overridable so a local stand-in (benchmarks/degree_site_standin.py) can replace the live site
+BASE_URL = os.environ.get("DEGREE_SITE_URL", "https://sasundergrad.rutgers.edu")
+LIST_PATH = "/majors-and-core-curriculum/major/list-of-majors-and-minors"
+
+OUTPUT_CSV = os.path.join(BASE_DIR, "majors_minors_requirements.csv")
+CACHE_PATH = os.path.join(BASE_DIR, "majors_minors_cache.json")
+OUTPUT_HEADERS = ["Major/Minor", "Major/Minor URL", "School", "Advising Page Name", "Advising Page URL",
+                  "Requirement for Major Declaration"]
+
+USER_AGENT = "Mozilla/5.0"
+
+# Pages fetched in parallel, and the minimum gap between two requests to the same host
+DEFAULT_WORKERS = 4
+DEFAULT_MIN_INTERVAL = 1.5
+
+# Responses retried (through the host rate limiter) and how often, and the longest Retry-After honored
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_STATUS_RETRIES = 3
+MAX_RETRY_AFTER_SECONDS = 120.0
+
+# Pages fetched successfully within this many hours are not requested again (resuming a run)
+DEFAULT_MAX_AGE_HOURS = 24.0
+
+REQUIREMENT_SECTION = "Requirement for Major Declaration"
+
+
+class HostRateLimiter:
+    """Spaces out requests to each host by at least `min_interval` seconds, across threads."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = {}  # host -> earliest time (monotonic) the next request may start
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the URL's host may be sent."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Keep every request to the URL's host from starting for at least `seconds` seconds."""
+        host = urlparse(url).netloc
+        with self._lock:
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + seconds)
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """The delay a response's Retry-After header asks for (seconds or an HTTP date), capped, or None."""
+    value = (response.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+class PageCache:
+    """
+    Validators (ETag, Last-Modified), content hashes and parsed results of fetched pages,
+    stored as JSON and saved after every page so an interrupted run can resume.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.pages = {}
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                self.pages = json.load(cache_file).get("pages", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable scraper cache %s: %s", path, e)
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.pages.get(url)
+            return dict(entry) if entry else None
+
+    def put(self, url: str, entry: Dict) -> None:
+        """Store a page's entry and write the cache file."""
+        with self._lock:
+            self.pages[url] = entry
+            self._save()
+
+    def _save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"pages": self.pages}, cache_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def parse_listing(html: str, base_url: str) -> List[Dict]:
+    """
+    Extract the majors and minors from the list page.
+
+    Returns:
+        A list of {"name", "url", "school", "advising_text", "advising_link"} dictionaries
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    entries = []
+    for row in soup.select("tbody tr.latestnews-item"):
+        try:
+            title_tag = row.select_one("td[data-title='Major / Minor'] a")
+            school_tag = row.select_one("td[data-title='School'] span.detail_data")
+            advising_tag = row.select_one("td[data-title='Advising Page'] a")
+            entries.append({
+                "name": title_tag.get_text(strip=True) if title_tag else "N/A",
+                "url": urljoin(base_url, title_tag["href"]) if title_tag else "N/A",
+                "school": school_tag.get_text(strip=True) if school_tag else "N/A",
+                "advising_text": advising_tag.get_text(strip=True) if advising_tag else "N/A",
+                "advising_link": advising_tag["href"] if advising_tag else "N/A",
+            })
+        except Exception as e:
+            logger.warning("Error parsing a row: %s", e)
+    return entries
+
+
+def parse_requirement(html: str) -> str:
+    """Extract the "Requirement for Major Declaration" text from a major/minor page."""
+    soup = BeautifulSoup(html, "html.parser")
+    for section in soup.find_all("a", class_="collapsible"):
+        if section.text.strip().startswith(REQUIREMENT_SECTION):
+            collapse_div = soup.find("div", id=section.get("href", "").replace("#", ""))
+            if collapse_div:
+                span_text = collapse_div.find("span", class_="field-value")
+                if span_text:
+                    return span_text.get_text(" ", strip=True)
+            break
+    return "Not Found"
+
+
+class DegreeScraper:
+    """
+    Scrapes the SAS majors and minors list and each program's declaration requirement.
+
+    Pages are fetched by a small thread pool behind a per-host rate limiter. Every page is
+    requested conditionally (If-None-Match / If-Modified-Since) and its content hash is
+    compared with the cached one, so unchanged pages are not parsed again; pages fetched
+    within `max_age_hours` are not requested at all, which lets a failed run resume.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, cache_path: str = CACHE_PATH, output_csv: str = OUTPUT_CSV,
+                 workers: int = DEFAULT_WORKERS, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_age_hours: float = DEFAULT_MAX_AGE_HOURS, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.output_csv = output_csv
+        self.workers = max(1, workers)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.timeout = timeout
+        self.cache = PageCache(cache_path)
+        self.rate_limiter = HostRateLimiter(min_interval)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        # Only connection failures are retried by urllib3; 429/5xx responses are retried in
+        # _get, through the rate limiter, so retries stay as polite as first requests
+        retry_strategy = Retry(total=3, connect=3, read=0, status=0, backoff_factor=1)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=self.workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _is_fresh(self, entry: Optional[Dict]) -> bool:
+        if not entry or not entry.get("fetched_at") or not self.max_age:
+            return False
+        return datetime.now() - datetime.fromisoformat(entry["fetched_at"]) < self.max_age
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """
+        GET a page through the host rate limiter, retrying 429/5xx responses up to
+        MAX_STATUS_RETRIES times. Before each retry the host is deferred by the response's
+        Retry-After, or by min_interval doubled per attempt when it has none.
+        """
+        for attempt in range(MAX_STATUS_RETRIES + 1):
+            self.rate_limiter.wait(url)
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_STATUS_RETRIES:
+                return response
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = self.rate_limiter.min_interval * 2 ** attempt
+            logger.info("%s answered %d, retrying in %.1fs", url, response.status_code, delay)
+            self.rate_limiter.defer(url, delay)
+        return response
+
+    def fetch(self, url: str, parse) -> Tuple[str, object]:
+        """
+        Get the parsed content of a page, using the cache where possible.
+
+        Args:
+            url: Page URL
+            parse: Function turning the page HTML into the result to cache
+
+        Returns:
+            (outcome, result): outcome is "fresh" (not requested), "not_modified" (304),
+            "unchanged" (same content hash), "updated" (parsed) or "failed" (result is the
+            last cached one, or None)
+        """
+        entry = self.cache.get(url)
+        if self._is_fresh(entry):
+            return "fresh", entry["result"]
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self._get(url, headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("Error fetching %s: %s", url, e)
+            if entry:
+                entry["error"] = str(e)
+                self.cache.put(url, entry)
+            return "failed", entry.get("result") if entry else None
+
+        now = datetime.now().isoformat()
+        if response.status_code == 304 and entry:
+            entry.update(fetched_at=now, error=None)
+            self.cache.put(url, entry)
+            return "not_modified", entry["result"]
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if entry and entry.get("sha256") == content_hash:
+            outcome, result = "unchanged", entry["result"]
+        else:
+            outcome, result = "updated", parse(response.text)
+
+        self.cache.put(url, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": content_hash,
+            "fetched_at": now,
+            "error": None,
+            "result": result,
+        })
+        return outcome, result
+
+    def run(self) -> Dict:
+        """
+        Scrape the list page and every program page, then write the output CSV.
+
+        Returns:
+            A summary with the number of programs and of pages per fetch outcome
+
+        Raises:
+            RuntimeError: If the list page can't be fetched and isn't cached
+        """
+        list_url = f"{self.base_url}{LIST_PATH}"
+        outcome, programs = self.fetch(list_url, lambda html: parse_listing(html, self.base_url))
+        if programs is None:
+            raise RuntimeError(f"Failed to fetch the list of majors and minors from {list_url}")
+        logger.info("List page %s: %d programs", outcome, len(programs))
+
+        outcomes = {}
+        requirements = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.fetch, program["url"], parse_requirement): program["url"]
+                for program in programs if program["url"] != "N/A"
+            }
+            for future in as_completed(futures):
+                page_outcome, requirement = future.result()
+                outcomes[page_outcome] = outcomes.get(page_outcome, 0) + 1
+                requirements[futures[future]] = requirement
+                logger.debug("%s: %s", futures[future], page_outcome)
+
+        rows = [
+            [program["name"], program["url"], program["school"], program["advising_text"],
+             program["advising_link"], requirements.get(program["url"]) or "Failed to fetch"]
+            for program in programs
+        ]
+        written = self._write_csv(rows)
+        return {"programs": len(programs), "pages": outcomes, "csv_changed": written}
+
+    def _write_csv(self, rows: List[List[str]]) -> bool:
+        """Write the output CSV (atomically) unless its content is unchanged; returns whether it was written."""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(OUTPUT_HEADERS)
+        writer.writerows(rows)
+        content = output.getvalue()
+
+        try:
+            with open(self.output_csv, newline="", encoding="utf-8") as existing:
+                if existing.read() == content:
+                    return False
+        except OSError:
+            pass
+
+        temp_path = f"{self.output_csv}.tmp"
+        with open(temp_path, "w", newline="", encoding="utf-8") as outfile:
+            outfile.write(content)
+        os.replace(temp_path, self.output_csv)
+        return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Scrape SAS majors/minors and their declaration requirements")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--output", default=OUTPUT_CSV)
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL,
+                        help="seconds between requests to the same host")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help="hours during which a fetched page is not requested again (0 = always revalidate)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(levelname)s %(message)s")
+    scraper = DegreeScraper(args.base_url, args.cache, args.output, args.workers, args.min_interval, args.max_age)
+    start = time.perf_counter()
+    summary = scraper.run()
+    print(f"Done in {time.perf_counter() - start:.1f}s: {summary['programs']} programs, pages {summary['pages']}, "
+          f"{'wrote' if summary['csv_changed'] else 'unchanged'} {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+from salary_api import SalaryData, format_salary_entry
+
+logger = logging.getLogger(__name__)
+
+
+class InstructorSalaryJoin:
+    """
+    Instructor name -> salary summary mapping for each course snapshot.
+
+    Every distinct section instructor name is matched against the salary data once per
+    snapshot and salary version, when the first response asks for salaries, so course
+    responses can carry them without any per-request name matching. Refreshes never load
+    the salary data themselves.
+    """
+
+    def __init__(self, course_fetcher, salary_data: SalaryData):
+        self.course_fetcher = course_fetcher
+        self.salary_data = salary_data
+        self._joins = {}  # param_key -> ((snapshot version, salary version), {name: summary or None})
+        self._lock = threading.Lock()
+
+    def on_courses_updated(self, param_key: str, courses: List[Dict]) -> None:
+        """Course update listener: drop the outdated mapping (the next attach() rebuilds it)."""
+        with self._lock:
+            self._joins.pop(param_key, None)
+
+    def _versions(self, param_key: str):
+        """(snapshot version, salary version), the salary version being None until the salaries are loaded."""
+        salary_version = self.salary_data.version if self.salary_data.loaded else None
+        return self.course_fetcher.snapshot_versions.get(param_key, 0), salary_version
+
+    def _build(self, param_key: str, courses: List[Dict]) -> Dict[str, Optional[Dict]]:
+        """Match every distinct instructor name in the raw course data against the salaries."""
+        versions = (self.course_fetcher.snapshot_versions.get(param_key, 0), self.salary_data.version)
+        names = {
+            instructor.get("name", "")
+            for course in courses
+            for section in course.get("sections", []) or []
+            for instructor in section.get("instructors", []) or []
+        }
+        names.discard("")
+
+        mapping = {}
+        for name, (match_type, entry) in self.salary_data.match_instructors(sorted(names)).items():
+            if entry:
+                mapping[name] = dict(format_salary_entry(entry), match_type=match_type)
+            else:
+                mapping[name] = None
+
+        with self._lock:
+            self._joins[param_key] = (versions, mapping)
+        logger.info(f"Joined {len(mapping)} instructors to salaries for {param_key} "
+                    f"({sum(1 for summary in mapping.values() if summary)} matched)")
+        return mapping
+
+    def get_mapping(self, year: str, term: str, campus: str) -> Dict[str, Optional[Dict]]:
+        """
+        Get the instructor -> salary summary mapping for a parameter combination, building
+        it (and loading the salaries) on first use and rebuilding it if the course snapshot
+        or the salary data changed since it was built.
+        """
+        param_key = f"{year}_{term}_{campus}"
+        versions = self._versions(param_key)
+        join = self._joins.get(param_key)
+        if join and join[0] == versions:
+            return join[1]
+        return self._build(param_key, self.course_fetcher.courses_by_params.get(param_key, []))
+
+    def attach(self, courses: List[Dict], year: str, term: str, campus: str) -> List[Dict]:
+        """
+        Add a "salaries" list to every section of enriched courses, one entry per
+        instructor (None where no salary matched). Courses are updated in place.
+        """
+        mapping = self.get_mapping(year, term, campus)
+        for course in courses:
+            for section in course.get("sections", []):
+                section["salaries"] = [mapping.get(name) for name in section.get("instructors", [])]
+        return courses
@@ -0,0 +1,308 @@
+import bisect
+import csv
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from utils.metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the CSV's mtime; requests in between never touch the file
+REQUIREMENTS_CHECK_SECONDS = 30
+
+# Requirement texts the scraper writes when a page had no requirement section or failed
+MISSING_REQUIREMENTS = {"", "not found", "failed to fetch"}
+
+# Token match weights per field, so a name match outranks a match in the requirement text
+FIELD_WEIGHTS = {"name": 3, "school": 2, "requirement": 1}
+
+# Upper bound on index tokens a prefix can expand to, so one-letter queries stay cheap
+PREFIX_SCAN_LIMIT = 200
+
+# A school:subject:number or subject:number code, followed by shorthand numbers in the same
+# subject ("01:119:115, 116 and 117")
+COURSE_CODE_PATTERN = re.compile(
+    r"\b(?:(\d{2}):)?(\d{3}):(\d{3})\b((?:\s*(?:,|and|or|&)\s*\d{3}\b(?!:))*)"
+)
+SHORTHAND_NUMBER_PATTERN = re.compile(r"\d{3}")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def extract_course_codes(text: str) -> List[str]:
+    """
+    Find the course codes mentioned in a requirement text, in order of appearance.
+
+    Shorthand continuations reuse the preceding code's school and subject, so
+    "01:160:159, 161, 163" yields 01:160:159, 01:160:161 and 01:160:163.
+
+    Args:
+        text: Requirement text
+
+    Returns:
+        Distinct codes as written ("01:160:159", or "160:159" without a school prefix)
+    """
+    codes = []
+    for match in COURSE_CODE_PATTERN.finditer(text or ""):
+        school, subject, number, shorthand = match.groups()
+        prefix = f"{school}:{subject}" if school else subject
+        for course_number in [number] + SHORTHAND_NUMBER_PATTERN.findall(shorthand or ""):
+            codes.append(f"{prefix}:{course_number}")
+    return list(dict.fromkeys(codes))
+
+
+def program_slug(name: str, url: str) -> str:
+    """The program's URL slug (last path segment of its page), or a slug made from its name."""
+    path = urlparse(url or "").path.rstrip("/")
+    if path:
+        return path.rsplit("/", 1)[-1].lower()
+    return "-".join(tokenize(name))
+
+
+class RequirementsData:
+    """
+    Majors and minors with their declaration requirements, from the scraper's CSV.
+
+    The file is loaded once and indexed (name, school and requirement tokens -> programs);
+    afterwards its mtime is checked at most every `check_interval` seconds and the data is
+    reloaded only when the file changed. Course codes in the requirement texts are linked to
+    a course snapshot once per snapshot version.
+    """
+
+    def __init__(self, course_fetcher, csv_path: Optional[str] = None,
+                 check_interval: float = REQUIREMENTS_CHECK_SECONDS):
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.course_fetcher = course_fetcher
+        self.csv_path = csv_path or os.path.join(base_dir, "majors_minors_requirements.csv")
+        self.check_interval = check_interval
+        # Loaded data, replaced as a whole on reload so readers never see a mix of two loads:
+        # programs, by_slug (slug -> position), token_index (token -> {position: weight}),
+        # tokens (sorted index tokens, for prefix matching) and version
+        self._data = {"programs": [], "by_slug": {}, "token_index": {}, "tokens": [], "version": 0}
+        self.last_loaded = None
+        self._source_stat = None
+        self._next_check = 0.0
+        self._links = {}  # param_key -> ((snapshot version, data version), {code: linked courses})
+        self._load_lock = threading.Lock()
+
+    def _ensure_current(self) -> None:
+        """Load the CSV on first use, and reload it if it changed since the last check."""
+        now = time.monotonic()
+        if self._data["version"] and now < self._next_check:
+            return
+        with self._load_lock:
+            if self._data["version"] and now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            try:
+                source_stat = self._stat()
+            except OSError as e:
+                if not self._data["version"]:
+                    logger.warning("Majors/minors requirements not available: %s", e)
+                    self._data = dict(self._data, version=1)
+                return
+            if source_stat != self._source_stat:
+                self._load(source_stat)
+
+    def _stat(self) -> Tuple[int, int]:
+        """Cheap fingerprint (mtime, size) of the CSV."""
+        stat = os.stat(self.csv_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @stage("requirements_load")
+    def _load(self, source_stat: Tuple[int, int]) -> None:
+        """Read the CSV and rebuild the program list and indexes."""
+        try:
+            with open(self.csv_path, newline="", encoding="utf-8") as csvfile:
+                rows = list(csv.DictReader(csvfile))
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            logger.warning("Could not read %s, keeping the loaded requirements: %s", self.csv_path, e)
+            return
+
+        programs = []
+        by_slug = {}
+        token_index = {}
+        for row in rows:
+            row = {(key or "").strip(): (value or "").strip() for key, value in row.items()}
+            name = row.get("Major/Minor", "")
+            if not name:
+                continue
+            requirement = row.get("Requirement for Major Declaration", "")
+            if requirement.lower() in MISSING_REQUIREMENTS:
+                requirement = None
+            program = {
+                "name": name,
+                "slug": program_slug(name, row.get("Major/Minor URL", "")),
+                "url": row.get("Major/Minor URL") or None,
+                "school": row.get("School") or None,
+                "advising_page": row.get("Advising Page Name") or None,
+                "advising_url": row.get("Advising Page URL") or None,
+                "requirement": requirement,
+                "course_codes": extract_course_codes(requirement or ""),
+            }
+            position = len(programs)
+            programs.append(program)
+            by_slug.setdefault(program["slug"], position)
+
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in set(tokenize(program[field] or "")):
+                    weights = token_index.setdefault(token, {})
+                    weights[position] = max(weights.get(position, 0), weight)
+
+        self._data = {
+            "programs": programs,
+            "by_slug": by_slug,
+            "token_index": token_index,
+            "tokens": sorted(token_index),
+            "version": self._data["version"] + 1,
+        }
+        self._source_stat = source_stat
+        self.last_loaded = datetime.now().isoformat()
+        logger.info("Loaded %d majors/minors from %s", len(programs), self.csv_path)
+
+    def preload(self) -> None:
+        """Load the CSV now rather than on the first request."""
+        self._ensure_current()
+
+    @property
+    def version(self) -> int:
+        """Bumped every time the CSV is (re)loaded."""
+        self._ensure_current()
+        return self._data["version"]
+
+    @property
+    def programs(self) -> List[Dict]:
+        """All programs, in CSV order."""
+        self._ensure_current()
+        return self._data["programs"]
+
+    @staticmethod
+    def _token_matches(data: Dict, token: str, prefix: bool) -> Dict[int, int]:
+        """Program position -> best weight for an index token (or any token starting with it)."""
+        if not prefix:
+            return data["token_index"].get(token, {})
+        matches = {}
+        tokens = data["tokens"]
+        start = bisect.bisect_left(tokens, token)
+        for index_token in tokens[start:start + PREFIX_SCAN_LIMIT]:
+            if not index_token.startswith(token):
+                break
+            for position, weight in data["token_index"][index_token].items():
+                matches[position] = max(matches.get(position, 0), weight)
+        return matches
+
+    @stage("requirements_search")
+    def search(self, query: str = "", school: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        Find programs whose name, school or requirement text contains every query token.
+
+        The last query token also matches as a prefix, so partial words work while typing.
+        Results are ranked by the summed field weights of the matched tokens, then by name.
+
+        Args:
+            query: Search text; empty lists every program
+            school: Optional school filter (case-insensitive, e.g. "SAS")
+            limit: Maximum number of programs returned (none below 1)
+
+        Returns:
+            Program dictionaries (without course links)
+        """
+        if limit < 1:
+            return []
+        self._ensure_current()
+        data = self._data
+        programs = data["programs"]
+        tokens = tokenize(query)
+        if tokens:
+            scores = None
+            for position_in_query, token in enumerate(tokens):
+                matches = self._token_matches(data, token, prefix=position_in_query == len(tokens) - 1)
+                if scores is None:
+                    scores = dict(matches)
+                else:
+                    scores = {position: score + matches[position]
+                              for position, score in scores.items() if position in matches}
+                if not scores:
+                    return []
+            ranked = sorted(scores, key=lambda position: (-scores[position], programs[position]["name"]))
+        else:
+            ranked = range(len(programs))
+
+        school = (school or "").strip().lower()
+        results = []
+        for position in ranked:
+            program = programs[position]
+            if school and (program["school"] or "").lower() != school:
+                continue
+            results.append(program)
+            if len(results) >= limit:
+                break
+        return results
+
+    def get_program(self, slug: str) -> Optional[Dict]:
+        """Get a program by slug (or exact name, case-insensitive), or None."""
+        self._ensure_current()
+        data = self._data
+        position = data["by_slug"].get(slug.strip().lower())
+        if position is None:
+            position = data["by_slug"].get(program_slug(slug, ""))
+        if position is None:
+            name = slug.strip().lower()
+            position = next((index for index, program in enumerate(data["programs"])
+                             if program["name"].lower() == name), None)
+        return data["programs"][position] if position is not None else None
+
+    def _code_links(self, year: str, term: str, campus: str) -> Dict[str, List[Dict]]:
+        """
+        Course code -> offered courses in a snapshot, for every code mentioned in the
+        requirements; rebuilt when the snapshot or the requirements change.
+        """
+        param_key = f"{year}_{term}_{campus}"
+        data = self._data
+        course_index = self.course_fetcher.get_course_index(year, term, campus)
+        versions = (self.course_fetcher.snapshot_versions.get(param_key, 0), data["version"])
+        links = self._links.get(param_key)
+        if links and links[0] == versions:
+            return links[1]
+
+        mapping = {}
+        for program in data["programs"]:
+            for code in program["course_codes"]:
+                if code in mapping:
+                    continue
+                if course_index is None:
+                    courses = []
+                elif code.count(":") == 2:
+                    courses = course_index.find_courses(code)
+                else:
+                    courses = course_index.find_code(code)
+                mapping[code] = [{
+                    "courseString": course.get("courseString", ""),
+                    "title": course.get("title", ""),
+                    "credits": course.get("credits"),
+                    "sections": len(course.get("sections", []) or []),
+                } for course in courses]
+        self._links[param_key] = (versions, mapping)
+        return mapping
+
+    def link_courses(self, program: Dict, year: str, term: str, campus: str) -> Dict:
+        """
+        Get a copy of a program with a "courses" list: each code from its requirement text
+        with whether it is offered in the term's snapshot and the matching courses.
+        """
+        mapping = self._code_links(year, term, campus)
+        linked = dict(program)
+        linked["courses"] = [
+            {"code": code, "offered": bool(mapping.get(code)), "matches": mapping.get(code, [])}
+            for code in program["course_codes"]
+        ]
+        return linked
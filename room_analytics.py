@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional
+import numpy as np
+from room_index import RoomIndex
+from utils.constants import CAMPUS_ID_TO_NAME, DAYS_OF_WEEK
+
+# Hours counted as schedulable when computing utilization percentages (8:00 AM - 10:00 PM)
+UTILIZATION_FIRST_HOUR = 8
+UTILIZATION_LAST_HOUR = 22
+
+# Days counted as schedulable (Monday - Friday)
+UTILIZATION_DAYS = DAYS_OF_WEEK[:5]
+
+# Rooms below this weekly utilization percentage are reported as underused by default
+DEFAULT_UNDERUSED_THRESHOLD = 15.0
+
+
+class RoomUtilization:
+    """
+    Room utilization aggregates for one course snapshot.
+
+    Busy intervals from the RoomIndex are turned into a rooms x days x hours array of
+    scheduled minutes in one vectorized pass; every breakdown is a sum over that array.
+    """
+
+    def __init__(self, room_index: RoomIndex):
+        """Compute scheduled minutes per room, day and hour from a room index."""
+        self.room_keys = list(room_index.rooms.keys())
+        self.rooms = [room_index.rooms[room_key] for room_key in self.room_keys]
+        room_positions = {room_key: position for position, room_key in enumerate(self.room_keys)}
+        day_positions = {day: position for position, day in enumerate(DAYS_OF_WEEK)}
+
+        intervals = [
+            (room_positions[room_key], day_positions[day], start, end)
+            for room_key, day, start, end in room_index.iter_busy_intervals()
+            if room_key in room_positions and day in day_positions
+        ]
+        interval_array = np.array(intervals, dtype=np.int32).reshape(-1, 4)
+        room_idx, day_idx, starts, ends = interval_array.T
+
+        # Minutes each interval overlaps each hour of the day: (intervals, 24)
+        hour_starts = np.arange(24, dtype=np.int32) * 60
+        overlap = np.minimum(ends[:, None], hour_starts + 60) - np.maximum(starts[:, None], hour_starts)
+        overlap = np.clip(overlap, 0, None)
+
+        self.minutes = np.zeros((len(self.room_keys), len(DAYS_OF_WEEK), 24), dtype=np.int32)
+        np.add.at(self.minutes, (room_idx, day_idx), overlap)
+
+        self._day_mask = np.array([day in UTILIZATION_DAYS for day in DAYS_OF_WEEK])
+        self._hour_mask = np.zeros(24, dtype=bool)
+        self._hour_mask[UTILIZATION_FIRST_HOUR:UTILIZATION_LAST_HOUR] = True
+        self._schedulable_minutes_per_room = int(self._day_mask.sum() * self._hour_mask.sum() * 60)
+
+        # Weekly utilization of each room within schedulable hours
+        schedulable = self.minutes[:, self._day_mask][:, :, self._hour_mask]
+        self.room_weekly_minutes = schedulable.sum(axis=(1, 2))
+        self.room_weekly_percent = self._percent(self.room_weekly_minutes, self._schedulable_minutes_per_room)
+
+        self._summary = None
+
+    @staticmethod
+    def _percent(minutes: np.ndarray, capacity) -> np.ndarray:
+        """Scheduled minutes as a percentage of the capacity, 0 where there is no capacity."""
+        capacity = np.asarray(capacity, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent = np.where(capacity > 0, minutes * 100.0 / capacity, 0.0)
+        return np.round(percent, 1)
+
+    def _group_breakdown(self, labels: List[str]) -> Dict[str, Dict]:
+        """
+        Aggregate the rooms x days x hours array into groups (building, campus, ...).
+
+        Each group reports its room count, weekly scheduled hours, weekly utilization,
+        the day x hour utilization heatmap and its peak hour.
+        """
+        group_names, group_idx = np.unique(np.array(labels, dtype=object).astype(str), return_inverse=True)
+        group_minutes = np.zeros((len(group_names), len(DAYS_OF_WEEK), 24), dtype=np.int64)
+        np.add.at(group_minutes, group_idx, self.minutes)
+        room_counts = np.bincount(group_idx, minlength=len(group_names))
+
+        heatmaps = self._percent(group_minutes, room_counts[:, None, None] * 60)
+        weekly_minutes = group_minutes[:, self._day_mask][:, :, self._hour_mask].sum(axis=(1, 2))
+        weekly_percent = self._percent(weekly_minutes, room_counts * self._schedulable_minutes_per_room)
+
+        breakdown = {}
+        for position, name in enumerate(group_names):
+            peak_day, peak_hour = np.unravel_index(np.argmax(heatmaps[position]), heatmaps[position].shape)
+            breakdown[str(name)] = {
+                'rooms': int(room_counts[position]),
+                'scheduled_hours': round(float(group_minutes[position].sum()) / 60, 1),
+                'utilization_percent': float(weekly_percent[position]),
+                'peak': {
+                    'day': DAYS_OF_WEEK[peak_day],
+                    'hour': int(peak_hour),
+                    'utilization_percent': float(heatmaps[position][peak_day, peak_hour])
+                },
+                'heatmap': heatmaps[position].tolist()
+            }
+        return breakdown
+
+    def underused_rooms(self, threshold: float = DEFAULT_UNDERUSED_THRESHOLD) -> List[Dict]:
+        """Get the rooms whose weekly utilization is below `threshold` percent, least used first."""
+        positions = np.nonzero(self.room_weekly_percent < threshold)[0]
+        positions = positions[np.argsort(self.room_weekly_percent[positions], kind='stable')]
+        return [
+            {
+                'room': self.rooms[position]['full_name'],
+                'building': self.rooms[position]['building'],
+                'campus': self.rooms[position].get('campus', ''),
+                'scheduled_hours': round(float(self.room_weekly_minutes[position]) / 60, 1),
+                'utilization_percent': float(self.room_weekly_percent[position])
+            }
+            for position in positions
+        ]
+
+    def summary(self) -> Dict:
+        """
+        Get every breakdown (building, campus, building type) plus the campus-wide heatmap.
+        Computed once and reused for the lifetime of the snapshot.
+        """
+        if self._summary is None:
+            campuses = [CAMPUS_ID_TO_NAME.get(room.get('campus', ''), room.get('campus', '')) or 'Unknown'
+                        for room in self.rooms]
+            overall = self._group_breakdown(['All'] * len(self.rooms)).get('All') if self.rooms else None
+            self._summary = {
+                'days': DAYS_OF_WEEK,
+                'hours': list(range(24)),
+                'schedulable_hours': {
+                    'days': UTILIZATION_DAYS,
+                    'first_hour': UTILIZATION_FIRST_HOUR,
+                    'last_hour': UTILIZATION_LAST_HOUR
+                },
+                'overall': overall,
+                'buildings': self._group_breakdown([room['building'] for room in self.rooms]),
+                'campuses': self._group_breakdown(campuses),
+                'building_types': self._group_breakdown([room.get('building_type', 'unknown') for room in self.rooms])
+            }
+        return self._summary
+
+    def building_rooms(self, building: str) -> Optional[List[Dict]]:
+        """Get per-room utilization for one building, or None if the building has no rooms."""
+        positions = [position for position, room in enumerate(self.rooms)
+                     if room['building'].upper() == building.upper()]
+        if not positions:
+            return None
+
+        heatmaps = self._percent(self.minutes[positions], 60)
+        return [
+            {
+                'room': self.rooms[position]['full_name'],
+                'scheduled_hours': round(float(self.minutes[position].sum()) / 60, 1),
+                'utilization_percent': float(self.room_weekly_percent[position]),
+                'heatmap': heatmaps[offset].tolist()
+            }
+            for offset, position in enumerate(positions)
+        ]
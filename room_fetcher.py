@@ -1,27 +1,67 @@
+import os
+import csv
 import logging
-import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from course_fetcher import CourseFetcher
 from rapidfuzz import fuzz, process
+from room_index import RoomIndex, BuildingGrid, parse_time_window, SLOT_SEARCH_START, SLOT_SEARCH_END
+from room_analytics import RoomUtilization
 from utils.constants import CAMPUS_ID_TO_NAME, CAMPUS_ABBREV_TO_NAME
 from utils.fuzzy_utils import get_best_fuzzy_score
+from utils.time_utils import parse_time_to_minutes, normalize_day, current_day_and_minutes
+from utils.metrics import stage
 
-# Rutgers building coordinates (you can expand this dictionary)
+# Building table (code, name, campus, latitude, longitude, type); edit this file to add buildings
+BUILDINGS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "buildings.csv")
+
+# Rutgers building coordinates, used if the building table is missing
 BUILDING_COORDINATES = {
     'ARC': {'lat': 40.5008, 'lng': -74.4474},  # Academic Resource Center
     'HILL': {'lat': 40.5009, 'lng': -74.4475},  # Hill Center
     'BECK': {'lat': 40.5010, 'lng': -74.4476},  # Beck Hall
-    # Add more buildings as needed
 }
 
-# Building type mappings
+# Building type mappings, used if the building table is missing
 BUILDING_TYPES = {
     'ARC': 'classroom',
     'HILL': 'lecture',
     'BECK': 'classroom',
-    # Add more mappings as needed
 }
 
+
+def load_building_table(path: str = BUILDINGS_CSV) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+    """
+    Load building coordinates and types from a CSV file.
+    Returns empty mappings if the file is missing or unreadable.
+    """
+    coordinates = {}
+    building_types = {}
+
+    if not os.path.exists(path):
+        return coordinates, building_types
+
+    try:
+        with open(path, newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                code = (row.get('code') or '').strip().upper()
+                if not code:
+                    continue
+                try:
+                    coordinates[code] = {'lat': float(row['latitude']), 'lng': float(row['longitude'])}
+                except (KeyError, TypeError, ValueError):
+                    pass
+                if (row.get('type') or '').strip():
+                    building_types[code] = row['type'].strip().lower()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Failed to load building table {path}: {str(e)}")
+
+    return coordinates, building_types
+
+
+_table_coordinates, _table_types = load_building_table()
+BUILDING_COORDINATES.update(_table_coordinates)
+BUILDING_TYPES.update(_table_types)
+
 class RoomFetcher:
     """
     A class to search, filter, and retrieve room information and availability
@@ -32,6 +72,9 @@ class RoomFetcher:
         """Initialize the RoomFetcher with a course fetcher instance"""
         self.course_fetcher = course_fetcher
         self.logger = logging.getLogger(__name__)
+        self._room_indexes = {}  # param_key -> (snapshot version, RoomIndex)
+        self._utilization = {}  # param_key -> (snapshot version, RoomUtilization)
+        self.building_grid = BuildingGrid(BUILDING_COORDINATES)
 
     def _get_room_coordinates(self, building: str) -> Optional[Dict[str, float]]:
         """
@@ -84,13 +127,52 @@ class RoomFetcher:
         
         return list(rooms.values())
 
+    def get_room_index(self, year="2025", term="1", campus="NB") -> RoomIndex:
+        """
+        Get the room availability index for the current course snapshot,
+        rebuilding it only when the CourseFetcher has installed new data.
+        """
+        param_key = f"{year}_{term}_{campus}"
+        version = self.course_fetcher.get_snapshot_version(year, term, campus)
+        cached = self._room_indexes.get(param_key)
+        if version and cached and cached[0] == version:
+            return cached[1]
+
+        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
+        version = self.course_fetcher.get_snapshot_version(year, term, campus)
+        with stage("room_index_build"):
+            room_index = RoomIndex(self._extract_rooms_from_courses(courses), courses)
+        if version:
+            self._room_indexes[param_key] = (version, room_index)
+        self.logger.info("Built room index for %s (version %s): %d rooms", param_key, version, len(room_index.rooms))
+        return room_index
+
+    def get_room_utilization(self, year="2025", term="1", campus="NB") -> RoomUtilization:
+        """
+        Get the room utilization aggregates for the current course snapshot,
+        computing them only when the CourseFetcher has installed new data.
+        """
+        param_key = f"{year}_{term}_{campus}"
+        room_index = self.get_room_index(year, term, campus)
+        version = self.course_fetcher.get_snapshot_version(year, term, campus)
+        cached = self._utilization.get(param_key)
+        if version and cached and cached[0] == version:
+            return cached[1]
+
+        utilization = RoomUtilization(room_index)
+        if version:
+            self._utilization[param_key] = (version, utilization)
+        return utilization
+
     def get_all_rooms(self, year="2025", term="1", campus="NB") -> List[Dict]:
         """
         Retrieve a list of all unique rooms from the course data.
         """
-        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
-        return self._extract_rooms_from_courses(courses)
+        # Copies, since callers annotate the room dictionaries they get back
+        room_index = self.get_room_index(year, term, campus)
+        return [room.copy() for room in room_index.rooms.values()]
 
+    @stage("room_search")
     def search_rooms(self, query: str, year="2025", term="1", campus="NB", 
                     building_types: List[str] = None, campus_filters: List[str] = None) -> List[Dict]:
         """
@@ -241,35 +323,6 @@ class RoomFetcher:
         
         return sorted_rooms
 
-    def _is_time_in_range(self, target_start: str, target_end: str, class_start: str, class_end: str) -> bool:
-        """
-        Check if a target time range overlaps with a class time range.
-        All times should be in 12-hour format (e.g., '10:00 AM', '2:30 PM').
-        
-        Returns True if there is any overlap between the target range and class range.
-        """
-        if class_start == 'TBA' or class_end == 'TBA':
-            return False
-            
-        try:
-            # Parse all times to datetime objects for comparison
-            # We use a dummy date just to have a complete datetime object
-            dummy_date = datetime.datetime.today().date()
-            
-            # Convert to datetime objects
-            time_format = '%I:%M %p'  # 12-hour format with AM/PM
-            target_start_dt = datetime.datetime.strptime(target_start, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            target_end_dt = datetime.datetime.strptime(target_end, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            class_start_dt = datetime.datetime.strptime(class_start, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            class_end_dt = datetime.datetime.strptime(class_end, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            
-            # Check for any overlap between the ranges
-            # Two ranges overlap if one range's start is before the other's end and vice versa
-            return (target_start_dt < class_end_dt and class_start_dt < target_end_dt)
-        except ValueError as e:
-            self.logger.error(f"Error parsing time: {e}")
-            return False
-    
     def _filter_by_campus(self, rooms: List[Dict], campus_filter: str) -> List[Dict]:
         """
         Filter rooms by specific campus.
@@ -289,8 +342,8 @@ class RoomFetcher:
         # Log a sample room to see its structure
         if rooms and len(rooms) > 0:
             sample_room = rooms[0]
-            self.logger.debug(f"Sample room structure: {sample_room}")
-            self.logger.debug(f"Campus filter: {campus_filter}, Campus name: {campus_name}")
+            self.logger.debug("Sample room structure: %s", sample_room)
+            self.logger.debug("Campus filter: %s, Campus name: %s", campus_filter, campus_name)
         
         # Filter rooms by campus
         filtered_rooms = []
@@ -324,12 +377,13 @@ class RoomFetcher:
             
             # If there's a match, add to filtered list
             if is_match:
-                self.logger.debug(f"Match: Room {room.get('building', '')} {room.get('room', '')}")
+                self.logger.debug("Match: Room %s %s", room.get('building', ''), room.get('room', ''))
                 filtered_rooms.append(room)
         
-        self.logger.debug(f"Campus filter '{campus_name}' found {len(filtered_rooms)} of {len(rooms)} rooms")
+        self.logger.debug("Campus filter '%s' found %d of %d rooms", campus_name, len(filtered_rooms), len(rooms))
         return filtered_rooms
 
+    @stage("room_availability")
     def find_available_rooms(self, day: str, start_time: str, end_time: str, year="2025", 
                             term="1", campus="NB", campus_filter="", search: str = "") -> List[Dict]:
         """
@@ -354,41 +408,20 @@ class RoomFetcher:
             
         available_rooms = []
         
-        # Get all course data for scheduling analysis
-        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
+        # Check availability against the per-snapshot index instead of scanning every course
+        room_index = self.get_room_index(year, term, campus)
+        day_name = normalize_day(day) or day
+        target_start = parse_time_to_minutes(start_time)
+        target_end = parse_time_to_minutes(end_time)
+        if target_start is None or target_end is None:
+            self.logger.error(f"Error parsing time range: {start_time} - {end_time}")
         
         for room_info in all_rooms:
-            building = room_info['building']
-            room = room_info['room']
-            
-            # Assume room is available until proven otherwise
-            is_available = True
-            
-            # Check all courses for this room
-            for course in courses:
-                for section in course.get('sections', []):
-                    for meeting_time in section.get('meeting_times', []):
-                        # Skip if not this room or day
-                        if (meeting_time.get('building') != building or 
-                            meeting_time.get('room') != room or
-                            meeting_time.get('day') != day):
-                            continue
-                        
-                        # Check if our target time range overlaps with this class's time range
-                        class_start = meeting_time.get('start_time', {}).get('formatted', 'TBA')
-                        class_end = meeting_time.get('end_time', {}).get('formatted', 'TBA')
-                        
-                        if self._is_time_in_range(start_time, end_time, class_start, class_end):
-                            is_available = False
-                            break
-                    
-                    if not is_available:
-                        break
-                
-                if not is_available:
-                    break
+            room_key = RoomIndex.room_key(room_info['building'], room_info['room'])
+            is_available = (target_start is None or target_end is None or
+                            room_index.is_available(room_key, day_name, target_start, target_end))
             
-            # If still available after checking all courses, add to our list
+            # If available, add to our list
             if is_available:
                 # Add availability info to the room object
                 room_with_availability = room_info.copy()
@@ -400,6 +433,7 @@ class RoomFetcher:
         
         return available_rooms
 
+    @stage("room_schedule")
     def get_room_schedule(self, building: str, room: str, year="2025", term="1", campus="NB") -> Dict:
         """
         Get the schedule for a specific room, organized by day and time.
@@ -501,4 +535,157 @@ class RoomFetcher:
             else:
                 schedule["daily_schedule"][day] = {"classes": classes, "status": "Classes Scheduled"}
         
-        return schedule
\ No newline at end of file
+        return schedule
+
+    @stage("room_availability")
+    def check_availability(self, windows: List[Dict], rooms: Optional[List[str]] = None, search: str = "",
+                           year="2025", term="1", campus="NB") -> Dict:
+        """
+        Answer many availability questions against one room index.
+
+        Parameters:
+        - windows: List of {"day", "start_time", "end_time"} time windows
+        - rooms: Optional list of rooms ("ARC 103" or "ARC_103"); if given, report each room's
+          availability for every window, otherwise list the available rooms for each window
+        - search: Optional search query used to narrow the rooms considered (ignored if rooms is given)
+        - year, term, campus: Academic period parameters
+
+        Raises ValueError if a window or room is invalid.
+        """
+        parsed_windows = [parse_time_window(window) for window in windows]
+        room_index = self.get_room_index(year, term, campus)
+        normalized_windows = [
+            {'day': day, 'start_time': window.get('start_time'), 'end_time': window.get('end_time')}
+            for window, (day, _, _) in zip(windows, parsed_windows)
+        ]
+
+        if rooms:
+            room_keys = []
+            for room in rooms:
+                room_key = room_index.resolve_room(room)
+                if not room_key:
+                    raise ValueError(f"Unknown room: {room!r}")
+                room_keys.append(room_key)
+
+            return {
+                'windows': normalized_windows,
+                'rooms': [
+                    {
+                        **room_index.rooms[room_key],
+                        'availability': [
+                            room_index.is_available(room_key, day, start, end)
+                            for day, start, end in parsed_windows
+                        ]
+                    }
+                    for room_key in room_keys
+                ]
+            }
+
+        # Search once, then answer every window from the same candidate set
+        if search:
+            candidates = self.search_rooms(search, year, term, campus)
+            room_keys = [RoomIndex.room_key(room['building'], room['room']) for room in candidates]
+        else:
+            room_keys = list(room_index.rooms.keys())
+
+        results = []
+        for window, (day, start, end) in zip(normalized_windows, parsed_windows):
+            available = room_index.available_rooms(day, start, end, room_keys)
+            results.append({
+                **window,
+                'available': [room_index.rooms[room_key]['full_name'] for room_key in available],
+                'count': len(available)
+            })
+
+        return {
+            'windows': results,
+            'rooms': {room_index.rooms[room_key]['full_name']: room_index.rooms[room_key] for room_key in room_keys}
+        }
+
+    def find_next_free_slot(self, building: str, room: str, day: str, after: str, duration: int,
+                            year="2025", term="1", campus="NB", until: str = "") -> Optional[Dict]:
+        """
+        Find the next free slot in a room after a given time that lasts at least `duration` minutes.
+
+        Parameters:
+        - building, room: The room to check
+        - day: Day to start looking on (Monday, Tuesday, etc.)
+        - after: Time to start looking from (e.g., '10:00 AM')
+        - duration: Minimum length of the slot in minutes
+        - until: Optional latest time a slot may extend to each day (defaults to 10:00 PM)
+
+        Returns the slot, or None if the room has no such slot in the coming week.
+        Raises ValueError if the room or the time parameters are invalid.
+        """
+        room_index = self.get_room_index(year, term, campus)
+        room_key = room_index.resolve_room(RoomIndex.room_key(building, room))
+        if not room_key:
+            raise ValueError(f"Unknown room: {building} {room}")
+
+        day_name = normalize_day(day)
+        after_minutes = parse_time_to_minutes(after) if after else SLOT_SEARCH_START
+        day_end = parse_time_to_minutes(until) if until else SLOT_SEARCH_END
+        if not day_name:
+            raise ValueError(f"Invalid day: {day!r}")
+        if after_minutes is None or day_end is None:
+            raise ValueError("Invalid time")
+        if duration <= 0:
+            raise ValueError("duration must be a positive number of minutes")
+
+        slot = room_index.next_free_slot(room_key, day_name, after_minutes, duration, day_end=day_end)
+        if slot:
+            slot['room'] = room_index.rooms[room_key]['full_name']
+        return slot
+
+    def find_nearest_available_rooms(self, lat: Optional[float] = None, lng: Optional[float] = None,
+                                     building: str = "", day: str = "", start_time: str = "",
+                                     end_time: str = "", limit: int = 5, max_distance: Optional[float] = None,
+                                     year="2025", term="1", campus="NB") -> List[Dict]:
+        """
+        Find the closest rooms that are free for a time range.
+
+        Parameters:
+        - lat, lng: Point to search around, or
+        - building: Building code to search around
+        - day, start_time: Start of the range (defaults to now on campus)
+        - end_time: End of the range (defaults to one hour after the start)
+        - limit: Maximum number of rooms to return
+        - max_distance: Optional maximum distance in meters
+
+        Buildings are visited nearest-first through the building grid, and the search
+        stops as soon as enough free rooms are found.
+        Raises ValueError if the location, time or limit parameters are invalid.
+        """
+        if building:
+            coordinates = self._get_room_coordinates(building)
+            if not coordinates:
+                raise ValueError(f"No coordinates known for building: {building}")
+            lat, lng = coordinates['lat'], coordinates['lng']
+        if lat is None or lng is None:
+            raise ValueError("Either lat/lng or building must be specified")
+
+        now_day, now_minutes = current_day_and_minutes()
+        day_name = normalize_day(day) if day else now_day
+        start = parse_time_to_minutes(start_time) if start_time else now_minutes
+        end = parse_time_to_minutes(end_time) if end_time else (start + 60 if start is not None else None)
+        if not day_name:
+            raise ValueError(f"Invalid day: {day!r}")
+        if start is None or end is None or end <= start:
+            raise ValueError("Invalid time range")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        room_index = self.get_room_index(year, term, campus)
+        nearest_rooms = []
+
+        for distance, building_code in self.building_grid.iter_nearest(lat, lng, max_distance):
+            for room_key in room_index.rooms_by_building.get(building_code, []):
+                if not room_index.is_available(room_key, day_name, start, end):
+                    continue
+                room_info = room_index.rooms[room_key].copy()
+                room_info['distance_meters'] = round(distance, 1)
+                nearest_rooms.append(room_info)
+                if len(nearest_rooms) >= limit:
+                    return nearest_rooms
+
+        return nearest_rooms
@@ -0,0 +1,283 @@
+import bisect
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.constants import DAYS_OF_WEEK
+from utils.geo_utils import haversine_meters
+from utils.time_utils import parse_time_to_minutes, format_minutes, normalize_day
+
+# Window searched for free slots when the caller doesn't give one (8:00 AM - 10:00 PM)
+SLOT_SEARCH_START = 8 * 60
+SLOT_SEARCH_END = 22 * 60
+
+# Queries whose nearest building is more rings of cells away than this get a plain sort of every
+# building: the cell-to-meters bound of the ring scan only holds near the grid's reference latitude
+MAX_RING_SCAN_CELLS = 40
+
+
+class RoomIndex:
+    """
+    Busy intervals for every room, grouped by day, built once per course snapshot.
+
+    Intervals for a room/day are sorted and merged, so availability checks are a
+    binary search instead of a scan over every course, section and meeting time.
+    """
+
+    def __init__(self, rooms: List[Dict], courses: List[Dict]):
+        """
+        Build the index from the rooms extracted by the RoomFetcher and the
+        enriched course data they were extracted from.
+        """
+        self.rooms = {self.room_key(room['building'], room['room']): room for room in rooms}
+        self.rooms_by_building = {}  # building code (upper case) -> room keys
+        for room_key, room in self.rooms.items():
+            self.rooms_by_building.setdefault(room['building'].upper(), []).append(room_key)
+        self._starts = {}  # room_key -> day -> sorted interval starts (minutes)
+        self._ends = {}    # room_key -> day -> matching interval ends (minutes)
+
+        intervals = {}
+        for course in courses:
+            for section in course.get('sections', []):
+                for meeting_time in section.get('meeting_times', []):
+                    building = meeting_time.get('building')
+                    room = meeting_time.get('room')
+                    day = meeting_time.get('day')
+                    if not building or not room or not day:
+                        continue
+
+                    start = self._meeting_minutes(meeting_time.get('start_time', {}))
+                    end = self._meeting_minutes(meeting_time.get('end_time', {}))
+                    if start is None or end is None or end <= start:
+                        continue
+
+                    room_days = intervals.setdefault(self.room_key(building, room), {})
+                    room_days.setdefault(day, []).append((start, end))
+
+        for room_key, days in intervals.items():
+            for day, day_intervals in days.items():
+                merged = self._merge_intervals(day_intervals)
+                self._starts.setdefault(room_key, {})[day] = [start for start, _ in merged]
+                self._ends.setdefault(room_key, {})[day] = [end for _, end in merged]
+
+    @staticmethod
+    def room_key(building: str, room: str) -> str:
+        """Key used for a room throughout the room search code (e.g., "ARC_103")."""
+        return f"{building}_{room}"
+
+    @staticmethod
+    def _meeting_minutes(time_info: Dict) -> Optional[int]:
+        """Get minutes after midnight from a formatted meeting time entry."""
+        minutes = parse_time_to_minutes(time_info.get('military', ''))
+        if minutes is None:
+            minutes = parse_time_to_minutes(time_info.get('formatted', ''))
+        return minutes
+
+    @staticmethod
+    def _merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Sort intervals and merge the ones that overlap or touch."""
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def resolve_room(self, room: str) -> Optional[str]:
+        """
+        Resolve a room reference ("ARC_103", "ARC 103" or "arc 103") to its room key.
+        Returns None if the room is not in the index.
+        """
+        if not room:
+            return None
+
+        room = room.strip()
+        if room in self.rooms:
+            return room
+
+        parts = room.replace('_', ' ').split(None, 1)
+        if len(parts) != 2:
+            return None
+
+        room_key = self.room_key(parts[0].upper(), parts[1].strip())
+        return room_key if room_key in self.rooms else None
+
+    def iter_busy_intervals(self) -> Iterator[Tuple[str, str, int, int]]:
+        """Iterate over every merged busy interval as (room_key, day, start, end)."""
+        for room_key, days in self._starts.items():
+            for day, starts in days.items():
+                for start, end in zip(starts, self._ends[room_key][day]):
+                    yield room_key, day, start, end
+
+    def get_busy_intervals(self, room_key: str, day: str) -> List[Tuple[int, int]]:
+        """Get the merged busy intervals (in minutes) for a room on a given day."""
+        starts = self._starts.get(room_key, {}).get(day, [])
+        ends = self._ends.get(room_key, {}).get(day, [])
+        return list(zip(starts, ends))
+
+    def is_available(self, room_key: str, day: str, start: int, end: int) -> bool:
+        """
+        Check if a room is free for the whole [start, end) range on a given day.
+        Times are minutes after midnight.
+        """
+        ends = self._ends.get(room_key, {}).get(day)
+        if not ends:
+            return True
+
+        # First busy interval that ends after our start is the only one that can overlap
+        position = bisect.bisect_right(ends, start)
+        return position == len(ends) or self._starts[room_key][day][position] >= end
+
+    def available_rooms(self, day: str, start: int, end: int,
+                        room_keys: Optional[List[str]] = None) -> List[str]:
+        """Get the keys of all rooms (or of the given rooms) free for [start, end) on a day."""
+        if room_keys is None:
+            room_keys = self.rooms.keys()
+        return [room_key for room_key in room_keys if self.is_available(room_key, day, start, end)]
+
+    def next_free_slot(self, room_key: str, day: str, after: int, duration: int,
+                       day_start: int = SLOT_SEARCH_START, day_end: int = SLOT_SEARCH_END) -> Optional[Dict]:
+        """
+        Find the first free slot of at least `duration` minutes in a room, starting
+        at `after` minutes on `day` and moving on to the following days of the week.
+
+        Returns a dictionary describing the slot, or None if nothing is free within a week.
+        """
+        if day in DAYS_OF_WEEK:
+            first_day = DAYS_OF_WEEK.index(day)
+            days = [DAYS_OF_WEEK[(first_day + offset) % 7] for offset in range(7)]
+        else:
+            days = [day]
+
+        for offset, current_day in enumerate(days):
+            cursor = max(after, day_start) if offset == 0 else day_start
+
+            for busy_start, busy_end in self.get_busy_intervals(room_key, current_day):
+                if busy_end <= cursor:
+                    continue
+                if busy_start >= day_end:
+                    break
+                if busy_start - cursor >= duration:
+                    return self._format_slot(current_day, cursor, busy_start)
+                cursor = max(cursor, busy_end)
+
+            if day_end - cursor >= duration:
+                return self._format_slot(current_day, cursor, day_end)
+
+        return None
+
+    @staticmethod
+    def _format_slot(day: str, start: int, end: int) -> Dict:
+        """Describe a free slot the same way the API describes time ranges."""
+        return {
+            'day': day,
+            'start_time': format_minutes(start),
+            'end_time': format_minutes(end),
+            'free_minutes': end - start
+        }
+
+
+class BuildingGrid:
+    """
+    Uniform grid over building coordinates.
+
+    Buildings are yielded nearest-first by scanning the occupied cells ring by ring outward
+    from the query point, so nearest-room queries only look at the buildings they need.
+    """
+
+    METERS_PER_DEGREE_LAT = 111320.0
+
+    def __init__(self, coordinates: Dict[str, Dict[str, float]], cell_meters: float = 250.0):
+        """
+        Build the grid from a {building code: {"lat", "lng"}} mapping.
+        """
+        self.coordinates = coordinates
+        self.cell_meters = cell_meters
+        self.cells = {}  # (row, column) -> building codes
+
+        reference_lat = (sum(c['lat'] for c in coordinates.values()) / len(coordinates)) if coordinates else 0.0
+        self._lat_step = cell_meters / self.METERS_PER_DEGREE_LAT
+        self._lng_step = cell_meters / (self.METERS_PER_DEGREE_LAT * max(math.cos(math.radians(reference_lat)), 0.01))
+
+        for building, coordinate in coordinates.items():
+            self.cells.setdefault(self._cell(coordinate['lat'], coordinate['lng']), []).append(building)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        """Get the grid cell containing a point."""
+        return math.floor(lat / self._lat_step), math.floor(lng / self._lng_step)
+
+    def iter_nearest(self, lat: float, lng: float,
+                     max_distance: Optional[float] = None) -> Iterator[Tuple[float, str]]:
+        """
+        Yield (distance in meters, building code) pairs in increasing distance from a point.
+        Stops once buildings are farther than `max_distance` meters, if given.
+        """
+        if not self.cells:
+            return
+
+        # Group the occupied cells into rings (Chebyshev distance in cells from the query cell),
+        # so only occupied cells are scanned however far the point is from campus
+        row, column = self._cell(lat, lng)
+        rings = {}
+        for cell in self.cells:
+            radius = max(abs(cell[0] - row), abs(cell[1] - column))
+            rings.setdefault(radius, []).append(cell)
+        candidates = []
+
+        if min(rings) > MAX_RING_SCAN_CELLS:
+            for distance, building in sorted(
+                    (haversine_meters(lat, lng, coordinate['lat'], coordinate['lng']), building)
+                    for building, coordinate in self.coordinates.items()):
+                if max_distance is not None and distance > max_distance:
+                    return
+                yield distance, building
+            return
+
+        for radius in sorted(rings):
+            for cell in rings[radius]:
+                for building in self.cells[cell]:
+                    coordinate = self.coordinates[building]
+                    distance = haversine_meters(lat, lng, coordinate['lat'], coordinate['lng'])
+                    heapq.heappush(candidates, (distance, building))
+
+            # Every building not seen yet is at least `radius` full cells away
+            bound = radius * self.cell_meters
+            while candidates and candidates[0][0] <= bound:
+                distance, building = heapq.heappop(candidates)
+                if max_distance is not None and distance > max_distance:
+                    return
+                yield distance, building
+
+            if max_distance is not None and bound > max_distance:
+                return
+
+        while candidates:
+            distance, building = heapq.heappop(candidates)
+            if max_distance is not None and distance > max_distance:
+                return
+            yield distance, building
+
+
+def parse_time_window(window: Dict) -> Tuple[str, int, int]:
+    """
+    Validate a {"day", "start_time", "end_time"} window and convert it to
+    (day name, start minutes, end minutes).
+
+    Raises ValueError if the window is malformed.
+    """
+    if not isinstance(window, dict):
+        raise ValueError("Each window must be an object with day, start_time and end_time")
+
+    day = normalize_day(str(window.get('day', '')))
+    start = parse_time_to_minutes(str(window.get('start_time', '')))
+    end = parse_time_to_minutes(str(window.get('end_time', '')))
+
+    if not day:
+        raise ValueError(f"Invalid day: {window.get('day')!r}")
+    if start is None or end is None:
+        raise ValueError(f"Invalid time range: {window.get('start_time')!r} - {window.get('end_time')!r}")
+    if end <= start:
+        raise ValueError("end_time must be after start_time")
+
+    return day, start, end
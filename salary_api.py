@@ -1,11 +1,48 @@
 import os
 import json
 import csv
+import bisect
+import hashlib
+import logging
+import pickle
+import threading
+from rapidfuzz import fuzz, process
+from salary_columns import SalaryColumns
 from utils.name_utils import (
     normalize_text,
     convert_last_first_to_first_last,
     extract_name_components
 )
+from utils.metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on sorted keys scanned per autocomplete request, so short prefixes stay cheap
+SUGGEST_SCAN_LIMIT = 500
+
+# Minimum fuzzy score for typo-tolerant autocomplete matches
+SUGGEST_FUZZY_THRESHOLD = 75
+
+# Bump when the cached structures change shape, so stale caches are rebuilt
+SALARY_CACHE_FORMAT = 1
+
+# Loaded state stored in the on-disk salary cache
+SALARY_CACHE_ATTRIBUTES = (
+    "_salaries", "_columns", "name_index", "token_index", "suggest_keys", "suggest_positions"
+)
+
+
+def format_salary_entry(entry):
+    """Format a salary row the way the salary API returns it."""
+    return {
+        "name": entry.get("Name", "Unknown"),
+        "title": entry.get("Title", "Unknown"),
+        "department": entry.get("Department", "Unknown"),
+        "campus": entry.get("Campus", "Unknown"),
+        "base_pay": entry.get("Base Pay", "Unknown"),
+        "gross_pay": entry.get("Gross Pay", "Unknown"),
+        "hire_date": entry.get("Hire Date", "Unknown")
+    }
 
 class SalaryData:
     """Handles loading and retrieving Rutgers instructor salaries."""
@@ -14,7 +51,129 @@ class SalaryData:
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.csv_path = os.path.join(base_dir, "rutgers_salaries.csv")
         self.json_path = os.path.join(base_dir, "rutgers_salaries.json")
-        self.salaries = self._load_salaries()
+        self.cache_path = os.path.join(base_dir, "rutgers_salaries.cache")
+        self._version = 0
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def salaries(self):
+        """The salary rows, loaded on first use."""
+        self._ensure_loaded()
+        return self._salaries
+
+    @property
+    def columns(self):
+        """The typed column view of the salary rows, loaded on first use."""
+        self._ensure_loaded()
+        return self._columns
+
+    @property
+    def version(self):
+        """Bumped every time the salary data is (re)loaded."""
+        self._ensure_loaded()
+        return self._version
+
+    @property
+    def loaded(self):
+        """Whether the salary data has been loaded (checking never loads it)."""
+        return self._loaded
+
+    def _ensure_loaded(self):
+        """Load the salary data the first time it is needed."""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+
+    def reload(self):
+        """(Re)load the salary data and rebuild its indexes."""
+        with self._load_lock:
+            self._load()
+
+    @stage("salary_load")
+    def _load(self):
+        """Load the parsed and indexed salary data from the cache, or from the source file if it changed."""
+        source_path = self.csv_path if os.path.exists(self.csv_path) else self.json_path
+        if not self._load_cache(source_path):
+            self._salaries = self._load_salaries()
+            self._build_indexes()
+            self._columns = SalaryColumns(self._salaries)
+            if self._salaries:
+                self._write_cache(source_path)
+        self._version += 1
+        self._loaded = True
+
+    @staticmethod
+    def _source_stat(source_path):
+        """Cheap fingerprint (mtime, size) of the salary source file."""
+        stat = os.stat(source_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _source_hash(source_path):
+        """SHA-256 of the salary source file."""
+        digest = hashlib.sha256()
+        with open(source_path, "rb") as source:
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_cache(self, source_path):
+        """
+        Restore the salary rows, indexes and columns from the on-disk cache.
+
+        The cache is used when the source file's mtime and size match; otherwise the
+        file is hashed and the cache is still used (and re-stamped) if the content is unchanged.
+        Returns False if there is no usable cache.
+        """
+        if not os.path.exists(source_path) or not os.path.exists(self.cache_path):
+            return False
+
+        try:
+            with open(self.cache_path, "rb") as cache_file:
+                cache = pickle.load(cache_file)
+            if cache.get("format") != SALARY_CACHE_FORMAT or cache.get("source") != os.path.basename(source_path):
+                return False
+
+            restamp = False
+            if cache["stat"] != self._source_stat(source_path):
+                if cache["sha256"] != self._source_hash(source_path):
+                    logger.info("Salary source changed, rebuilding the salary cache")
+                    return False
+                restamp = True
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable salary cache: {str(e)}")
+            return False
+
+        for attribute in SALARY_CACHE_ATTRIBUTES:
+            setattr(self, attribute, cache[attribute])
+        if restamp:
+            self._write_cache(source_path, cache["sha256"])
+        logger.debug("Loaded %d salary rows from %s", len(self._salaries), self.cache_path)
+        return True
+
+    def _write_cache(self, source_path, source_hash=None):
+        """Write the parsed and indexed salary data to the on-disk cache."""
+        cache = {
+            "format": SALARY_CACHE_FORMAT,
+            "source": os.path.basename(source_path),
+            "stat": self._source_stat(source_path),
+            "sha256": source_hash or self._source_hash(source_path),
+        }
+        for attribute in SALARY_CACHE_ATTRIBUTES:
+            cache[attribute] = getattr(self, attribute)
+
+        # Write to a temporary file first so other workers never read a partial cache
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as cache_file:
+                pickle.dump(cache, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write salary cache: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
     def _load_salaries(self):
         """Loads salary data from CSV or JSON."""
@@ -41,70 +200,178 @@ class SalaryData:
 
         return []
 
+    def _build_indexes(self):
+        """
+        Build the lookup indexes used by get_salary_by_instructor.
+
+        - name_index: normalized full name ("first last" and "last, first") -> row positions
+        - token_index: normalized name token -> row positions
+        - suggest_keys/suggest_positions: sorted autocomplete keys (the full name, the
+          "last, first" form and every suffix starting at a word) and the row each belongs to
+        """
+        self.name_index = {}
+        self.token_index = {}
+        suggestions = {}
+
+        for position, entry in enumerate(self._salaries):
+            normalized = normalize_text(entry.get("Name", ""))
+            self.name_index.setdefault(normalized, []).append(position)
+
+            tokens = normalized.split()
+            if len(tokens) >= 2:
+                last_first = f"{tokens[-1]}, {' '.join(tokens[:-1])}"
+                self.name_index.setdefault(last_first, []).append(position)
+
+            for token in dict.fromkeys(tokens):
+                self.token_index.setdefault(token, []).append(position)
+
+            if tokens and " ".join(tokens) not in suggestions:
+                suggestions[" ".join(tokens)] = position
+                if len(tokens) >= 2:
+                    suggestions.setdefault(last_first, position)
+                for start in range(1, len(tokens)):
+                    suggestions.setdefault(" ".join(tokens[start:]), position)
+
+        suggest_items = sorted(suggestions.items())
+        self.suggest_keys = [key for key, _ in suggest_items]
+        self.suggest_positions = [position for _, position in suggest_items]
+
+    @stage("salary_suggest")
+    def suggest_names(self, query, limit=8):
+        """
+        Autocomplete instructor names from the start of any word, e.g. "joh", "smith, j" or "ann smi".
+
+        Falls back to fuzzy matching on key prefixes sharing the query's first letter when there
+        are fewer than `limit` prefix matches, to tolerate typos.
+        Returns up to `limit` salary rows, one per distinct name.
+        """
+        query = " ".join(normalize_text(query or "").split())
+        if not query or limit <= 0:
+            return []
+        self._ensure_loaded()
+
+        positions = []
+        seen_names = set()
+
+        def add(position):
+            name = normalize_text(self.salaries[position].get("Name", ""))
+            if name not in seen_names:
+                seen_names.add(name)
+                positions.append(position)
+
+        # Prefix matches: a contiguous run of the sorted keys
+        start = bisect.bisect_left(self.suggest_keys, query)
+        end = min(start + SUGGEST_SCAN_LIMIT, len(self.suggest_keys))
+        for i in range(start, end):
+            if not self.suggest_keys[i].startswith(query) or len(positions) >= limit:
+                break
+            add(self.suggest_positions[i])
+
+        # Typo-tolerant matches among keys starting with the same letter
+        if len(positions) < limit and len(query) >= 3:
+            first = bisect.bisect_left(self.suggest_keys, query[0])
+            last = bisect.bisect_left(self.suggest_keys, chr(ord(query[0]) + 1))
+            candidates = {i: self.suggest_keys[i][:len(query) + 1] for i in range(first, last)}
+            for _, score, i in process.extract(query, candidates, scorer=fuzz.ratio,
+                                               limit=limit * 4, score_cutoff=SUGGEST_FUZZY_THRESHOLD):
+                if len(positions) >= limit:
+                    break
+                add(self.suggest_positions[i])
+
+        return [self.salaries[position] for position in positions]
+
     def get_all_salaries(self):
         """Returns all salaries."""
         return self.salaries
 
+    def _exact_matches(self, names):
+        """Rows whose normalized Name is one of the given normalized names, in file order."""
+        positions = set()
+        for name in names:
+            positions.update(self.name_index.get(name, []))
+        return [
+            self.salaries[position] for position in sorted(positions)
+            if normalize_text(self.salaries[position].get("Name", "")) in names
+        ]
+
+    def _token_matches(self, token):
+        """Rows whose normalized Name contains the given word, in file order."""
+        return [self.salaries[position] for position in self.token_index.get(token, [])]
+
+    @stage("salary_match")
     def get_salary_by_instructor(self, name):
         """Search for an instructor's salary by name, handling different name formats, including partial matches."""
+        _, results = self.match_instructor(name)
+        return results
+
+    def match_instructor(self, name):
+        """
+        Search for an instructor's salary rows by name.
+
+        Returns a (match type, rows) tuple, where match type is "exact", "component" or
+        "single_word" depending on which search found the rows, or (None, None) if nothing matched.
+        """
+        self._ensure_loaded()
 
         normalized_name = normalize_text(name)
         converted_name = normalize_text(convert_last_first_to_first_last(name))
         name_components = extract_name_components(name)
         
-        print(f"🔎 Searching for: {normalized_name} OR {converted_name}")
+        logger.debug("Searching for: %s OR %s", normalized_name, converted_name)
 
         # First: Exact match search
-        results = [
-            entry for entry in self.salaries
-            if normalize_text(entry.get("Name", "")) in [normalized_name, converted_name]
-        ]
+        results = self._exact_matches([normalized_name, converted_name])
 
         if results:
-            print(f"✅ Found exact match: {results[0]}")
-            return results  # Return immediately if a match is found
+            logger.debug("Found exact match: %s", results[0])
+            return "exact", results  # Return immediately if a match is found
 
-        print("No exact match found! Performing component search...")  
+        logger.debug("No exact match found! Performing component search...")
         
         # Second: Search by name components (both first name and last name)
         if len(name_components) >= 1:
-            print(f"👓 Searching by components: {name_components}")
+            logger.debug("Searching by components: %s", name_components)
             all_matches = []
             
             for component in name_components:
                 if len(component) >= 3:  # Only use components with at least 3 characters
-                    component = normalize_text(component)
-                    matches = [
-                        entry for entry in self.salaries
-                        if component in normalize_text(entry.get("Name", "")).split()
-                    ]
-                    all_matches.extend(matches)
+                    all_matches.extend(self._token_matches(normalize_text(component)))
             
             # Remove duplicates by converting to a dict and back to a list
             unique_matches = list({entry.get("Name", ""): entry for entry in all_matches}.values())
             
             if unique_matches:
                 if len(unique_matches) == 1:
-                    print(f"✅ Found unique component match: {unique_matches[0]}")
-                    return unique_matches
+                    logger.debug("Found unique component match: %s", unique_matches[0])
+                    return "component", unique_matches
                 else:
                     # If multiple matches, try to find the closest one
-                    print(f"⚠️ Found multiple matches ({len(unique_matches)}), using first match")
-                    return [unique_matches[0]]
+                    logger.debug("Found multiple matches (%d), using first match", len(unique_matches))
+                    return "component", [unique_matches[0]]
         
         # Third: As a last resort, try a single-word search
         if " " not in normalized_name:
-            results = [
-                entry for entry in self.salaries
-                if normalized_name in normalize_text(entry.get("Name", "")).split()
-            ]
+            results = self._token_matches(normalized_name)
 
             if results:
-                print(f"✅ Found single-word match: {results[0]}")
-                return results
-
-        print("⚠️ No match found!")
-        return None
+                logger.debug("Found single-word match: %s", results[0])
+                return "single_word", results
 
+        logger.debug("No match found!")
+        return None, None
 
+    @stage("salary_match")
+    def match_instructors(self, names):
+        """
+        Resolve many instructor names in one pass.
 
+        Returns a dictionary mapping each distinct name to a (match type, first matching row) tuple,
+        with (None, None) for names that did not match.
+        """
+        matches = {}
+        for name in names:
+            if name in matches:
+                continue
+            match_type, results = self.match_instructor(name)
+            matches[name] = (match_type, results[0] if results else None)
+        return matches
@@ -0,0 +1,161 @@
+from datetime import date
+from typing import Dict, List, Optional
+import numpy as np
+
+# Columns that can be grouped on, mapped to the salary CSV field they come from
+GROUP_FIELDS = {
+    "department": "Department",
+    "campus": "Campus",
+    "title": "Title",
+}
+
+# Columns that can be aggregated, mapped to the salary CSV field they come from
+METRIC_FIELDS = {
+    "base_pay": "Base Pay",
+    "gross_pay": "Gross Pay",
+}
+
+# Percentiles reported for every group
+PERCENTILES = (25, 50, 75, 90)
+
+
+def parse_cents(value: str) -> int:
+    """Convert a pay string like "$550,000" or "$1,234.50" to integer cents, or -1 if missing."""
+    cleaned = (value or "").replace("$", "").replace(",", "").strip()
+    if not cleaned:
+        return -1
+    try:
+        return int(round(float(cleaned) * 100))
+    except ValueError:
+        return -1
+
+
+def parse_date_ordinal(value: str) -> int:
+    """Convert a date like "3/21/2016" to its proleptic Gregorian ordinal, or 0 if missing."""
+    try:
+        month, day, year = (int(part) for part in (value or "").split("/"))
+        return date(year, month, day).toordinal()
+    except ValueError:
+        return 0
+
+
+class SalaryColumns:
+    """
+    Typed, array-backed view of the salary rows.
+
+    Pay is stored as integer cents, hire dates as ordinals and department, campus and
+    title as integer codes into sorted category lists, so aggregate questions are answered
+    with numpy operations instead of a Python pass with string parsing.
+    Row positions match the SalaryData row list.
+    """
+
+    def __init__(self, salaries: List[Dict]):
+        """Build the columns from the salary rows."""
+        self.metrics = {
+            metric: np.array([parse_cents(entry.get(field, "")) for entry in salaries], dtype=np.int64)
+            for metric, field in METRIC_FIELDS.items()
+        }
+        self.hire_ordinals = np.array(
+            [parse_date_ordinal(entry.get("Hire Date", "")) for entry in salaries], dtype=np.int32
+        )
+
+        self.categories = {}  # group_by -> sorted category names
+        self.codes = {}       # group_by -> category code per row
+        for group_by, field in GROUP_FIELDS.items():
+            values = np.array([entry.get(field, "") or "Unknown" for entry in salaries], dtype=object).astype(str)
+            names, codes = np.unique(values, return_inverse=True)
+            self.categories[group_by] = names.tolist()
+            self.codes[group_by] = codes.astype(np.int32)
+
+        self._category_positions = {
+            group_by: {name.lower(): code for code, name in enumerate(names)}
+            for group_by, names in self.categories.items()
+        }
+        self._aggregates = {}  # (group_by, metric) -> cached aggregate rows
+
+    def __len__(self):
+        return len(self.hire_ordinals)
+
+    def find_category(self, group_by: str, name: str) -> Optional[int]:
+        """Get the code of a category by name (case-insensitive), or None if unknown."""
+        return self._category_positions[group_by].get((name or "").strip().lower())
+
+    def aggregate(self, group_by: str, metric: str) -> List[Dict]:
+        """
+        Get count, mean, min, max and percentiles of a pay metric for every category of a column.
+        Rows without a value for the metric are left out. Results are cached per load.
+        """
+        cache_key = (group_by, metric)
+        if cache_key in self._aggregates:
+            return self._aggregates[cache_key]
+
+        values = self.metrics[metric]
+        valid = values >= 0
+        codes = self.codes[group_by][valid]
+        values = values[valid]
+        if not len(values):
+            self._aggregates[cache_key] = []
+            return []
+
+        # Sort by category, then value, so each category is a contiguous sorted run
+        group_count = len(self.categories[group_by])
+        sorted_values = values[np.lexsort((values, codes))]
+        counts = np.bincount(codes, minlength=group_count)
+        starts = np.cumsum(counts) - counts
+        totals = np.bincount(codes, weights=values, minlength=group_count)
+
+        # Empty categories point at row 0; they are skipped below
+        present = counts > 0
+        last_offsets = np.maximum(counts - 1, 0)
+        percentiles = {}
+        for percentile in PERCENTILES:
+            position = last_offsets * (percentile / 100.0)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            lower_values = sorted_values[np.where(present, starts + lower, 0)]
+            upper_values = sorted_values[np.where(present, starts + upper, 0)]
+            percentiles[percentile] = lower_values + (upper_values - lower_values) * (position - lower)
+
+        minimums = sorted_values[np.where(present, starts, 0)]
+        maximums = sorted_values[np.where(present, starts + last_offsets, 0)]
+
+        results = []
+        for code in np.nonzero(present)[0]:
+            results.append({
+                "name": self.categories[group_by][code],
+                "count": int(counts[code]),
+                "mean": round(float(totals[code]) / int(counts[code]) / 100, 2),
+                "median": round(float(percentiles[50][code]) / 100, 2),
+                "percentiles": {
+                    f"p{percentile}": round(float(percentiles[percentile][code]) / 100, 2)
+                    for percentile in PERCENTILES
+                },
+                "min": round(float(minimums[code]) / 100, 2),
+                "max": round(float(maximums[code]) / 100, 2),
+            })
+
+        self._aggregates[cache_key] = results
+        return results
+
+    def top_rows(self, metric: str, limit: int = 10, group_by: Optional[str] = None,
+                 code: Optional[int] = None, hired_after: Optional[date] = None) -> List[int]:
+        """
+        Get the positions of the highest-paid rows for a metric, optionally within one
+        category and/or limited to people hired after a date (none for a limit below 1).
+        """
+        if limit < 1:
+            return []
+        values = self.metrics[metric]
+        mask = values >= 0
+        if group_by is not None and code is not None:
+            mask &= self.codes[group_by] == code
+        if hired_after is not None:
+            mask &= self.hire_ordinals > hired_after.toordinal()
+        candidates = np.nonzero(mask)[0]
+
+        if limit < len(candidates):
+            # Partial selection first, then sort just the top slice
+            top = candidates[np.argpartition(-values[candidates], limit)[:limit]]
+        else:
+            top = candidates
+        return top[np.argsort(-values[top], kind="stable")].tolist()
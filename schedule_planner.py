@@ -0,0 +1,305 @@
+import heapq
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Tuple
+from course_index import CourseIndex, time_mask
+from utils.constants import DAYS_OF_WEEK
+from utils.time_utils import parse_time_to_minutes, format_minutes, normalize_day
+
+# Largest number of courses a single schedule request may combine
+MAX_SCHEDULE_COURSES = 12
+
+# Number of ranked schedules returned when the caller doesn't ask for a specific count
+DEFAULT_SCHEDULE_LIMIT = 20
+MAX_SCHEDULE_LIMIT = 100
+
+# Upper bound on search tree nodes visited per request, so large requests stay interactive
+SEARCH_NODE_BUDGET = 50000
+
+# Ranking weights, in minutes of idle time one unit is worth
+CAMPUS_CHANGE_PENALTY = 45
+CAMPUS_DAY_PENALTY = 60
+
+
+def parse_schedule_constraints(constraints: Optional[Dict]) -> Dict:
+    """
+    Validate the constraints of a schedule request.
+
+    Accepts {"exclude_days": ["F", ...], "earliest_start": "10:00 AM", "latest_end": "6:00 PM",
+    "campuses": ["Busch", ...], "open_only": true}; every key is optional.
+
+    Raises ValueError if a constraint is malformed.
+    """
+    constraints = constraints or {}
+    if not isinstance(constraints, dict):
+        raise ValueError("constraints must be an object")
+
+    exclude_days = []
+    for day in constraints.get('exclude_days') or []:
+        day_name = normalize_day(str(day))
+        if not day_name:
+            raise ValueError(f"Invalid day: {day!r}")
+        exclude_days.append(day_name)
+
+    parsed = {'exclude_days': exclude_days, 'earliest_start': None, 'latest_end': None}
+    for key in ('earliest_start', 'latest_end'):
+        value = constraints.get(key)
+        if value:
+            parsed[key] = parse_time_to_minutes(str(value))
+            if parsed[key] is None:
+                raise ValueError(f"Invalid {key}: {value!r}")
+    if parsed['earliest_start'] is not None and parsed['latest_end'] is not None \
+            and parsed['latest_end'] <= parsed['earliest_start']:
+        raise ValueError("latest_end must be after earliest_start")
+
+    campuses = constraints.get('campuses') or []
+    if not isinstance(campuses, list):
+        raise ValueError("campuses must be a list")
+    parsed['campuses'] = {str(campus).strip().lower() for campus in campuses if str(campus).strip()}
+    parsed['open_only'] = bool(constraints.get('open_only', False))
+    return parsed
+
+
+def find_conflicts(course_index: CourseIndex, indexes: List[str]) -> Dict:
+    """
+    Find every pair of sections (by index number) whose meetings overlap.
+
+    Pairs are screened with one AND of their weekly bitmasks; only pairs sharing a
+    slot have their meetings compared to report the exact overlapping times.
+    Returns {"conflicts": [...], "unknown_indexes": [...]}.
+    """
+    known = []
+    unknown = []
+    for index in dict.fromkeys(str(index).strip() for index in indexes):
+        (known if index in course_index.section_masks else unknown).append(index)
+
+    conflicts = []
+    masks = course_index.section_masks
+    for first, second in combinations(known, 2):
+        if not masks[first] & masks[second]:
+            continue
+        overlaps = []
+        for day_position, start, end, _ in course_index.section_meetings[first]:
+            for other_day, other_start, other_end, _ in course_index.section_meetings[second]:
+                if day_position == other_day and start < other_end and other_start < end:
+                    overlaps.append({
+                        'day': DAYS_OF_WEEK[day_position],
+                        'start_time': format_minutes(max(start, other_start)),
+                        'end_time': format_minutes(min(end, other_end))
+                    })
+        if overlaps:
+            conflicts.append({
+                'sections': [first, second],
+                'courses': [course_index.find_section(first)[0].get('courseString', ''),
+                            course_index.find_section(second)[0].get('courseString', '')],
+                'overlaps': overlaps
+            })
+    return {'conflicts': conflicts, 'unknown_indexes': unknown}
+
+
+class SchedulePlanner:
+    """
+    Enumerates conflict-free section combinations for a set of courses.
+
+    Each section is a weekly time bitmask from the CourseIndex, so conflict checks are
+    integer ANDs. Sections with identical meetings are merged into one option, the search
+    always branches on the course with the fewest options left, and after every choice the
+    remaining courses' options are filtered against the used time (forward checking), so
+    dead ends are cut as soon as any course runs out of options. Branches that already
+    span more days than the worst kept schedule can justify are skipped.
+    """
+
+    def __init__(self, course_index: CourseIndex, course_strings: List[str], constraints: Dict):
+        """
+        Collect the options of every requested course under the given (parsed) constraints.
+
+        Raises ValueError if a course is not offered in the snapshot.
+        """
+        self.course_index = course_index
+        self.constraints = constraints
+        self.blocked_mask = self._blocked_mask(constraints)
+        self.courses = []        # {"courseString", "title", "options": [...]} per requested course
+        self.unschedulable = []  # courseStrings with no section satisfying the constraints
+
+        unknown = []
+        for course_string in dict.fromkeys(course_strings):
+            matches = course_index.find_courses(course_string)
+            if not matches:
+                unknown.append(course_string)
+                continue
+            course = {
+                'courseString': matches[0].get('courseString', course_string),
+                'title': matches[0].get('title', ''),
+                'options': self._course_options(matches)
+            }
+            if not course['options']:
+                self.unschedulable.append(course['courseString'])
+            self.courses.append(course)
+
+        if unknown:
+            raise ValueError(f"Unknown courses: {', '.join(unknown)}")
+
+    @staticmethod
+    def _blocked_mask(constraints: Dict) -> int:
+        """Bitmask of the weekly time excluded by the day and time-of-day constraints."""
+        blocked = 0
+        for day_position, day in enumerate(DAYS_OF_WEEK):
+            if day in constraints['exclude_days']:
+                blocked |= time_mask(day_position, 0, 24 * 60)
+                continue
+            if constraints['earliest_start'] is not None and constraints['earliest_start'] > 0:
+                blocked |= time_mask(day_position, 0, constraints['earliest_start'])
+            if constraints['latest_end'] is not None and constraints['latest_end'] < 24 * 60:
+                blocked |= time_mask(day_position, constraints['latest_end'], 24 * 60)
+        return blocked
+
+    def _course_options(self, courses: List[Dict]) -> List[Dict]:
+        """
+        Get the allowed sections of a course, merged into options by identical meetings.
+        Each option has the combined mask, the meetings and every equivalent section.
+        """
+        options = {}
+        for course in courses:
+            for section in course.get('sections', []) or []:
+                index = str(section.get('index', '') or '').strip()
+                if index not in self.course_index.section_masks:
+                    continue
+                if self.constraints['open_only'] and (section.get('openStatusText', '') or '').upper() != 'OPEN':
+                    continue
+
+                mask = self.course_index.section_masks[index]
+                meetings = self.course_index.section_meetings[index]
+                if mask & self.blocked_mask:
+                    continue
+                campuses = self.constraints['campuses']
+                if campuses and any(campus and campus.lower() not in campuses for *_, campus in meetings):
+                    continue
+
+                key = (mask, tuple(campus for *_, campus in meetings))
+                option = options.setdefault(key, {
+                    'mask': mask,
+                    'days': sum(1 << day_position for day_position in {meeting[0] for meeting in meetings}),
+                    'meetings': meetings,
+                    'sections': []
+                })
+                option['sections'].append({
+                    'index': index,
+                    'number': section.get('number', ''),
+                    'status': section.get('openStatusText', ''),
+                    'instructors': [instructor.get('name', '') for instructor in section.get('instructors', []) or []]
+                })
+        return list(options.values())
+
+    def search(self, limit: int = DEFAULT_SCHEDULE_LIMIT,
+               node_budget: int = SEARCH_NODE_BUDGET) -> Tuple[List[Dict], Dict]:
+        """
+        Find the best `limit` conflict-free schedules, visiting at most `node_budget` search nodes.
+
+        Returns (ranked schedules, search statistics).
+        """
+        stats = {'nodes': 0, 'schedules_found': 0, 'truncated': False}
+        best = []  # max-heap on score (negated) of the best schedules so far
+        if not self.courses or self.unschedulable:
+            return [], stats
+
+        def visit(used: int, used_days: int, chosen: List[Tuple[int, Dict]], domains: Dict[int, List[Dict]]):
+            if stats['nodes'] >= node_budget:
+                stats['truncated'] = True
+                return
+            stats['nodes'] += 1
+
+            # Days on campus only grow as sections are added, so they bound the final score
+            if len(best) == limit and CAMPUS_DAY_PENALTY * used_days.bit_count() >= -best[0][0]:
+                return
+
+            if not domains:
+                stats['schedules_found'] += 1
+                metrics = self._schedule_metrics([option for _, option in chosen])
+                entry = (-metrics['score'], stats['schedules_found'], list(chosen), metrics)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry[0] > best[0][0]:
+                    heapq.heapreplace(best, entry)
+                return
+
+            # Branch on the course with the fewest options left; try options adding the fewest new days first
+            course_position = min(domains, key=lambda position: len(domains[position]))
+            options = sorted(domains[course_position], key=lambda option: (option['days'] & ~used_days).bit_count())
+            remaining = {position: domain for position, domain in domains.items() if position != course_position}
+
+            for option in options:
+                now_used = used | option['mask']
+                narrowed = {}
+                for position, domain in remaining.items():
+                    narrowed[position] = [candidate for candidate in domain if not candidate['mask'] & now_used]
+                    if not narrowed[position]:
+                        break
+                else:
+                    chosen.append((course_position, option))
+                    visit(now_used, used_days | option['days'], chosen, narrowed)
+                    chosen.pop()
+                if stats['truncated']:
+                    return
+
+        visit(0, 0, [], {position: course['options'] for position, course in enumerate(self.courses)})
+
+        ranked = sorted(best, key=lambda entry: (-entry[0], entry[1]))
+        return [self._format_schedule(chosen, metrics) for _, _, chosen, metrics in ranked], stats
+
+    @staticmethod
+    def _schedule_metrics(options: List[Dict]) -> Dict:
+        """Score a schedule: idle minutes between classes, campus changes within a day and days on campus."""
+        meetings_by_day = {}
+        for option in options:
+            for day_position, start, end, campus in option['meetings']:
+                meetings_by_day.setdefault(day_position, []).append((start, end, campus))
+
+        gap_minutes = 0
+        campus_changes = 0
+        earliest_start = None
+        latest_end = None
+        for meetings in meetings_by_day.values():
+            meetings.sort()
+            busy_until = meetings[0][1]
+            previous_campus = meetings[0][2]
+            for start, end, campus in meetings[1:]:
+                if start > busy_until:
+                    gap_minutes += start - busy_until
+                busy_until = max(busy_until, end)
+                if campus:
+                    if previous_campus and campus != previous_campus:
+                        campus_changes += 1
+                    previous_campus = campus
+            earliest_start = meetings[0][0] if earliest_start is None else min(earliest_start, meetings[0][0])
+            latest_end = busy_until if latest_end is None else max(latest_end, busy_until)
+
+        days = len(meetings_by_day)
+        return {
+            'score': gap_minutes + CAMPUS_CHANGE_PENALTY * campus_changes + CAMPUS_DAY_PENALTY * days,
+            'days_on_campus': days,
+            'gap_minutes': gap_minutes,
+            'campus_changes': campus_changes,
+            'earliest_start': format_minutes(earliest_start) if earliest_start is not None else None,
+            'latest_end': format_minutes(latest_end) if latest_end is not None else None
+        }
+
+    def _format_schedule(self, chosen: List[Tuple[int, Dict]], metrics: Dict) -> Dict:
+        """Describe a schedule: one section per course (plus its equivalent sections) and its metrics."""
+        sections = []
+        for course_position, option in sorted(chosen, key=lambda item: item[0]):
+            course = self.courses[course_position]
+            first, *equivalent = option['sections']
+            sections.append(dict(
+                first,
+                courseString=course['courseString'],
+                title=course['title'],
+                equivalent_indexes=[section['index'] for section in equivalent]
+            ))
+        return {'sections': sections, 'metrics': metrics}
+
+    def iter_results(self, limit: int = DEFAULT_SCHEDULE_LIMIT,
+                     node_budget: int = SEARCH_NODE_BUDGET) -> Iterator[Dict]:
+        """Yield ranked schedules one by one, then a summary record with the search statistics."""
+        schedules, stats = self.search(limit, node_budget)
+        for rank, schedule in enumerate(schedules, start=1):
+            yield {'type': 'schedule', 'rank': rank, **schedule}
+        yield {'type': 'summary', 'returned': len(schedules), 'unschedulable': self.unschedulable, **stats}
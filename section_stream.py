@@ -0,0 +1,207 @@
+import json
+import logging
+import sys
+import threading
+from collections import deque
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Open streams accepted per process: each one holds a greenlet under gevent, but a whole worker
+# thread under the development server or gunicorn's sync/gthread workers
+MAX_SUBSCRIBERS = 2000
+MAX_THREADED_SUBSCRIBERS = 50
+
+# Events buffered for a slow subscriber before it is told to resync instead
+MAX_PENDING_EVENTS = 1000
+
+# (event name, event id, data) as sent to a subscriber. Only version events carry an id (the
+# version's change feed cursor), and a version's event comes after its status events, so a
+# reconnecting client's Last-Event-ID is the last version it received completely
+Event = Tuple[str, Optional[str], Dict]
+
+
+def default_max_subscribers() -> int:
+    """The stream cap for this process: MAX_SUBSCRIBERS under gevent, MAX_THREADED_SUBSCRIBERS otherwise."""
+    monkey = sys.modules.get("gevent.monkey")
+    if monkey is not None and monkey.is_module_patched("threading"):
+        return MAX_SUBSCRIBERS
+    return MAX_THREADED_SUBSCRIBERS
+
+
+def format_event(name: str, event_id: Optional[str], data: Dict) -> str:
+    """Format an event in the Server-Sent Events wire format."""
+    lines = [f"event: {name}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """One stream's filters and pending events, filled by the broadcaster and drained by the stream."""
+
+    def __init__(self, param_key: str, subjects: Set[str], indexes: Set[str],
+                 max_pending: int = MAX_PENDING_EVENTS):
+        self.param_key = param_key
+        self.subjects = subjects
+        self.indexes = indexes
+        self.max_pending = max_pending
+        self._events = deque()
+        self._overflowed = False
+        self._condition = threading.Condition()
+
+    def matches(self, change: Dict) -> bool:
+        """Check a change against the filters (both must match when both are set, as in the change feed)."""
+        return ((not self.subjects or change["subject"] in self.subjects) and
+                (not self.indexes or change.get("index") in self.indexes))
+
+    def push(self, events: List[Event]) -> None:
+        """Queue events; past max_pending the backlog is dropped and the subscriber told to resync."""
+        with self._condition:
+            if len(self._events) + len(events) > self.max_pending:
+                self._events.clear()
+                self._overflowed = True
+            elif not self._overflowed:
+                self._events.extend(events)
+            self._condition.notify()
+
+    def wait(self, timeout: float) -> List[Event]:
+        """
+        Take the pending events, waiting up to `timeout` seconds for one to arrive.
+
+        Returns:
+            The events in order (a single resync event after an overflow), or [] on timeout
+        """
+        with self._condition:
+            if not self._events and not self._overflowed:
+                self._condition.wait(timeout)
+            if self._overflowed:
+                self._overflowed = False
+                self._events.clear()
+                return [("resync", None, {"reason": "too many pending events"})]
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+
+class SectionStatusBroadcaster:
+    """
+    Fans section open/closed transitions and snapshot version bumps out to stream subscribers.
+
+    Registered as a ChangeFeed listener, so every refresh is dispatched once, by the refresh
+    thread: each subscription is routed under its term and its section indexes (or, without
+    any, its subjects), and each change is pushed only to the subscriptions that asked for it.
+    Streams just wait on their own queue.
+    """
+
+    def __init__(self, max_subscribers: Optional[int] = None):
+        self.max_subscribers = max_subscribers if max_subscribers is not None else default_max_subscribers()
+        # param_key -> {"all": subscriptions without filters, "index": {section index: subscriptions},
+        #               "subject": {subject: subscriptions filtering on subjects only}}
+        self._routes = {}
+        self._counts = {}  # param_key -> open subscriptions
+        self._lock = threading.Lock()
+
+    def subscribe(self, param_key: str, subjects: Optional[Set[str]] = None,
+                  indexes: Optional[Set[str]] = None) -> Optional[Subscription]:
+        """
+        Open a subscription to a term's status changes, for some subjects and/or section
+        indexes (all sections if neither is given).
+
+        Returns:
+            The subscription, or None if the subscriber limit is reached
+        """
+        subscription = Subscription(param_key, set(subjects or ()), set(indexes or ()))
+        with self._lock:
+            if sum(self._counts.values()) >= self.max_subscribers:
+                return None
+            routes = self._routes.setdefault(param_key, {"all": set(), "subject": {}, "index": {}})
+            key, values = self._route(subscription)
+            if key is None:
+                routes["all"].add(subscription)
+            for value in values:
+                routes[key].setdefault(value, set()).add(subscription)
+            self._counts[subscription.param_key] = self._counts.get(subscription.param_key, 0) + 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            routes = self._routes.get(subscription.param_key)
+            if routes is None:
+                return
+            routes["all"].discard(subscription)
+            key, values = self._route(subscription)
+            for value in values:
+                subscribers = routes[key].get(value)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del routes[key][value]
+            self._counts[subscription.param_key] -= 1
+
+    @staticmethod
+    def _route(subscription: Subscription) -> Tuple[Optional[str], Set[str]]:
+        """The route group and keys a subscription is stored under (None for unfiltered ones)."""
+        if subscription.indexes:
+            return "index", subscription.indexes
+        if subscription.subjects:
+            return "subject", subscription.subjects
+        return None, set()
+
+    def subscriber_counts(self) -> Dict[str, int]:
+        """Number of open subscriptions per term."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _subscribers(self, param_key: str) -> Tuple[Set[Subscription], Dict, Dict]:
+        """Copies of a term's routes, so pushing happens outside the lock."""
+        with self._lock:
+            routes = self._routes.get(param_key)
+            if routes is None:
+                return set(), {}, {}
+            return (set(routes["all"]),
+                    {value: set(subs) for value, subs in routes["subject"].items()},
+                    {value: set(subs) for value, subs in routes["index"].items()})
+
+    def on_changes(self, param_key: str, entry: Dict) -> None:
+        """ChangeFeed listener: push a logged snapshot delta to the interested subscribers."""
+        everyone, by_subject, by_index = self._subscribers(param_key)
+        if not everyone and not by_subject and not by_index:
+            return
+
+        subscribers = set(everyone)
+        for subs in list(by_subject.values()) + list(by_index.values()):
+            subscribers.update(subs)
+
+        version = entry["cursor"]
+        version_event = ("version", version, {"version": version, "time": entry["time"]})
+        changes = entry["changes"]
+        if changes is None:
+            resync_events = [("resync", None, {"version": version, "reason": "snapshot replaced"}), version_event]
+            for subscription in subscribers:
+                subscription.push(resync_events)
+            return
+
+        # Collect each subscription's events first, so every queue is locked (and woken) once
+        shared = []   # events for every unfiltered subscription
+        pending = {}  # filtered subscription -> its events
+        for change in changes:
+            if change["type"] != "section_status":
+                continue
+            event = ("section_status", None, dict(change, version=version))
+            shared.append(event)
+            # Every filtered subscription sits in exactly one route group, so none is reached twice
+            index_subs = [subscription for subscription in by_index.get(change["index"], ())
+                          if subscription.matches(change)]
+            for subscription in chain(by_subject.get(change["subject"], ()), index_subs):
+                pending.setdefault(subscription, []).append(event)
+
+        shared.append(version_event)
+        for subscription in everyone:
+            subscription.push(shared)
+        for subscription in subscribers - everyone:
+            subscription.push(pending.get(subscription, []) + [version_event])
+        logger.debug("Pushed %d status changes for %s version %s to %d subscribers",
+                     len(shared) - 1, param_key, version, len(subscribers))
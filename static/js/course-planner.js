@@ -960,30 +960,45 @@ let previewDebounceTimer = null;
 async function fetchCourseSections(course) {
     const key = course.courseString;
     if (!key) return [];
-    if (courseStringToSectionsCache.has(key)) {
-        return courseStringToSectionsCache.get(key);
-    }
-    try {
-        const params = new URLSearchParams({
-            year: new URLSearchParams(window.location.search).get('year') || '2026',
-            term: new URLSearchParams(window.location.search).get('term') || '1',
-            campus: new URLSearchParams(window.location.search).get('campus') || 'NB',
-            search: key
+    if (!courseStringToSectionsCache.has(key)) {
+        // Load every scheduled course that isn't cached yet in the same request
+        const keys = new Set([key]);
+        scheduledCourses.forEach(c => {
+            if (c.courseString && !courseStringToSectionsCache.has(c.courseString)) {
+                keys.add(c.courseString);
+            }
         });
-        const resp = await fetch(`/api/courses?${params.toString()}`);
-        const json = await resp.json();
-        if (json.status !== 'success' || !Array.isArray(json.data)) {
-            throw new Error('Invalid response');
+        try {
+            await fetchCourseSectionsBatch(Array.from(keys));
+        } catch (e) {
+            showNotification('Failed to load sections. Please try again.', 'danger');
+            return [];
         }
-        // Find matching course by courseString
-        const match = json.data.find(c => c.courseString === key) || json.data[0];
+    }
+    return courseStringToSectionsCache.get(key) || [];
+}
+
+async function fetchCourseSectionsBatch(courseStrings) {
+    const pageParams = new URLSearchParams(window.location.search);
+    const params = new URLSearchParams({
+        year: pageParams.get('year') || '2026',
+        term: pageParams.get('term') || '1',
+        campus: pageParams.get('campus') || 'NB'
+    });
+    const resp = await fetch(`/api/courses/batch?${params.toString()}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ courseStrings })
+    });
+    const json = await resp.json();
+    if (json.status !== 'success' || !json.data || !json.data.courses) {
+        throw new Error('Invalid response');
+    }
+    courseStrings.forEach(key => {
+        const match = json.data.courses[key];
         const sections = (match && Array.isArray(match.sections)) ? match.sections : [];
         courseStringToSectionsCache.set(key, sections);
-        return sections;
-    } catch (e) {
-        showNotification('Failed to load sections. Please try again.', 'danger');
-        return [];
-    }
+    });
 }
 
 function clearSectionPreview() {
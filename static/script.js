@@ -29,23 +29,58 @@ document.addEventListener("DOMContentLoaded", function () {
         });
     }
 
-    async function fetchSalaryData(instructorName, tooltipElement) {
-        try {
-            // Convert "LAST, FIRST" to "First Last"
-            let nameParts = instructorName.split(", ");
-            let formattedName = nameParts.length === 2 ? `${nameParts[1]} ${nameParts[0]}` : instructorName;
+    // Convert "LAST, FIRST" to "First Last"
+    function formatSalaryName(instructorName) {
+        let nameParts = instructorName.split(", ");
+        return nameParts.length === 2 ? `${nameParts[1]} ${nameParts[0]}` : instructorName;
+    }
+
+    // Salary lookups by formatted name: a promise of the salary entry (null when nothing matched)
+    const salaryLookups = new Map();
+    const SALARY_BATCH_SIZE = 200; // MAX_SALARY_BATCH_NAMES on the server
 
-            console.log("🔍 Fetching salary for:", formattedName); // Debugging
+    // Look up every instructor not fetched yet with /api/salary/batch (one request per 200 names)
+    function fetchSalaryDataBatch(instructorNames) {
+        const names = [...new Set(instructorNames.map(formatSalaryName))]
+            .filter(name => name && name !== 'TBA' && !salaryLookups.has(name));
 
-            const response = await fetch(`/api/salary?name=${encodeURIComponent(formattedName)}`);
-            const data = await response.json();
-            console.log("📡 API Response:", data); // Debugging
+        for (let start = 0; start < names.length; start += SALARY_BATCH_SIZE) {
+            const chunk = names.slice(start, start + SALARY_BATCH_SIZE);
+            const request = fetch('/api/salary/batch', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ names: chunk })
+            }).then(response => {
+                if (!response.ok) throw new Error(`Salary batch request failed: ${response.status}`);
+                return response.json();
+            });
+
+            chunk.forEach(name => {
+                const lookup = request.then(data => (data.data[name] || {}).salary || null);
+                // Forget failed lookups so the next hover retries them
+                lookup.catch(() => salaryLookups.delete(name));
+                salaryLookups.set(name, lookup);
+            });
+        }
+    }
+
+    // Salary tooltips of the instructors in the current results, fetched together when they render
+    function prefetchSalaryData() {
+        const names = [...document.querySelectorAll('.instructor-name')].map(el => el.textContent.trim());
+        fetchSalaryDataBatch(names);
+    }
+
+    async function fetchSalaryData(instructorName, tooltipElement) {
+        try {
+            const formattedName = formatSalaryName(instructorName);
+            fetchSalaryDataBatch([instructorName]);
+            const data = await salaryLookups.get(formattedName);
 
             let tooltipInstance = bootstrap.Tooltip.getInstance(tooltipElement);
             if (!tooltipInstance) return;
 
             // ✅ Format tooltip content with proper layout while using setContent method
-            if (data.error) {
+            if (!data) {
                 tooltipInstance.setContent({ '.tooltip-inner': "No salary data found" });
             } else {
                 tooltipInstance.setContent({
@@ -64,8 +99,6 @@ document.addEventListener("DOMContentLoaded", function () {
                     `
                 });
             }
-
-            console.log("✅ Tooltip updated successfully"); // Debugging
         } catch (error) {
             console.error("❌ Error fetching salary data:", error);
 
@@ -336,6 +369,7 @@ document.addEventListener("DOMContentLoaded", function () {
 
                         searchResults.innerHTML = resultsHtml;
                         initializeTooltips();
+                        prefetchSalaryData();
                     } else {
                         searchResults.innerHTML = '<div class="alert alert-info">No courses found</div>';
                     }
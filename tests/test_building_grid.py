@@ -0,0 +1,38 @@
+import random
+import time
+
+import pytest
+
+from room_fetcher import BUILDING_COORDINATES
+from room_index import BuildingGrid
+from utils.geo_utils import haversine_meters
+
+
+@pytest.fixture(scope="module")
+def grid():
+    return BuildingGrid(BUILDING_COORDINATES)
+
+
+def brute_force(lat, lng, max_distance=None):
+    ranked = sorted((haversine_meters(lat, lng, coordinate["lat"], coordinate["lng"]), building)
+                    for building, coordinate in BUILDING_COORDINATES.items())
+    return [item for item in ranked if max_distance is None or item[0] <= max_distance]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_iter_nearest_matches_brute_force(grid, seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        lat, lng = 40.5 + rng.uniform(-0.1, 0.1), -74.45 + rng.uniform(-0.1, 0.1)
+        max_distance = rng.choice([None, 500, 2000])
+        assert list(grid.iter_nearest(lat, lng, max_distance)) == brute_force(lat, lng, max_distance)
+
+
+@pytest.mark.parametrize("lat, lng", [(40.0, -74.45), (36.0, -74.0), (0.0, 0.0), (-89.9, 179.9), (1e10, 1e10)])
+def test_iter_nearest_far_points_stay_cheap(grid, lat, lng):
+    start = time.perf_counter()
+    nearest = list(grid.iter_nearest(lat, lng))
+    assert time.perf_counter() - start < 0.5
+    assert len(nearest) == len(BUILDING_COORDINATES)
+    if abs(lat) <= 90:
+        assert nearest == brute_force(lat, lng)
@@ -0,0 +1,144 @@
+import copy
+
+import pytest
+
+from change_feed import ChangeFeed, diff_states, snapshot_state
+from course_fetcher import CourseFetcher
+
+
+def section(index, status="OPEN", day="M", start="0930", instructors=("SMITH, JOHN",)):
+    return {
+        "index": index,
+        "openStatusText": status,
+        "meetingTimes": [{"meetingDay": day, "startTimeMilitary": start, "endTimeMilitary": "1050",
+                          "campusLocation": "2", "buildingCode": "HLL", "roomNumber": "114"}],
+        "instructors": [{"name": name} for name in instructors],
+    }
+
+
+def course(course_string, subject, sections, title="COURSE"):
+    return {"courseString": course_string, "subject": subject, "title": title, "sections": sections}
+
+
+BASE = [
+    course("01:198:111", "198", [section("10001"), section("10002", status="CLOSED")], "INTRO COMPUTER SCI"),
+    course("01:640:151", "640", [section("20001")], "CALCULUS I"),
+    course("01:750:203", "750", [section("30001")], "GENERAL PHYSICS"),
+]
+
+
+def changed_snapshot():
+    courses = copy.deepcopy(BASE)
+    courses[0]["sections"][1]["openStatusText"] = "OPEN"                       # 10002 opens
+    courses[0]["sections"][0]["meetingTimes"][0]["startTimeMilitary"] = "1020"  # 10001 moves
+    courses[1]["sections"][0]["instructors"] = [{"name": "DOE, JANE"}]          # 20001 instructor
+    courses[1]["sections"].append(section("20002"))                            # 20002 added
+    del courses[2]                                                             # 750:203 removed
+    courses.append(course("01:960:285", "960", [section("40001")], "STATISTICS"))
+    courses.append(course("01:090:101", "090", [], "BYRNE SEMINAR"))           # no sections
+    return courses
+
+
+def changes_by_type(changes):
+    grouped = {}
+    for change in changes:
+        grouped.setdefault(change["type"], []).append(change)
+    return grouped
+
+
+def test_diff_states_reports_every_change_type():
+    changes = changes_by_type(diff_states(snapshot_state(BASE), snapshot_state(changed_snapshot())))
+
+    assert [(c["index"], c["previous"], c["status"]) for c in changes["section_status"]] == [("10002", "CLOSED", "OPEN")]
+    assert [c["index"] for c in changes["section_meetings"]] == ["10001"]
+    assert changes["section_meetings"][0]["meetings"][0]["startTimeMilitary"] == "1020"
+    assert [(c["index"], c["instructors"]) for c in changes["section_instructors"]] == [("20001", ["DOE, JANE"])]
+    assert [c["index"] for c in changes["section_added"]] == ["20002"]
+    assert [(c["courseString"], c["sections"]) for c in changes["course_removed"]] == [("01:750:203", ["30001"])]
+    assert sorted((c["courseString"], tuple(c["sections"])) for c in changes["course_added"]) == [
+        ("01:090:101", ()), ("01:960:285", ("40001",))]
+    assert "section_removed" not in changes
+
+
+def test_diff_states_identical_snapshots():
+    assert diff_states(snapshot_state(BASE), snapshot_state(copy.deepcopy(BASE))) == []
+
+
+def test_snapshot_state_merges_duplicate_course_strings():
+    state = snapshot_state([course("01:198:111", "198", [section("1")]), course("01:198:111", "198", [section("2")])])
+    assert sorted(state["01:198:111"]["sections"]) == ["1", "2"]
+
+
+@pytest.fixture
+def feed():
+    fetcher = CourseFetcher(autoload=False)
+    change_feed = ChangeFeed(fetcher)
+    fetcher.add_update_listener(change_feed.on_courses_updated)
+    fetcher.install_courses(copy.deepcopy(BASE))
+    return fetcher, change_feed
+
+
+def test_get_changes_since_previous_version(feed):
+    fetcher, change_feed = feed
+    since = change_feed.cursor(1)
+    assert change_feed.get_changes(since) == {"version": since, "since": since, "resync": False, "changes": []}
+
+    fetcher.install_courses(changed_snapshot())
+    result = change_feed.get_changes(since)
+    assert result["version"] == change_feed.cursor(2)
+    assert not result["resync"]
+    assert len(result["changes"]) == 7
+    assert {change["version"] for change in result["changes"]} == {change_feed.cursor(2)}
+
+
+def test_get_changes_filters(feed):
+    fetcher, change_feed = feed
+    fetcher.install_courses(changed_snapshot())
+    since = change_feed.cursor(1)
+
+    by_subject = change_feed.get_changes(since, subjects={"640"})["changes"]
+    assert sorted(change["type"] for change in by_subject) == ["section_added", "section_instructors"]
+
+    # Course changes match on their sections; a course without sections matches no index
+    by_index = change_feed.get_changes(since, indexes={"30001", "40001", "10002"})["changes"]
+    assert sorted(change["type"] for change in by_index) == ["course_added", "course_removed", "section_status"]
+
+    both = change_feed.get_changes(since, subjects={"198"}, indexes={"20002"})["changes"]
+    assert both == []
+
+
+def test_get_changes_resyncs_after_log_truncation():
+    fetcher = CourseFetcher(autoload=False)
+    change_feed = ChangeFeed(fetcher, max_versions=2)
+    fetcher.add_update_listener(change_feed.on_courses_updated)
+    fetcher.install_courses(copy.deepcopy(BASE))
+    for _ in range(3):
+        fetcher.install_courses(changed_snapshot())
+    result = change_feed.get_changes(change_feed.cursor(1))
+    assert result["resync"] and result["changes"] == []
+    assert result["version"] == change_feed.cursor(4)
+    assert not change_feed.get_changes(change_feed.cursor(3))["resync"]
+
+
+def test_get_changes_resyncs_after_resync_point(feed):
+    fetcher, change_feed = feed
+    change_feed.max_changes = 1
+    fetcher.install_courses(changed_snapshot())
+    assert change_feed.get_changes(change_feed.cursor(1))["resync"]
+
+
+def test_get_changes_resyncs_cursors_from_another_process(feed):
+    fetcher, change_feed = feed
+    fetcher.install_courses(changed_snapshot())
+    restarted = ChangeFeed(fetcher)
+    for since in (restarted.cursor(1), "1"):
+        result = change_feed.get_changes(since)
+        assert result["resync"] and result["changes"] == []
+        assert result["version"] == change_feed.cursor(2)
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "abc-", "abc-x1", "-"])
+def test_parse_cursor_rejects_malformed_cursors(feed, cursor):
+    _, change_feed = feed
+    with pytest.raises(ValueError):
+        change_feed.parse_cursor(cursor)
@@ -0,0 +1,41 @@
+import gzip
+import os
+
+from utils.compression import MIN_COMPRESS_BYTES, CompressedBody, PrecompressedCache, negotiate_encoding
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+
+
+def test_compressed_body_variants():
+    raw = b'{"data": "' + b"x" * 4096 + b'"}'
+    body = CompressedBody(raw)
+    data, encoding = body.get("gzip")
+    assert encoding == "gzip" and gzip.decompress(data) == raw
+    assert body.get("gzip")[0] is data
+    assert body.size == len(raw) + len(data)
+    assert CompressedBody(b"{}").get("gzip") == (b"{}", None)
+
+
+def test_cache_stays_within_budget_as_variants_are_added():
+    # Random bytes barely compress, so each gzip variant about doubles an entry's size
+    size = 4 * MIN_COMPRESS_BYTES
+    cache = PrecompressedCache(max_bytes=5 * size)
+    bodies = [cache.put(key, os.urandom(size)) for key in range(4)]
+    assert cache.stats()["entries"] == 4
+
+    for key, body in enumerate(bodies):
+        if cache.get(key) is not None:
+            body.get("gzip")
+        assert cache.stats()["bytes"] <= cache.max_bytes
+    assert cache.stats()["entries"] < 4
+
+
+def test_cache_skips_bodies_over_a_quarter_of_the_budget():
+    cache = PrecompressedCache(max_bytes=4 * MIN_COMPRESS_BYTES)
+    body = cache.put("big", b"x" * (2 * MIN_COMPRESS_BYTES))
+    assert body.raw and cache.get("big") is None
@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.soc_generator import generate_courses
+from course_fetcher import CourseFetcher
+
+QUERIES = [
+    "smith 111", "patel 101", "lee 205", "cs 111", "math 152", "198:111", "640:151", "111", "205",
+    "jones 101", "brown 210", "williams 350", "garcia 300", "zzz 999", "101", "stats 285",
+]
+
+FILTER_SETS = [
+    None,
+    {"status": ["open"]},
+    {"days": ["M"]},
+    {"campus": ["Busch"]},
+    {"subject": "198"},
+    {"status": ["closed"], "time_range": ["morning"]},
+]
+
+
+@pytest.fixture(scope="module")
+def fetcher():
+    course_fetcher = CourseFetcher(autoload=False)
+    course_fetcher.install_courses(generate_courses(1500, seed=7), "2025", "1", "NB")
+    return course_fetcher
+
+
+def course_strings(courses):
+    return [course.get("courseString") for course in courses]
+
+
+@pytest.mark.parametrize("filters", FILTER_SETS)
+@pytest.mark.parametrize("query", QUERIES)
+def test_specific_query_fast_path_matches_full_scan(fetcher, query, filters):
+    param_key = "2025_1_NB"
+    course_index = fetcher.course_indexes[param_key]
+    is_specific, _, number_part = fetcher._parse_course_query(query)
+    assert is_specific
+
+    snapshot = fetcher.courses_by_params[param_key]
+    full_scan = fetcher.fuzzy_search_courses(fetcher.apply_filters(snapshot, filters) if filters else snapshot, query)
+    fast_path = fetcher._search_specific_course_query(course_index, query, number_part, filters)
+    assert course_strings(fast_path) == course_strings(full_scan)
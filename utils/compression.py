@@ -0,0 +1,173 @@
+"""Precompressed response bodies: each cacheable payload is gzip/brotli-compressed once and reused."""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from utils.metrics import stage
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are always sent uncompressed (the headers would eat the savings)
+MIN_COMPRESS_BYTES = 1024
+
+# Compression settings: each body is compressed once, so favor size over speed, short of
+# brotli's slowest qualities (10-11) which take seconds on a multi-megabyte course list
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+# Default memory budget for a PrecompressedCache (raw plus compressed bytes)
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content encoding for a response from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        "br" or "gzip" (the highest q-value the client accepts, brotli on ties), or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding.strip().lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress bytes with a content encoding ("br" or "gzip")."""
+    with stage("compress"):
+        if encoding == "br":
+            return brotli.compress(data, quality=BROTLI_QUALITY)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressedBody:
+    """A response body and its compressed variants, each produced on first request and then kept."""
+
+    def __init__(self, raw: bytes, on_grow: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            raw: The uncompressed body
+            on_grow: Optional callback run after a compressed variant is added (the owning
+                cache uses it to stay within its memory budget)
+        """
+        self.raw = raw
+        self._variants = {}  # encoding -> compressed bytes
+        self._lock = threading.Lock()
+        self._on_grow = on_grow
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the raw body and its compressed variants."""
+        return len(self.raw) + sum(len(variant) for variant in self._variants.values())
+
+    def get(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """
+        Get the body in an encoding, compressing it only the first time that encoding is asked for.
+
+        Returns:
+            (body bytes, encoding applied), where the encoding is None for the raw body
+            (no encoding requested, or a body too small to be worth compressing)
+        """
+        if encoding is None or len(self.raw) < MIN_COMPRESS_BYTES:
+            return self.raw, None
+        variant = self._variants.get(encoding)
+        if variant is None:
+            added = False
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is None:
+                    variant = self._variants[encoding] = compress(self.raw, encoding)
+                    added = True
+            if added and self._on_grow is not None:
+                self._on_grow()
+        return variant, encoding
+
+
+class PrecompressedCache:
+    """
+    Least recently used CompressedBody entries within a memory budget.
+
+    Keys must change whenever the payload would (e.g. include the course snapshot version),
+    so entries never need invalidating; stale ones age out. The budget is enforced when a
+    body is stored and again whenever a stored body gains a compressed variant.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> CompressedBody, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CompressedBody]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, raw: bytes) -> CompressedBody:
+        """Store a raw body (evicting the least recently used entries over budget) and return its entry."""
+        if not self.max_bytes or len(raw) > self.max_bytes // 4:
+            return CompressedBody(raw)
+        body = CompressedBody(raw, on_grow=self._trim)
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            self._trim_locked()
+        return body
+
+    def _trim(self) -> None:
+        with self._lock:
+            self._trim_locked()
+
+    def _trim_locked(self) -> None:
+        """Evict least recently used entries until the cache fits its budget (keeping at least one)."""
+        total = sum(entry.size for entry in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.size
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(entry.size for entry in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
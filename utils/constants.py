@@ -18,3 +18,20 @@ CAMPUS_ABBREV_TO_NAME = {
     "D/C": "Cook/Doug"
 }
 
+
+# Mapping weekday codes (as used by the SOC API) to full names
+WEEKDAY_CODE_TO_NAME = {
+    "M": "Monday",
+    "T": "Tuesday",
+    "W": "Wednesday",
+    "H": "Thursday",
+    "F": "Friday",
+    "S": "Saturday",
+    "Su": "Sunday"
+}
+
+# Days of the week in calendar order
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Time zone used when a request asks about rooms "now"
+CAMPUS_TIMEZONE = "America/New_York"
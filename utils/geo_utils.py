@@ -0,0 +1,24 @@
+"""Utilities for working with building coordinates."""
+
+import math
+
+EARTH_RADIUS_METERS = 6371000.0
+
+
+def haversine_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Calculate the great-circle distance between two points.
+
+    Args:
+        lat1, lng1: Latitude and longitude of the first point, in degrees
+        lat2, lng2: Latitude and longitude of the second point, in degrees
+
+    Returns:
+        The distance in meters
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lng2 - lng1)
+
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
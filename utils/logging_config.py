@@ -0,0 +1,102 @@
+"""Queue-based logging setup with per-module levels and sampled hot-path log lines."""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from typing import Dict, Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Share of sampled (per-request) log lines that are actually emitted
+_sample_rate = 1.0
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse per-module log levels like "course_fetcher=WARNING,werkzeug=INFO".
+
+    Args:
+        spec: Comma-separated logger=LEVEL pairs
+
+    Returns:
+        Dictionary mapping logger names to numeric levels
+
+    Raises:
+        ValueError: If a level name is not recognized
+    """
+    levels = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, level = item.partition("=")
+        numeric = logging.getLevelName(level.strip().upper())
+        if not isinstance(numeric, int):
+            raise ValueError(f"Unknown log level for {name.strip()}: {level.strip()!r}")
+        levels[name.strip()] = numeric
+    return levels
+
+
+def configure_logging(level: Optional[str] = None, module_levels: Optional[str] = None,
+                      sample_rate: Optional[float] = None) -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Request threads only put records on the queue; formatting of the final line and the
+    write to stderr happen on the listener thread. Safe to call more than once.
+
+    Args:
+        level: Root level name (default: LOG_LEVEL, or INFO)
+        module_levels: Per-module levels (default: LOG_LEVELS), see parse_module_levels
+        sample_rate: Share of sampled log lines to emit, 0 to 1 (default: LOG_SAMPLE_RATE, or 0.01)
+    """
+    global _listener, _sample_rate
+
+    level = (level or os.environ.get("LOG_LEVEL", "INFO")).upper()
+    module_levels = module_levels if module_levels is not None else os.environ.get("LOG_LEVELS", "")
+    sample_rate = sample_rate if sample_rate is not None else float(os.environ.get("LOG_SAMPLE_RATE", "0.01"))
+    _sample_rate = min(max(sample_rate, 0.0), 1.0)
+
+    root = logging.getLogger()
+    if _listener is None:
+        log_queue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+    root.setLevel(level)
+    for name, numeric in parse_module_levels(module_levels).items():
+        logging.getLogger(name).setLevel(numeric)
+
+
+def stop_logging() -> None:
+    """Flush the queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_sampled(logger: logging.Logger, level: int, msg: str, *args) -> None:
+    """
+    Log a per-request line for only a sample of calls.
+
+    The level check comes first and the message is %-formatted lazily, so a disabled or
+    unsampled line costs one comparison and one random number.
+
+    Args:
+        logger: Logger to write to
+        level: Numeric log level, e.g. logging.INFO
+        msg: %-style format string
+        *args: Arguments for the format string
+    """
+    if logger.isEnabledFor(level) and (_sample_rate >= 1.0 or random.random() < _sample_rate):
+        logger.log(level, msg, *args)
@@ -0,0 +1,57 @@
+"""Utilities for estimating the memory held by parsed JSON data."""
+
+import random
+import sys
+from typing import List, Optional, Set
+
+
+def deep_sizeof(obj, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate the memory used by an object and everything it contains.
+
+    Follows dicts, lists, tuples and sets (the shapes json.loads produces); objects
+    already in `seen` are not counted again.
+
+    Args:
+        obj: The object to measure
+        seen: Ids of objects already counted, shared between calls to skip shared objects
+
+    Returns:
+        Size in bytes as reported by sys.getsizeof, summed over all reachable objects
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return total
+
+
+def estimate_list_memory(items: List, sample_size: int = 200, seed: int = 0) -> int:
+    """
+    Estimate the memory held by a list of similar items from a random sample of them.
+
+    Args:
+        items: The list to measure
+        sample_size: Number of items measured; lists this short or shorter are measured exactly
+        seed: Random seed for the sample, so repeated estimates of the same list agree
+
+    Returns:
+        Estimated size in bytes of the list and its items
+    """
+    if len(items) <= sample_size:
+        return deep_sizeof(items)
+
+    sample = random.Random(seed).sample(items, sample_size)
+    seen = set()
+    sampled_bytes = sum(deep_sizeof(item, seen) for item in sample)
+    return sys.getsizeof(items) + int(sampled_bytes * len(items) / sample_size)
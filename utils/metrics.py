@@ -0,0 +1,184 @@
+"""Lightweight latency instrumentation: per-request stage timers and Prometheus-style histograms."""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "coursedatahub"
+
+# Stage durations (seconds) recorded during the current request, or None outside of one
+_request_stages: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "request_stages", default=None
+)
+
+
+class Histogram:
+    """A fixed-bucket latency histogram per label value, safe to observe from many threads."""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}  # label value -> [per-bucket counts (last one is +Inf), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float) -> None:
+        """Record one observation for a label value."""
+        position = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][position] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text exposition format."""
+        with self._lock:
+            snapshot = {value: (list(series[0]), series[1], series[2]) for value, series in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for value in sorted(snapshot):
+            counts, total, count = snapshot[value]
+            label = f'{self.label}="{_escape_label(value)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+class Counter:
+    """A monotonically increasing count per tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values in sorted(snapshot):
+            labels = ",".join(f'{label}="{_escape_label(value)}"' for label, value in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {_format_value(snapshot[label_values])}")
+        return lines
+
+
+class CallbackMetric:
+    """A gauge or counter whose values are read from a callback each time the metrics are rendered."""
+
+    def __init__(self, name: str, help_text: str, label: str, collect: Callable[[], Dict[str, float]],
+                 metric_type: str = "gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for label_value, value in sorted(self.collect().items()):
+            if value is not None:
+                lines.append(f'{self.name}{{{self.label}="{_escape_label(label_value)}"}} {_format_value(value)}')
+        return lines
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_DURATION = Histogram(
+    f"{METRIC_PREFIX}_stage_duration_seconds", "Time spent in each instrumented stage.", "stage"
+)
+REQUEST_DURATION = Histogram(
+    f"{METRIC_PREFIX}_request_duration_seconds", "Time to handle a request, by endpoint.", "endpoint"
+)
+REQUESTS_TOTAL = Counter(
+    f"{METRIC_PREFIX}_requests_total", "Requests handled, by endpoint and status code.", ("endpoint", "status")
+)
+
+# Everything rendered by /api/metrics; other modules may append their own metrics
+REGISTRY = [STAGE_DURATION, REQUEST_DURATION, REQUESTS_TOTAL]
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block of code (or, used as a decorator, every call of a function) as a named stage.
+
+    The duration always goes into the stage histogram; inside a request it is also added to
+    that request's stage timings (repeated stages accumulate), which end up in its
+    Server-Timing header.
+
+    Args:
+        name: Stage name, e.g. "course_search" (letters, digits and underscores)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(name, elapsed)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + elapsed
+
+
+def start_request() -> None:
+    """Start collecting stage timings for the request handled by this context."""
+    _request_stages.set({})
+
+
+def finish_request() -> Dict[str, float]:
+    """Stop collecting stage timings and return them (stage name -> seconds)."""
+    stages = _request_stages.get()
+    _request_stages.set(None)
+    return stages or {}
+
+
+def server_timing_header(stages: Dict[str, float], total: Optional[float] = None) -> str:
+    """
+    Format stage timings as a Server-Timing header value.
+
+    Args:
+        stages: Stage name -> seconds
+        total: Optional whole-request duration in seconds, reported as "total"
+
+    Returns:
+        A header value like "course_search;dur=12.4, course_enrich;dur=3.1, total;dur=17.9"
+    """
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
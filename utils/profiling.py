@@ -0,0 +1,147 @@
+"""On-demand request profiling and a rolling log of slow requests."""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import threading
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Functions listed in a stored profile report, by cumulative time
+PROFILE_REPORT_LINES = 60
+
+# Number of profile reports and slow requests kept in memory
+MAX_PROFILE_REPORTS = 20
+MAX_SLOW_REQUESTS = 100
+
+
+class RequestProfiler:
+    """
+    Operator-gated cProfile runs of single requests, plus a slow request log.
+
+    Profiling is off unless a secret is configured; a request is then profiled only when it
+    carries that secret. Reports are kept in memory (and written as .prof files when a
+    directory is configured, for snakeviz or gprof2dot call trees).
+    """
+
+    def __init__(self, secret: Optional[str] = None, report_dir: Optional[str] = None,
+                 slow_request_seconds: float = 1.0):
+        """
+        Args:
+            secret: Token a request must carry to be profiled; None disables profiling
+            report_dir: Optional directory to also write each profile to as <id>.prof
+            slow_request_seconds: Requests taking at least this long go into the slow log (0 disables it;
+                so does disabling profiling)
+        """
+        self.secret = secret or None
+        self.report_dir = report_dir or None
+        self.slow_request_seconds = slow_request_seconds
+        self.reports = OrderedDict()  # profile id -> report, oldest first
+        self.slow_requests = deque(maxlen=MAX_SLOW_REQUESTS)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "RequestProfiler":
+        """Configure from PROFILE_SECRET, PROFILE_DIR and SLOW_REQUEST_MS."""
+        return cls(
+            secret=os.environ.get("PROFILE_SECRET"),
+            report_dir=os.environ.get("PROFILE_DIR"),
+            slow_request_seconds=float(os.environ.get("SLOW_REQUEST_MS", "1000")) / 1000
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.secret is not None
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """Check a token against the secret (always False while profiling is disabled)."""
+        return self.enabled and bool(token) and hmac.compare_digest(token.encode("utf-8"), self.secret.encode("utf-8"))
+
+    def start(self) -> cProfile.Profile:
+        """Start profiling the calling thread."""
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile: cProfile.Profile, request_info: Dict, seconds: float) -> str:
+        """
+        Stop a profile and store its report.
+
+        Args:
+            profile: The profile returned by start()
+            request_info: Method, path and arguments of the profiled request
+            seconds: Duration of the request
+
+        Returns:
+            The id the report is stored under
+        """
+        profile.disable()
+        profile_id = uuid.uuid4().hex[:12]
+
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+        if self.report_dir:
+            os.makedirs(self.report_dir, exist_ok=True)
+            profile.dump_stats(os.path.join(self.report_dir, f"{profile_id}.prof"))
+
+        report = {
+            "id": profile_id,
+            "created": datetime.now().isoformat(),
+            "duration_ms": round(seconds * 1000, 2),
+            "request": request_info,
+            "report": output.getvalue()
+        }
+        with self._lock:
+            self.reports[profile_id] = report
+            while len(self.reports) > MAX_PROFILE_REPORTS:
+                self.reports.popitem(last=False)
+        return profile_id
+
+    def get_report(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self.reports.get(profile_id)
+
+    def list_reports(self) -> List[Dict]:
+        """Summaries of the stored reports, newest first."""
+        with self._lock:
+            reports = list(self.reports.values())
+        return [{key: value for key, value in report.items() if key != "report"} for report in reversed(reports)]
+
+    def is_slow(self, seconds: float) -> bool:
+        """
+        Check whether a request duration belongs in the slow log. Nothing is logged while
+        profiling is disabled, since the log (request arguments and bodies) can't be read then.
+        """
+        return self.enabled and bool(self.slow_request_seconds) and seconds >= self.slow_request_seconds
+
+    def record_request(self, request_info: Dict, seconds: float, stages: Dict[str, float]) -> None:
+        """
+        Add a request to the slow log if it took at least the slow request threshold.
+
+        Args:
+            request_info: Method, path and arguments (query parameters and JSON body) of the request
+            seconds: Duration of the request
+            stages: Stage timings of the request in seconds (see utils.metrics)
+        """
+        if not self.is_slow(seconds):
+            return
+        entry = {
+            "time": datetime.now().isoformat(),
+            "duration_ms": round(seconds * 1000, 2),
+            "stages_ms": {name: round(stage_seconds * 1000, 2) for name, stage_seconds in stages.items()},
+            **request_info
+        }
+        with self._lock:
+            self.slow_requests.append(entry)
+
+    def get_slow_requests(self, limit: Optional[int] = None) -> List[Dict]:
+        """The logged slow requests, slowest first."""
+        with self._lock:
+            entries = list(self.slow_requests)
+        entries.sort(key=lambda entry: entry["duration_ms"], reverse=True)
+        return entries[:limit] if limit else entries
@@ -0,0 +1,111 @@
+"""Utilities for parsing class meeting times and days."""
+
+import re
+from datetime import datetime
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from utils.constants import WEEKDAY_CODE_TO_NAME, DAYS_OF_WEEK, CAMPUS_TIMEZONE
+
+_AM_PM_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})\s*([AaPp][Mm])$")
+_CLOCK_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+
+def parse_time_to_minutes(value: str) -> Optional[int]:
+    """
+    Convert a time string to minutes after midnight.
+
+    Handles:
+    - 12-hour format: "10:00 AM", "2:30 PM"
+    - Military format as used by the SOC API: "1020", "0830"
+    - 24-hour clock format: "14:30"
+
+    Args:
+        value: The time string to parse
+
+    Returns:
+        Minutes after midnight, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if not value or value in ("N/A", "TBA"):
+        return None
+
+    match = _AM_PM_PATTERN.match(value)
+    if match:
+        hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3).upper()
+        if not 1 <= hour <= 12 or minute > 59:
+            return None
+        if period == "PM" and hour != 12:
+            hour += 12
+        elif period == "AM" and hour == 12:
+            hour = 0
+        return hour * 60 + minute
+
+    match = _CLOCK_PATTERN.match(value)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+    elif value.isdigit() and len(value) in (3, 4):
+        hour, minute = int(value[:-2]), int(value[-2:])
+    else:
+        return None
+
+    if hour > 24 or minute > 59 or hour * 60 + minute > 24 * 60:
+        return None
+    return hour * 60 + minute
+
+
+def format_minutes(minutes: int) -> str:
+    """
+    Convert minutes after midnight to 12-hour format (e.g., "10:00 AM").
+
+    Args:
+        minutes: Minutes after midnight
+
+    Returns:
+        The formatted time string
+    """
+    hour, minute = divmod(minutes % (24 * 60), 60)
+    period = "AM" if hour < 12 else "PM"
+    hour = hour % 12 or 12
+    return f"{hour}:{minute:02d} {period}"
+
+
+def normalize_day(day: str) -> Optional[str]:
+    """
+    Normalize a day code or name to its full name (e.g., "M" or "monday" -> "Monday").
+
+    Args:
+        day: Day code as used by the SOC API, or a full/abbreviated day name
+
+    Returns:
+        The full day name, or None if the day is not recognized
+    """
+    if not day:
+        return None
+
+    day = day.strip()
+    if day in WEEKDAY_CODE_TO_NAME:
+        return WEEKDAY_CODE_TO_NAME[day]
+
+    lowered = day.lower()
+    for name in DAYS_OF_WEEK:
+        if name.lower() == lowered or (len(lowered) >= 3 and name.lower().startswith(lowered)):
+            return name
+    return None
+
+
+def current_day_and_minutes(timezone: str = CAMPUS_TIMEZONE) -> Tuple[str, int]:
+    """
+    Get the current day name and minutes after midnight on campus.
+
+    Args:
+        timezone: IANA time zone name to evaluate "now" in
+
+    Returns:
+        A (day name, minutes after midnight) tuple
+    """
+    now = datetime.now(ZoneInfo(timezone))
+    return DAYS_OF_WEEK[now.weekday()], now.hour * 60 + now.minute